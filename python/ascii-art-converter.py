@@ -3,36 +3,74 @@
 Text-to-ASCII Art Converter
 画像をASCIIアートに変換するツール
 
-標準ライブラリのみ使用（追加パッケージ不要）
+Pillow と NumPy を使用。グレースケールの画素をまとめて配列にし、
+256段階の明るさ→文字の番号の表（LUT）で一度に文字へ変換して、
+行ごとの改行も含めて一括で文字列にする（画素ごとのPythonの処理は無い）。
+
+使い方:
+    python3 ascii-art-converter.py photo.jpg -w 120
+    python3 ascii-art-converter.py photo.jpg --ramp blocks --invert
+    python3 ascii-art-converter.py --benchmark          # 幅100〜2000で従来の変換と比較
+    python3 ascii-art-converter.py --benchmark --legacy-max-width 2000  # 従来の変換も全幅で（数分かかる）
 """
 
 import sys
+import time
 import argparse
+
+import numpy as np
 from PIL import Image
 
 # ASCII文字セット（暗い→明い）
 ASCII_CHARS = "@%#*+=-:. "
 
+# 名前で選べる文字セット（どれも暗い→明るい）
+RAMPS = {
+    "standard": ASCII_CHARS,
+    "blocks": "█▓▒░ ",
+    "detailed": "$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. ",
+}
+
+# ベンチマークする出力幅
+BENCHMARK_WIDTHS = (100, 250, 500, 1000, 2000)
+
+# 従来の変換も測る最大の幅（幅2000では数分かかるので、既定ではLUTだけを測る）
+LEGACY_MAX_WIDTH = 500
+
 def resize_image(image, new_width=100):
     """アスペクト比を保って画像をリサイズ"""
     original_width, original_height = image.size
     aspect_ratio = original_height / original_width
     new_height = int(new_width * aspect_ratio * 0.55)  # 0.55は文字の縦横比補正
-    return image.resize((new_width, new_height))
+    return image.resize((new_width, max(new_height, 1)))
 
 def grayscale(image):
     """画像をグレースケールに変換"""
     return image.convert("L")
 
-def pixels_to_ascii(image):
-    """ピクセルをASCII文字に変換"""
-    pixels = image.getdata()
-    ascii_str = ""
-    for pixel in pixels:
-        ascii_str += ASCII_CHARS[pixel // 32]
-    return ascii_str
-
-def image_to_ascii(image_path, width=100):
+def build_lut(ramp=ASCII_CHARS):
+    """明るさ（0-255）→ 文字のコードポイントの表
+
+    256段階を文字数で等分するので、文字セットの最初から最後まですべて使われる。
+    """
+    if not ramp:
+        raise ValueError("ramp must contain at least one character")
+    codes = np.array([ord(char) for char in ramp], dtype=np.uint32)
+    return codes[np.arange(256) * len(ramp) // 256]
+
+def pixels_to_ascii(image, ramp=ASCII_CHARS, lut=None):
+    """グレースケール画像を改行入りのASCIIアートに変換"""
+    lut = lut if lut is not None else build_lut(ramp)
+    pixels = np.asarray(image, dtype=np.uint8)
+
+    # 各行の末尾に改行を付けた (高さ, 幅+1) のコードポイントの配列を一度に文字列にする
+    height, width = pixels.shape
+    codes = np.empty((height, width + 1), dtype='<u4')
+    codes[:, :width] = lut[pixels]
+    codes[:, width] = ord("\n")
+    return codes.tobytes().decode("utf-32-le")[:-1]
+
+def image_to_ascii(image_path, width=100, ramp=ASCII_CHARS):
     """画像をASCIIアートに変換"""
     try:
         image = Image.open(image_path)
@@ -42,29 +80,89 @@ def image_to_ascii(image_path, width=100):
 
     image = resize_image(image, width)
     grayscale_image = grayscale(image)
-    ascii_str = pixels_to_ascii(grayscale_image)
-
-    # 改行を挿入
-    ascii_width = width
-    ascii_art = "\n".join([ascii_str[i:i+ascii_width] for i in range(0, len(ascii_str), ascii_width)])
+    return pixels_to_ascii(grayscale_image, ramp)
 
-    return ascii_art
+def legacy_pixels_to_ascii(image, ramp=ASCII_CHARS):
+    """画素ごとにPythonで変換する従来の方法（ベンチマークの比較用）"""
+    ascii_str = ""
+    for pixel in image.tobytes():
+        ascii_str += ramp[pixel * len(ramp) // 256]
+    width = image.width
+    return "\n".join([ascii_str[i:i+width] for i in range(0, len(ascii_str), width)])
+
+def sample_image(width=800, height=600):
+    """ベンチマーク用のグラデーション画像"""
+    y, x = np.mgrid[0:height, 0:width]
+    values = 127 + 64 * np.sin(x / 23.0) * np.cos(y / 17.0) + 63 * (x / width - y / height)
+    return Image.fromarray(values.clip(0, 255).astype(np.uint8))
+
+def benchmark(image=None, widths=BENCHMARK_WIDTHS, ramp=ASCII_CHARS, repeat=3, legacy_max_width=LEGACY_MAX_WIDTH):
+    """出力幅ごとに従来の変換とLUTによる変換の時間を比べる（リサイズは含めない）
+
+    従来の変換は legacy_max_width 以下の幅で1回だけ測って出力が同じことも確かめる。
+    LUTは repeat 回の最短を取る。
+    """
+    image = grayscale(image) if image is not None else sample_image()
+    lut = build_lut(ramp)
+    print(f"{'width':>6} {'height':>7} {'legacy(ms)':>11} {'lut(ms)':>9} {'speedup':>8}")
+    results = []
+    for width in widths:
+        resized = resize_image(image, width)
+
+        def best_of(convert, times):
+            best = float("inf")
+            for _ in range(times):
+                started = time.perf_counter()
+                art = convert()
+                best = min(best, time.perf_counter() - started)
+            return best, art
+
+        lut_s, lut_art = best_of(lambda: pixels_to_ascii(resized, ramp, lut), repeat)
+        legacy_s = None
+        if width <= legacy_max_width:
+            legacy_s, legacy_art = best_of(lambda: legacy_pixels_to_ascii(resized, ramp), 1)
+            if lut_art != legacy_art:
+                raise AssertionError(f"width {width}: LUT output differs from the legacy conversion")
+
+        if legacy_s is None:
+            print(f"{width:>6} {resized.height:>7} {'-':>11} {lut_s * 1000:>9.2f} {'-':>8}")
+        else:
+            print(f"{width:>6} {resized.height:>7} {legacy_s * 1000:>11.1f} {lut_s * 1000:>9.2f} {legacy_s / lut_s:>7.0f}x")
+        results.append({"width": width, "height": resized.height,
+                        "legacy_s": legacy_s, "lut_s": lut_s})
+    return results
 
 def main():
     parser = argparse.ArgumentParser(description="画像をASCIIアートに変換")
-    parser.add_argument("image", help="画像ファイルのパス")
+    parser.add_argument("image", nargs="?", help="画像ファイルのパス")
     parser.add_argument("-w", "--width", type=int, default=100, help="出力幅（デフォルト: 100）")
     parser.add_argument("-o", "--output", help="出力ファイル（オプション）")
     parser.add_argument("-i", "--invert", action="store_true", help="色を反転（明るい→暗い）")
+    parser.add_argument("-r", "--ramp", default="standard",
+                        help=f"文字セット（{', '.join(RAMPS)} または暗い→明るい順の文字列）")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="幅100〜2000で従来の変換と速度を比較（画像を省略するとグラデーション）")
+    parser.add_argument("--legacy-max-width", type=int, default=LEGACY_MAX_WIDTH,
+                        help=f"ベンチマークで従来の変換も測る最大の幅（デフォルト: {LEGACY_MAX_WIDTH}）")
 
     args = parser.parse_args()
 
-    # 色反転
-    global ASCII_CHARS
+    # 文字セット（色反転なら逆順）
+    ramp = RAMPS.get(args.ramp, args.ramp)
+    if not ramp:
+        parser.error("文字セットには1文字以上を指定してください")
     if args.invert:
-        ASCII_CHARS = " .:-=+*#%@"
+        ramp = ramp[::-1]
+
+    if args.benchmark:
+        benchmark(Image.open(args.image) if args.image else None, ramp=ramp,
+                  legacy_max_width=args.legacy_max_width)
+        return
+
+    if not args.image:
+        parser.error("画像ファイルのパスを指定してください")
 
-    ascii_art = image_to_ascii(args.image, args.width)
+    ascii_art = image_to_ascii(args.image, args.width, ramp)
 
     if ascii_art is None:
         sys.exit(1)
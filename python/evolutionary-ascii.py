@@ -2,116 +2,540 @@
 """
 進化的ASCIIアートジェネレーター
 シミュレーテッド・アニーリングで美しいパターンを進化させる
+
+グリッドは文字のコードポイントを入れた uint32 の ndarray（高さ×幅）で持つ。
+evaluate は反転して比較（対称性）・ウィンドウのハッシュ（反復）・bincount
+（エントロピー）でグリッド全体をまとめて採点する。
+evolve は変異のたびにグリッド全体を採点し直さず、DeltaScorer で
+変異したセルが関わる対称ペア・反復ウィンドウ・文字数だけを更新する。
+変異はグリッドに直接書き込み、不採用なら元に戻すので、世代ごとにグリッドを
+コピーしない。スコアは evaluate による全体の再計算と完全に一致する。
+
+evolve_islands は種と初期温度の違う複数のチェーン（島）をプロセスプールで
+並行に進め、一定世代ごとに各島のベストを隣の島へ移住させる。
+
+乱数はインスタンスごとの random.Random（seed で再現可能）を使う。
+長い実行は checkpoint に一定世代ごとに状態（グリッド・温度・ベスト・乱数の状態）を
+保存しておけば、resume で途中から続けられ、止めずに実行した場合と同じ結果になる。
+進捗は progress コールバックに渡す（指定しなければ何もしない）。
+
+set_target で画像を指定すると、美しさのスコアの代わりに画像との近さで進化させる。
+各文字を描画したときの小区画ごとのインクの濃さ（シグネチャ）を最初に1回だけ求め、
+グリッドを描いた画像と目標画像をどちらも少しぼかして比べる。ぼかしで隣の
+セルとも影響し合うので、1文字ずつ選ぶ ascii-art-converter.py の変換より良い組み合わせを探せる。
+
+使い方:
+    python3 evolutionary-ascii.py                          # 1本のチェーンで生成
+    python3 evolutionary-ascii.py --islands 4 --time 10    # 4島で10秒
+    python3 evolutionary-ascii.py --benchmark              # ワーカー数ごとのスコアと時間
+    python3 evolutionary-ascii.py --seed 1 -g 100000 --checkpoint run.npz
+    python3 evolutionary-ascii.py --resume run.npz -g 50000  # 保存した状態から続ける
+    python3 evolutionary-ascii.py --target photo.jpg --width 80 -g 20000
 """
 
+import argparse
+import json
+import os
 import random
 import math
-import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from collections import Counter
 from typing import List, Tuple
 
+import numpy as np
+
 # ASCII文字セット（視覚的に面白い文字）
 ASCII_CHARS = " .:-=+*#%@XO"
 
+# 反復を探すパターンの長さ
+WINDOW = 4
+
+# ウィンドウの4文字を1つの整数にまとめるときのビット幅（コードポイントは21ビット）
+CODE_BITS = 21
+
+# 島モデルの設定
+EPOCH_GENERATIONS = 200      # 移住までに各島を進める世代数
+ISLAND_TEMPERATURES = (1.0, 0.1)  # 島ごとの初期温度の範囲（等比で割り振る）
+
+# 画像モードの設定
+CELL_SUBDIVISION = (2, 4)  # 1文字を分ける小区画の数（横, 縦）
+GLYPH_FONT_SIZE = 24       # シグネチャを求めるときに文字を描くサイズ
+CHAR_ASPECT = 0.55         # 文字の縦横比補正（ascii-art-converter.py と同じ）
+TARGET_SCALE = 100.0       # 画像モードで1文字分の最大の誤差に当たるスコア（温度と釣り合う大きさ）
+
+# 進捗とチェックポイントの間隔（世代）
+PROGRESS_EVERY = 100
+CHECKPOINT_EVERY = 1000
+
+
+def to_codes(grid) -> np.ndarray:
+    """文字のグリッド（文字列のリストのリストなど）をコードポイントの配列にする"""
+    if isinstance(grid, np.ndarray):
+        return grid
+    return np.array([[ord(char) for char in row] for row in grid], dtype=np.uint32)
+
+
+def entropy(counts, total):
+    """文字ごとの個数（コードポイント順）からシャノンエントロピーを計算"""
+    result = 0.0
+    for count in counts:
+        if count:
+            p = count / total
+            result -= p * math.log2(p)
+    return result
+
+
+def symmetry_count(grid: np.ndarray) -> int:
+    """一致している対称ペアの数（縦・横は1、斜めは2）"""
+    height, width = grid.shape
+    half_w, half_h = width // 2, height // 2
+    count = np.count_nonzero(grid[:, :half_w] == grid[:, ::-1][:, :half_w])
+    count += np.count_nonzero(grid[:half_h] == grid[::-1][:half_h])
+    i = np.arange(min(width, height) // 2)
+    count += 2 * np.count_nonzero(grid[i, i] == grid[height - 1 - i, width - 1 - i])
+    return int(count)
+
+
+def repetition_count(lines: np.ndarray) -> int:
+    """各行で同じ4文字のウィンドウが4文字以上離れて現れる組の数
+
+    score_repetition と同じく、最後の位置（長さ - 4）のウィンドウは数えない。
+    文字を通し番号にしてウィンドウを整数にまとめ、行ごとに並べ替えて
+    同じ値の組を数え、重なっている（距離4未満の）組を引く。
+    """
+    n = lines.shape[1] - WINDOW
+    if n <= 0 or lines.shape[0] == 0:
+        return 0
+    _, ids = np.unique(lines, return_inverse=True)
+    ids = ids.reshape(lines.shape).astype(np.int64)
+    base = int(ids.max()) + 1
+    windows = np.lib.stride_tricks.sliding_window_view(ids, WINDOW, axis=1)[:, :n]
+    keys = windows[..., 0]
+    for k in range(1, WINDOW):
+        keys = keys * base + windows[..., k]
+
+    flat = np.sort(keys, axis=1).ravel()
+    breaks = np.ones(flat.size, dtype=bool)
+    breaks[1:] = flat[1:] != flat[:-1]
+    breaks[::n] = True
+    runs = np.diff(np.append(np.flatnonzero(breaks), flat.size))
+    pairs = int((runs * (runs - 1) // 2).sum())
+
+    for d in range(1, WINDOW):
+        pairs -= int(np.count_nonzero(keys[:, d:] == keys[:, :-d]))
+    return pairs
+
+
+class DeltaScorer:
+    """グリッドを持ち、変異したセルの周辺だけを数え直すスコア計算
+
+    対称性は一致しているペアの数、反復は各行・各列で同じ4文字の
+    ウィンドウが4文字以上離れて現れる組の数、コントラストは文字ごとの
+    個数として保持する。反復の組は行・列ごとのウィンドウの出現数から、
+    重なっている（距離4未満の）同じウィンドウを除いて求める。
+    """
+
+    def __init__(self, grid: np.ndarray):
+        self.grid = grid
+        self.height, self.width = grid.shape
+        self.diagonal = min(self.width, self.height) // 2
+
+        self.symmetry_count = symmetry_count(grid)
+        self.repetition_count = repetition_count(grid) + repetition_count(grid.T)
+
+        # 行 ('r', y) と列 ('c', x) ごとのウィンドウと出現数
+        self.keys = {}
+        self.counts = {}
+        rows = grid.tolist()
+        for y, row in enumerate(rows):
+            self._init_line(('r', y), row)
+        for x, column in enumerate(zip(*rows)):
+            self._init_line(('c', x), column)
+
+        self.char_counts = np.bincount(grid.ravel(), minlength=max(map(ord, ASCII_CHARS)) + 1).tolist()
+
+    def _init_line(self, line, codes):
+        keys = [self._pack(codes[p:p + WINDOW]) for p in range(max(len(codes) - WINDOW, 0))]
+        self.keys[line] = keys
+        self.counts[line] = Counter(keys)
+
+    @staticmethod
+    def _pack(codes):
+        key = 0
+        for code in codes:
+            key = (key << CODE_BITS) | code
+        return key
+
+    def _pairs_of(self, y, x):
+        """セルが属する対称ペア（種類, 片方のy, 片方のx）"""
+        w, h = self.width, self.height
+        pairs = []
+        if x != w - 1 - x:
+            pairs.append(('v', y, min(x, w - 1 - x)))
+        if y != h - 1 - y:
+            pairs.append(('h', min(y, h - 1 - y), x))
+        if x == y and y < self.diagonal:
+            pairs.append(('d', y, y))
+        i = h - 1 - y
+        if i == w - 1 - x and i < self.diagonal:
+            pairs.append(('d', i, i))
+        return pairs
+
+    def _pair_value(self, pair):
+        kind, y, x = pair
+        item, w, h = self.grid.item, self.width, self.height
+        if kind == 'v':
+            return 1 if item(y, x) == item(y, w - 1 - x) else 0
+        if kind == 'h':
+            return 1 if item(y, x) == item(h - 1 - y, x) else 0
+        return 2 if item(y, x) == item(h - 1 - y, w - 1 - x) else 0
+
+    def _window(self, line, p):
+        kind, i = line
+        item = self.grid.item
+        if kind == 'r':
+            a, b, c, d = item(i, p), item(i, p + 1), item(i, p + 2), item(i, p + 3)
+        else:
+            a, b, c, d = item(p, i), item(p + 1, i), item(p + 2, i), item(p + 3, i)
+        return (((a << CODE_BITS | b) << CODE_BITS | c) << CODE_BITS) | d
+
+    def _matches(self, line, p):
+        """位置pのウィンドウと同じで、4文字以上離れたウィンドウの数"""
+        keys = self.keys[line]
+        key = keys[p]
+        matches = self.counts[line][key] - 1
+        for q in range(max(p - WINDOW + 1, 0), min(p + WINDOW, len(keys))):
+            if q != p and keys[q] == key:
+                matches -= 1
+        return matches
+
+    def _involving(self, line, positions):
+        """positions のウィンドウが関わる組の数（positions 同士の組は1回だけ数える）"""
+        keys = self.keys[line]
+        total = sum(self._matches(line, p) for p in positions)
+        ordered = sorted(positions)
+        for n, p in enumerate(ordered):
+            for q in ordered[n + 1:]:
+                if q - p >= WINDOW and keys[p] == keys[q]:
+                    total -= 1
+        return total
+
+    def _affected(self, changes):
+        """変更で影響を受ける対称ペアと、行・列ごとのウィンドウ位置"""
+        pairs = set()
+        windows = {}
+        for y, x, _ in changes:
+            pairs.update(self._pairs_of(y, x))
+            for line, pos in ((('r', y), x), (('c', x), y)):
+                count = len(self.keys[line])
+                for p in range(max(pos - WINDOW + 1, 0), min(pos + 1, count)):
+                    windows.setdefault(line, set()).add(p)
+        return pairs, windows
+
+    def apply(self, changes):
+        """[(y, x, コードポイント)] をグリッドに直接書き込んでスコアを更新し、元に戻すための変更を返す"""
+        pairs, windows = self._affected(changes)
+
+        self.symmetry_count -= sum(self._pair_value(pair) for pair in pairs)
+        for line, positions in windows.items():
+            self.repetition_count -= self._involving(line, positions)
+
+        grid, counts = self.grid, self.char_counts
+        undo = []
+        for y, x, code in changes:
+            old = grid.item(y, x)
+            undo.append((y, x, old))
+            grid[y, x] = code
+            if code >= len(counts):
+                counts.extend([0] * (code + 1 - len(counts)))
+            counts[old] -= 1
+            counts[code] += 1
+        undo.reverse()
+
+        for line, positions in windows.items():
+            keys, line_counts = self.keys[line], self.counts[line]
+            for p in positions:
+                line_counts[keys[p]] -= 1
+                keys[p] = self._window(line, p)
+                line_counts[keys[p]] += 1
+            self.repetition_count += self._involving(line, positions)
+        self.symmetry_count += sum(self._pair_value(pair) for pair in pairs)
+
+        return undo
+
+    def symmetry(self) -> float:
+        return self.symmetry_count / (self.width * self.height)
+
+    def repetition(self) -> float:
+        return self.repetition_count / 10.0
+
+    def contrast(self) -> float:
+        return entropy(self.char_counts, self.width * self.height)
+
+
+def print_progress(status):
+    """進捗を表示する progress コールバック"""
+    print(f"Generation {status['generation']}: Score={status['score']:.3f}, "
+          f"Temp={status['temperature']:.4f}, Best={status['best_score']:.3f}")
+
+
+def glyph_signatures(chars, subdivision=CELL_SUBDIVISION, size=GLYPH_FONT_SIZE):
+    """各文字を描いたときの小区画ごとのインクの濃さ（0-255、(文字数, 縦, 横) の配列）
+
+    いちばん濃い区画が255になるように全体をそろえる。
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size)
+    except TypeError:
+        font = ImageFont.load_default()
+    sample = chars + "Mg|"
+    boxes = [font.getbbox(char) for char in sample]
+    top, bottom = min(box[1] for box in boxes), max(box[3] for box in boxes)
+    cell_w = max(max(box[2] for box in boxes), 1)
+    cell_h = max(bottom - top, 1)
+
+    sub_w, sub_h = subdivision
+    signatures = []
+    for char in chars:
+        image = Image.new('L', (cell_w, cell_h), 0)
+        left = (cell_w - font.getlength(char)) / 2
+        ImageDraw.Draw(image).text((left, -top), char, fill=255, font=font)
+        signatures.append(np.asarray(image.resize((sub_w, sub_h), Image.BOX), dtype=np.float64))
+
+    signatures = np.array(signatures)
+    peak = signatures.max() or 1.0
+    return np.rint(signatures * 255 / peak).astype(np.int64)
+
+
+def _box_sum(image):
+    """3x3の範囲の和（外側は0）でぼかす"""
+    padded = np.pad(image, 1)
+    height, width = image.shape
+    return sum(padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3))
+
+
+class ImageTarget:
+    """目標画像と文字のシグネチャ
+
+    目標画像はグリッドの大きさ×小区画に縮小したインクの濃さ（0-255の整数）で持つ。
+    距離は整数で計算するので、全体を計算しても差分で更新しても同じ値になる。
+    """
+
+    def __init__(self, ink, chars, subdivision=CELL_SUBDIVISION, source=None, invert=False):
+        self.chars = chars
+        self.codes = [ord(char) for char in chars]
+        self.sub_w, self.sub_h = subdivision
+        self.signatures = glyph_signatures(chars, subdivision)
+        self.ink = np.asarray(ink, dtype=np.int64)
+        self.blurred = _box_sum(self.ink)
+        self.height = self.ink.shape[0] // self.sub_h
+        self.width = self.ink.shape[1] // self.sub_w
+        self.source = source
+        self.invert = invert
+
+        # コードポイント → シグネチャの番号
+        self.glyph_index = np.full(max(self.codes) + 1, -1, dtype=np.int64)
+        self.glyph_index[self.codes] = np.arange(len(chars))
+
+        # スコア = -(ぼかした画像同士の二乗誤差) を1文字分の最大の誤差が TARGET_SCALE になるようにしたもの
+        self.scale = TARGET_SCALE / (self.sub_w * self.sub_h * (9 * 255) ** 2)
+
+    @classmethod
+    def from_image(cls, image, width, height, chars=ASCII_CHARS, invert=False,
+                   subdivision=CELL_SUBDIVISION):
+        """画像（パスかPILの画像）から作る。暗い所ほどインクが濃い（invert なら逆）"""
+        from PIL import Image
+
+        source = None
+        if not isinstance(image, Image.Image):
+            source = str(image)
+            image = Image.open(image)
+        sub_w, sub_h = subdivision
+        gray = image.convert('L').resize((width * sub_w, height * sub_h), Image.BOX)
+        values = np.asarray(gray, dtype=np.int64)
+        ink = values if invert else 255 - values
+        return cls(ink, chars, subdivision, source=source, invert=invert)
+
+    def render(self, grid: np.ndarray) -> np.ndarray:
+        """グリッドを小区画の画像にする"""
+        blocks = self.signatures[self.glyph_index[grid]]
+        height, width = grid.shape
+        return blocks.transpose(0, 2, 1, 3).reshape(height * self.sub_h, width * self.sub_w)
+
+    def distance(self, grid: np.ndarray) -> int:
+        """グリッドを描いた画像と目標画像の（ぼかした上での）二乗誤差の合計"""
+        diff = _box_sum(self.render(grid)) - self.blurred
+        return int((diff * diff).sum())
+
+    def score(self, distance: int) -> float:
+        return -distance * self.scale
+
+    def best_glyphs(self) -> np.ndarray:
+        """ぼかさずにセルごとに最も近い文字を選んだグリッド（1文字ずつの変換と同じ考え方）"""
+        blocks = self.ink.reshape(self.height, self.sub_h, self.width, self.sub_w).transpose(0, 2, 1, 3)
+        diff = blocks[:, :, None] - self.signatures[None, None]
+        cost = (diff * diff).sum(axis=(3, 4))
+        return np.array(self.codes, dtype=np.uint32)[cost.argmin(axis=2)]
+
+
+@lru_cache(maxsize=4)
+def load_target(source, width, height, chars=ASCII_CHARS, invert=False):
+    """画像ファイルから ImageTarget を作る（同じ指定ならワーカー内で使い回す）"""
+    return ImageTarget.from_image(source, width, height, chars, invert)
+
+
+class TargetScorer:
+    """画像モードのスコア計算（変異したセルの周りのぼかし範囲だけを数え直す）"""
+
+    def __init__(self, grid: np.ndarray, target: ImageTarget):
+        self.grid = grid
+        self.target = target
+        self.padded = np.pad(target.render(grid), 1)
+        self.blurred = _box_sum(self.padded[1:-1, 1:-1])
+        self.total = target.distance(grid)
+
+    def _region_distance(self, r0, r1, c0, c1):
+        diff = self.blurred[r0:r1, c0:c1] - self.target.blurred[r0:r1, c0:c1]
+        return int((diff * diff).sum())
+
+    def apply(self, changes):
+        """[(y, x, コードポイント)] をグリッドに直接書き込んで距離を更新し、元に戻すための変更を返す"""
+        target, grid, padded, blurred = self.target, self.grid, self.padded, self.blurred
+        sub_w, sub_h = target.sub_w, target.sub_h
+        rows, cols = blurred.shape
+        undo = []
+        for y, x, code in changes:
+            undo.append((y, x, grid.item(y, x)))
+            r0, r1 = max(y * sub_h - 1, 0), min((y + 1) * sub_h + 1, rows)
+            c0, c1 = max(x * sub_w - 1, 0), min((x + 1) * sub_w + 1, cols)
+            self.total -= self._region_distance(r0, r1, c0, c1)
+
+            grid[y, x] = code
+            padded[1 + y * sub_h:1 + (y + 1) * sub_h, 1 + x * sub_w:1 + (x + 1) * sub_w] = \
+                target.signatures[target.glyph_index[code]]
+            region = blurred[r0:r1, c0:c1]
+            region[...] = 0
+            for dy in range(3):
+                for dx in range(3):
+                    region += padded[r0 + dy:r1 + dy, c0 + dx:c1 + dx]
+
+            self.total += self._region_distance(r0, r1, c0, c1)
+        undo.reverse()
+        return undo
+
+    def score(self) -> float:
+        return self.target.score(self.total)
+
+
 class EvolutionaryASCII:
-    def __init__(self, width=40, height=20):
+    def __init__(self, width=40, height=20, seed=None):
         self.width = width
         self.height = height
-        self.grid = []
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.grid = np.zeros((height, width), dtype=np.uint32)
         self.best_score = float('-inf')
-        self.best_grid = []
+        self.best_grid = self.grid.copy()
         self.temperature = 1.0
         self.cooling_rate = 0.995
+        self.accepted = 0
+        self.codes = [ord(char) for char in ASCII_CHARS]
+        self.target = None
 
     def random_char(self):
         """ランダムなASCII文字を選択"""
-        return random.choice(ASCII_CHARS)
+        return self.rng.choice(ASCII_CHARS)
+
+    def random_code(self):
+        """ランダムなASCII文字のコードポイントを選択"""
+        return self.rng.choice(self.codes)
+
+    def set_target(self, image, chars=ASCII_CHARS, invert=False):
+        """画像モードにする（以降のスコアは画像との近さ、変異に使う文字は chars）"""
+        if isinstance(image, ImageTarget):
+            self.target = image
+        elif isinstance(image, str):
+            self.target = load_target(image, self.width, self.height, chars, invert)
+        else:
+            self.target = ImageTarget.from_image(image, self.width, self.height, chars, invert)
+        self.codes = list(self.target.codes)
 
     def initialize(self):
-        """ランダムなグリッドで初期化"""
-        self.grid = [[self.random_char() for _ in range(self.width)] for _ in range(self.height)]
-        self.best_grid = copy.deepcopy(self.grid)
-
-    def score_symmetry(self, grid: List[List[str]]) -> float:
+        """ランダムなグリッドで初期化（画像モードではセルごとに最も近い文字から始める）"""
+        if self.target is not None:
+            self.grid = self.target.best_glyphs()
+            self.best_grid = self.grid.copy()
+            return
+        self.grid = np.array(
+            [[self.random_code() for _ in range(self.width)] for _ in range(self.height)],
+            dtype=np.uint32
+        )
+        self.best_grid = self.grid.copy()
+
+    def score_symmetry(self, grid) -> float:
         """対称性をスコア化（縦・横・斜め）"""
-        score = 0.0
-
-        # 縦対称
-        for y in range(self.height):
-            for x in range(self.width // 2):
-                if grid[y][x] == grid[y][self.width - 1 - x]:
-                    score += 1
-
-        # 横対称
-        for y in range(self.height // 2):
-            for x in range(self.width):
-                if grid[y][x] == grid[self.height - 1 - y][x]:
-                    score += 1
-
-        # 斜め対称
-        for i in range(min(self.width, self.height) // 2):
-            if grid[i][i] == grid[self.height - 1 - i][self.width - 1 - i]:
-                score += 2
-
-        return score / (self.width * self.height)
-
-    def score_repetition(self, grid: List[List[str]]) -> float:
-        """パターンの反復をスコア化"""
-        score = 0.0
-
-        # 横方向の反復
-        for y in range(self.height):
-            for x in range(self.width - 4):
-                pattern = grid[y][x:x+4]
-                # グリッド内で同じパターンを探す
-                for x2 in range(x + 4, self.width - 4):
-                    if grid[y][x2:x2+4] == pattern:
-                        score += 1
-
-        # 縦方向の反復
-        for x in range(self.width):
-            for y in range(self.height - 4):
-                pattern = [grid[y+i][x] for i in range(4)]
-                for y2 in range(y + 4, self.height - 4):
-                    pattern2 = [grid[y2+i][x] for i in range(4)]
-                    if pattern == pattern2:
-                        score += 1
-
-        return score / 10.0
-
-    def score_contrast(self, grid: List[List[str]]) -> float:
-        """コントラストと文字の分布をスコア化"""
-        char_counts = {}
-        for row in grid:
-            for char in row:
-                char_counts[char] = char_counts.get(char, 0) + 1
+        return symmetry_count(to_codes(grid)) / (self.width * self.height)
+
+    def score_repetition(self, grid) -> float:
+        """パターンの反復をスコア化（横方向と縦方向）"""
+        grid = to_codes(grid)
+        return (repetition_count(grid) + repetition_count(grid.T)) / 10.0
 
+    def score_contrast(self, grid) -> float:
+        """コントラストと文字の分布をスコア化"""
         # シャノンエントロピー（多様性）
-        total = self.width * self.height
-        entropy = 0.0
-        for count in char_counts.values():
-            p = count / total
-            entropy -= p * math.log2(p) if p > 0 else 0
+        counts = np.bincount(to_codes(grid).ravel())
+        return entropy(counts.tolist(), self.width * self.height)
 
-        return entropy
+    def combine(self, symmetry: float, repetition: float, contrast: float) -> float:
+        """各スコアの重み付き合計"""
+        return (symmetry * 3.0 + repetition * 1.5 + contrast * 0.5)
+
+    def evaluate(self, grid) -> float:
+        """総合スコア計算（グリッド全体を採点）"""
+        if self.target is not None:
+            return self.target.score(self.target.distance(to_codes(grid)))
 
-    def evaluate(self, grid: List[List[str]]) -> float:
-        """総合スコア計算"""
         symmetry = self.score_symmetry(grid)
         repetition = self.score_repetition(grid)
         contrast = self.score_contrast(grid)
 
-        # 重み付き合計
-        return (symmetry * 3.0 + repetition * 1.5 + contrast * 0.5)
+        return self.combine(symmetry, repetition, contrast)
+
+    def make_scorer(self, grid: np.ndarray):
+        """差分でスコアを更新するオブジェクト（grid をそのまま書き換える）"""
+        if self.target is not None:
+            return TargetScorer(grid, self.target)
+        return DeltaScorer(grid)
+
+    def evaluate_scorer(self, scorer) -> float:
+        """scorer が保持しているグリッドのスコア（evaluate と同じ値）"""
+        if self.target is not None:
+            return scorer.score()
+        return self.combine(scorer.symmetry(), scorer.repetition(), scorer.contrast())
 
-    def mutate(self, grid: List[List[str]]) -> List[List[str]]:
-        """グリッドを変異させる（ランダムな位置の文字を変更）"""
-        new_grid = copy.deepcopy(grid)
-        num_mutations = random.randint(1, 5)
+    def propose_mutation(self) -> List[Tuple[int, int, int]]:
+        """変異の内容 [(y, x, コードポイント)] を決める（ランダムな位置の文字を変更）"""
+        changes = []
+        num_mutations = self.rng.randint(1, 5)
 
         for _ in range(num_mutations):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            new_grid[y][x] = self.random_char()
+            x = self.rng.randint(0, self.width - 1)
+            y = self.rng.randint(0, self.height - 1)
+            changes.append((y, x, self.random_code()))
+
+        return changes
+
+    def mutate(self, grid: np.ndarray) -> np.ndarray:
+        """グリッドを変異させたコピーを返す（ランダムな位置の文字を変更）"""
+        new_grid = to_codes(grid).copy()
+        for y, x, code in self.propose_mutation():
+            new_grid[y, x] = code
 
         return new_grid
 
@@ -123,65 +547,339 @@ class EvolutionaryASCII:
         # 悪化も確率的に許容
         delta = old_score - new_score
         probability = math.exp(-delta / max(self.temperature, 0.01))
-        return random.random() < probability
-
-    def evolve(self, generations: int = 1000) -> List[List[str]]:
-        """進化を実行"""
-        current_grid = copy.deepcopy(self.grid)
-        current_score = self.evaluate(current_grid)
-
-        for gen in range(generations):
-            # 変異
-            new_grid = self.mutate(current_grid)
-            new_score = self.evaluate(new_grid)
-
-            # 採択判定
+        return self.rng.random() < probability
+
+    def evolve(self, generations: int = 1000, progress=None, progress_every: int = PROGRESS_EVERY,
+               checkpoint=None, checkpoint_every: int = CHECKPOINT_EVERY) -> np.ndarray:
+        """進化を実行
+
+        progress: progress_every 世代ごとに呼ぶ関数（世代・スコア・温度・ベストの dict を渡す）
+        checkpoint: checkpoint_every 世代ごとと最後に状態を保存するパス
+        終わった時点のグリッドを self.grid に残すので、続けて呼ぶと同じチェーンを進められる。
+        """
+        scorer = self.make_scorer(self.grid.copy())
+        current_grid = scorer.grid
+        self.grid = current_grid
+        current_score = self.evaluate_scorer(scorer)
+        if current_score > self.best_score:
+            self.best_score = current_score
+            np.copyto(self.best_grid, current_grid)
+
+        for _ in range(generations):
+            # 変異（グリッドに直接書き込み、変わったセルの周辺だけ採点し直す）
+            undo = scorer.apply(self.propose_mutation())
+            new_score = self.evaluate_scorer(scorer)
+
+            # 採択判定（不採用なら元に戻す）
             if self.should_accept(current_score, new_score):
-                current_grid = new_grid
                 current_score = new_score
+                self.accepted += 1
 
-                # ベスト記録更新
+                # ベスト記録更新（確保済みの配列に上書き）
                 if current_score > self.best_score:
                     self.best_score = current_score
-                    self.best_grid = copy.deepcopy(current_grid)
+                    np.copyto(self.best_grid, current_grid)
+            else:
+                scorer.apply(undo)
 
             # 温度を下げる（アニーリング）
             self.temperature *= self.cooling_rate
 
-            # 進捗表示（100世代ごと）
-            if gen % 100 == 0:
-                print(f"Generation {gen}: Score={current_score:.3f}, Temp={self.temperature:.4f}, Best={self.best_score:.3f}")
-
+            # 進捗（見ている人がいるときだけ）
+            if progress is not None and self.generation % progress_every == 0:
+                progress({
+                    'generation': self.generation,
+                    'score': current_score,
+                    'temperature': self.temperature,
+                    'best_score': self.best_score,
+                    'accepted': self.accepted,
+                })
+            self.generation += 1
+
+            if checkpoint is not None and self.generation % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint)
+
+        if checkpoint is not None and generations and self.generation % checkpoint_every:
+            self.save_checkpoint(checkpoint)
         return self.best_grid
 
-    def render(self, grid: List[List[str]]) -> str:
+    def save_checkpoint(self, path):
+        """現在の状態をnpzにアトミックに保存（グリッド・ベスト・温度・乱数の状態など）"""
+        version, internal, gauss_next = self.rng.getstate()
+        meta = {
+            'width': self.width,
+            'height': self.height,
+            'seed': self.seed,
+            'generation': self.generation,
+            'temperature': self.temperature,
+            'cooling_rate': self.cooling_rate,
+            'best_score': self.best_score,
+            'accepted': self.accepted,
+            'rng_version': version,
+            'rng_gauss_next': gauss_next,
+        }
+        arrays = {}
+        if self.target is not None:
+            # 画像モードは縮小済みの目標画像も保存する（元の画像が無くても再開できる）
+            meta['target'] = {'chars': self.target.chars, 'invert': self.target.invert,
+                              'source': self.target.source,
+                              'subdivision': [self.target.sub_w, self.target.sub_h]}
+            arrays['target_ink'] = self.target.ink.astype(np.uint8)
+
+        path = str(path)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                grid=self.grid,
+                best_grid=self.best_grid,
+                rng_state=np.array(internal, dtype=np.uint32),
+                meta=np.array(json.dumps(meta)),
+                **arrays,
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """save_checkpoint で保存した状態からインスタンスを作る"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            gen = cls(meta['width'], meta['height'], seed=meta['seed'])
+            gen.grid = data['grid'].astype(np.uint32)
+            gen.best_grid = data['best_grid'].astype(np.uint32)
+            internal = tuple(int(value) for value in data['rng_state'])
+            if 'target' in meta:
+                spec = meta['target']
+                gen.set_target(ImageTarget(data['target_ink'], spec['chars'], tuple(spec['subdivision']),
+                                           source=spec['source'], invert=spec['invert']))
+        gen.rng.setstate((meta['rng_version'], internal, meta['rng_gauss_next']))
+        gen.generation = meta['generation']
+        gen.temperature = meta['temperature']
+        gen.cooling_rate = meta['cooling_rate']
+        gen.best_score = meta['best_score']
+        gen.accepted = meta['accepted']
+        return gen
+
+    def evolve_islands(self, islands: int = 4, workers: int = None, generations: int = None,
+                       time_limit: float = None, epoch: int = EPOCH_GENERATIONS, seed: int = None) -> dict:
+        """複数の島で並行に進化させて、全体のベストと島ごとの統計を返す
+
+        generations（各島の世代数）か time_limit（秒）のどちらかで止める（両方なら早い方）。
+        epoch 世代ごとに、各島のベストが隣の島の現在のグリッドより良ければ移住させる。
+        """
+        if generations is None and time_limit is None:
+            generations = 1000
+        workers = workers or min(islands, os.cpu_count() or 1)
+        seed = seed if seed is not None else self.rng.randrange(2 ** 32)
+        high, low = ISLAND_TEMPERATURES
+        states = [
+            {
+                'island': i,
+                'seed': seed + i,
+                'width': self.width,
+                'height': self.height,
+                'initial_temperature': high * (low / high) ** (i / (islands - 1)) if islands > 1 else high,
+                'cooling_rate': self.cooling_rate,
+                'grid': None,
+                'generations': 0,
+                'migrations': 0,
+                'target': self.target,
+            }
+            for i in range(islands)
+        ]
+
+        started = time.perf_counter()
+        deadline = started + time_limit if time_limit else None
+        remaining = generations
+        epochs = 0
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while remaining is None or remaining > 0:
+                if deadline and time.perf_counter() >= deadline:
+                    break
+                step = epoch if remaining is None else min(epoch, remaining)
+                if pool:
+                    states = list(pool.map(_run_island, states, [step] * islands))
+                else:
+                    states = [_run_island(state, step) for state in states]
+                remaining = None if remaining is None else remaining - step
+                epochs += 1
+                _migrate(states)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        best = max(states, key=lambda state: state['best_score'])
+        self.grid = best['grid']
+        self.best_grid = best['best_grid']
+        self.best_score = best['best_score']
+        self.temperature = best['temperature']
+        return {
+            'best_grid': self.best_grid,
+            'best_score': self.best_score,
+            'best_island': best['island'],
+            'epochs': epochs,
+            'seconds': round(time.perf_counter() - started, 3),
+            'workers': workers,
+            'islands': [
+                {key: state[key] for key in ('island', 'seed', 'initial_temperature', 'temperature',
+                                             'generations', 'accepted', 'migrations', 'score', 'best_score')}
+                for state in states
+            ],
+        }
+
+    def render(self, grid) -> str:
         """グリッドを文字列としてレンダリング"""
-        return '\n'.join(''.join(row) for row in grid)
+        grid = np.ascontiguousarray(to_codes(grid), dtype=np.uint32)
+        return '\n'.join(grid.view(np.dtype(('U', grid.shape[1])))[:, 0].tolist())
 
-    def generate(self, generations: int = 1000) -> str:
+    def generate(self, generations: int = 1000, progress=None) -> str:
         """ASCIIアートを生成"""
         self.initialize()
-        best_grid = self.evolve(generations)
+        best_grid = self.evolve(generations, progress=progress)
         return self.render(best_grid)
 
 
+def _run_island(state, generations):
+    """1つの島を generations 世代進めた状態を返す（プロセスプールのワーカーで実行）"""
+    gen = EvolutionaryASCII(state['width'], state['height'], seed=state['seed'])
+    gen.cooling_rate = state['cooling_rate']
+    if state['target'] is not None:
+        gen.set_target(state['target'])
+    if state['grid'] is None:
+        gen.initialize()
+        gen.temperature = state['initial_temperature']
+    else:
+        gen.rng.setstate(state['rng'])
+        gen.grid, gen.best_grid, gen.best_score = state['grid'], state['best_grid'], state['best_score']
+        gen.temperature, gen.accepted = state['temperature'], state['accepted']
+
+    gen.evolve(generations)
+
+    return {
+        **state,
+        'grid': gen.grid,
+        'best_grid': gen.best_grid,
+        'best_score': gen.best_score,
+        'score': gen.evaluate(gen.grid),
+        'temperature': gen.temperature,
+        'accepted': gen.accepted,
+        'generations': state['generations'] + generations,
+        'rng': gen.rng.getstate(),
+    }
+
+
+def _migrate(states):
+    """各島のベストを隣の島（環状）へ移住させる（移住先の現在のグリッドより良い場合だけ）"""
+    bests = [(state['best_grid'], state['best_score']) for state in states]
+    for i, state in enumerate(states):
+        grid, score = bests[i - 1]
+        if i != (i - 1) % len(states) and score > state['score']:
+            state['grid'] = grid.copy()
+            state['score'] = score
+            state['migrations'] += 1
+
+
+def benchmark(width=40, height=20, worker_counts=None, time_limits=(1.0, 2.0, 4.0), seed=0):
+    """ワーカー数（=島の数）と持ち時間ごとのベストスコアを表にする（1は単一チェーン）"""
+    worker_counts = worker_counts or sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"サイズ: {width}x{height}, CPU: {os.cpu_count()}")
+    print(f"{'workers':>8} {'time(s)':>8} {'best':>9} {'generations':>12}")
+    results = []
+    for time_limit in time_limits:
+        for workers in worker_counts:
+            gen = EvolutionaryASCII(width, height)
+            result = gen.evolve_islands(islands=workers, workers=workers, time_limit=time_limit, seed=seed)
+            total = sum(island['generations'] for island in result['islands'])
+            print(f"{workers:>8} {result['seconds']:>8.2f} {result['best_score']:>9.3f} {total:>12}")
+            results.append({'workers': workers, 'time_limit': time_limit, 'seconds': result['seconds'],
+                            'best_score': result['best_score'], 'generations': total})
+    return results
+
+
+def target_height(image_path, width):
+    """画像の縦横比と文字の縦横比から行数を決める"""
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        original_width, original_height = image.size
+    return max(int(width * original_height / original_width * CHAR_ASPECT), 1)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="進化的ASCIIアートジェネレーター")
+    parser.add_argument("--width", type=int, default=40, help="幅（デフォルト: 40）")
+    parser.add_argument("--height", type=int, default=None,
+                        help="高さ（デフォルト: 20、画像モードでは画像の縦横比から決める）")
+    parser.add_argument("-g", "--generations", type=int, default=None, help="世代数（デフォルト: 1500）")
+    parser.add_argument("--islands", type=int, default=1, help="島の数（2以上で島モデル）")
+    parser.add_argument("--workers", type=int, default=None, help="ワーカープロセス数（デフォルト: CPU数まで）")
+    parser.add_argument("--time", type=float, default=None, help="島モデルの持ち時間（秒）")
+    parser.add_argument("--seed", type=int, default=None, help="乱数の種")
+    parser.add_argument("--benchmark", action="store_true", help="ワーカー数ごとのスコアと時間を比較")
+    parser.add_argument("--checkpoint", help="状態を定期的に保存するファイル（.npz）")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                        help=f"保存する間隔（世代、デフォルト: {CHECKPOINT_EVERY}）")
+    parser.add_argument("--resume", help="保存した状態から続ける（--checkpoint を省略するとこのファイルに保存）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="進捗を表示しない")
+    parser.add_argument("--target", help="目標の画像（指定すると画像に近づけるように進化させる）")
+    parser.add_argument("-i", "--invert", action="store_true", help="画像モードで明るい所を濃い文字にする")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.width, args.height or 20)
+        return
+
     print("🧬 進化的ASCIIアートジェネレーター")
     print("=" * 50)
 
     # パラメータ設定
-    WIDTH = 40
-    HEIGHT = 20
-    GENERATIONS = 1500
-
-    # ジェネレーター作成
-    gen = EvolutionaryASCII(WIDTH, HEIGHT)
-
-    # 進化実行
-    print(f"\nサイズ: {WIDTH}x{HEIGHT}, 世代数: {GENERATIONS}")
-    print("進化中...\n")
-
-    art = gen.generate(GENERATIONS)
+    WIDTH = args.width
+    HEIGHT = args.height or (target_height(args.target, WIDTH) if args.target else 20)
+    GENERATIONS = args.generations or (None if args.time else 1500)
+
+    progress = None if args.quiet else print_progress
+
+    if args.resume:
+        gen = EvolutionaryASCII.load_checkpoint(args.resume)
+        print(f"\n再開: {args.resume}（{gen.width}x{gen.height}, {gen.generation}世代目から{GENERATIONS or 1500}世代）")
+        print("進化中...\n")
+        gen.evolve(GENERATIONS or 1500, progress=progress,
+                   checkpoint=args.checkpoint or args.resume, checkpoint_every=args.checkpoint_every)
+        art = gen.render(gen.best_grid)
+    elif args.islands > 1:
+        # ジェネレーター作成
+        gen = EvolutionaryASCII(WIDTH, HEIGHT, seed=args.seed)
+        if args.target:
+            gen.set_target(args.target, invert=args.invert)
+        print(f"\nサイズ: {WIDTH}x{HEIGHT}, 島: {args.islands}")
+        print("進化中...\n")
+        result = gen.evolve_islands(args.islands, args.workers, GENERATIONS, args.time, seed=args.seed)
+        for island in result['islands']:
+            print(f"Island {island['island']}: Best={island['best_score']:.3f}, "
+                  f"T0={island['initial_temperature']:.2f}, Gen={island['generations']}, "
+                  f"Accepted={island['accepted']}, Migrations={island['migrations']}")
+        art = gen.render(result['best_grid'])
+    else:
+        # ジェネレーター作成
+        gen = EvolutionaryASCII(WIDTH, HEIGHT, seed=args.seed)
+        if args.target:
+            gen.set_target(args.target, invert=args.invert)
+
+        # 進化実行
+        print(f"\nサイズ: {WIDTH}x{HEIGHT}, 世代数: {GENERATIONS}")
+        print("進化中...\n")
+
+        gen.initialize()
+        if args.target:
+            print(f"1文字ずつ選んだ場合のスコア: {gen.evaluate(gen.grid):.3f}")
+        started = time.perf_counter()
+        gen.evolve(GENERATIONS or 1500, progress=progress,
+                   checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every)
+        elapsed = time.perf_counter() - started
+        print(f"{(GENERATIONS or 1500) / max(elapsed, 1e-9):.0f} 世代/秒")
+        art = gen.render(gen.best_grid)
 
     # 結果表示
     print("\n" + "=" * 50)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+evolutionary-ascii.py のテスト（python3 -m pytest python/test_evolutionary_ascii.py）
+
+差分でのスコア更新（DeltaScorer / TargetScorer）が、ランダムな変異と
+その取り消しを繰り返してもグリッド全体の再計算（evaluate）と一致することを確かめる。
+"""
+
+import importlib.util
+import random
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).parent
+
+_spec = importlib.util.spec_from_file_location("evolutionary_ascii", SCRIPT_DIR / "evolutionary-ascii.py")
+evolutionary_ascii = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(evolutionary_ascii)
+
+# 1x1〜14x14 のすべての大きさ
+SIZES = [(height, width) for height in range(1, 15) for width in range(1, 15)]
+
+# 変異に使う文字（ASCII_CHARS に無い文字も混ぜて文字数の表の拡張も通す）
+MUTATION_CHARS = evolutionary_ascii.ASCII_CHARS + "AZ█"
+
+
+def _random_changes(rng, height, width, codes):
+    """同じセルへの重複も含むランダムな変更 [(y, x, コードポイント)]"""
+    return [(rng.randrange(height), rng.randrange(width), rng.choice(codes))
+            for _ in range(rng.randint(1, 5))]
+
+
+def _check_random_walk(art, rng, steps, codes):
+    """変異→（ときどき取り消し）を繰り返し、毎回 evaluate と比べる"""
+    scorer = art.make_scorer(art.grid.copy())
+    for step in range(steps):
+        undo = scorer.apply(_random_changes(rng, art.height, art.width, codes))
+        assert art.evaluate_scorer(scorer) == art.evaluate(scorer.grid), \
+            f"{art.height}x{art.width} step {step}: after apply"
+        if rng.random() < 0.5:
+            scorer.apply(undo)
+            assert art.evaluate_scorer(scorer) == art.evaluate(scorer.grid), \
+                f"{art.height}x{art.width} step {step}: after undo"
+
+
+def test_delta_scorer_matches_full_evaluation():
+    rng = random.Random(0)
+    codes = [ord(char) for char in MUTATION_CHARS]
+    for height, width in SIZES:
+        art = evolutionary_ascii.EvolutionaryASCII(width, height, seed=rng.random())
+        art.initialize()
+        _check_random_walk(art, rng, 40, codes)
+
+
+def test_delta_scorer_undo_restores_grid():
+    rng = random.Random(1)
+    art = evolutionary_ascii.EvolutionaryASCII(9, 7, seed=1)
+    art.initialize()
+    original = art.grid.copy()
+    scorer = art.make_scorer(art.grid.copy())
+    score = art.evaluate_scorer(scorer)
+    undos = [scorer.apply(_random_changes(rng, 7, 9, art.codes)) for _ in range(30)]
+    for undo in reversed(undos):
+        scorer.apply(undo)
+    assert np.array_equal(scorer.grid, original)
+    assert art.evaluate_scorer(scorer) == score
+
+
+def test_target_scorer_matches_full_evaluation():
+    rng = random.Random(2)
+    sub_w, sub_h = evolutionary_ascii.CELL_SUBDIVISION
+    for height, width in SIZES:
+        ink = np.random.default_rng(rng.randrange(2 ** 32)).integers(0, 256, (height * sub_h, width * sub_w))
+        target = evolutionary_ascii.ImageTarget(ink, evolutionary_ascii.ASCII_CHARS)
+        art = evolutionary_ascii.EvolutionaryASCII(width, height, seed=rng.random())
+        art.set_target(target)
+        art.initialize()
+        _check_random_walk(art, rng, 20, art.codes)
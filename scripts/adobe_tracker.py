@@ -1,53 +1,108 @@
 #!/usr/bin/env python3
 """
 Adobe製品ニュース・リリース追跡スクリプト（改良版）
+
+各ソースはスレッドプールで並行に取得し、終わった順に処理する。
+同じホストへの同時接続数はホストごとに制限し、1リクエストごとの
+タイムアウトに加えて全体のタイムアウトも設ける。
+前回の ETag / Last-Modified を送る条件付きリクエストで、
+304 Not Modified が返ったソースはダウンロードも解析も省略する。
+追跡データは実行中メモリ上で更新し、最後に1回だけアトミックに保存する。
+ソースごとのチェック結果は履歴（JSONL）に追記していく。
+ページはソースの種類ごとの抽出器でエントリ（リリースノートの項目・ブログ記事）に
+分け、各エントリの指紋を記録して、まだ見ていないエントリだけを新着として報告する。
+
+使い方:
+    python3 adobe_tracker.py            # 全ソースを1回チェック
+    python3 adobe_tracker.py --daemon   # ソースごとの間隔でチェックし続ける
+    python3 adobe_tracker.py --status   # 各ソースの次回チェック予定を表示
+
+デーモンモードではソースごとの interval（秒）で予定を組み、起動時の開始時刻は
+ばらつかせ、エラーが続くソースは指数的に間隔を空ける。予定は STATUS_FILE に保存する。
 """
 
+import argparse
 import json
+import random
 import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
+from urllib.parse import urljoin, urlparse
 import hashlib
 
+from youtube_store import locked, write_json
+
 # 設定
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 WORKSPACE = PROJECT_ROOT.parent / ".openclaw" / "workspace"
 TRACKING_FILE = WORKSPACE / "memory" / "adobe-tracking.json"
 LAST_CHECK_FILE = WORKSPACE / "memory" / "last-adobe-check.txt"
+HISTORY_FILE = WORKSPACE / "memory" / "adobe-tracking-history.jsonl"
+STATUS_FILE = WORKSPACE / "memory" / "adobe-tracker-status.json"
+
+# 取得の設定
+REQUEST_TIMEOUT = 15   # 1リクエストのタイムアウト（秒）
+TOTAL_TIMEOUT = 60     # 全ソース合計のタイムアウト（秒）
+MAX_WORKERS = 8        # 同時に取得するソース数
+PER_HOST_LIMIT = 2     # 同じホストへの同時接続数
+USER_AGENT = "Mozilla/5.0 (compatible; adobe-tracker)"
+
+# エントリ抽出の設定
+MAX_SEEN = 500         # ソースごとに覚えておく指紋の数
+SUMMARY_LENGTH = 160   # レポートに載せる本文の長さ
+
+# デーモンモードの設定（秒）
+DEFAULT_INTERVAL = 6 * 3600  # interval の無いソースの間隔
+START_JITTER = 300           # 起動直後のチェックをばらつかせる幅
+MAX_BACKOFF = 24 * 3600      # エラーが続くときの再試行間隔の上限（通常の間隔の方が長ければそちら）
+JITTER_RATIO = 0.1           # 予定時刻に加えるゆらぎ（間隔に対する割合）
+MAX_SLEEP = 60               # 1回の待ち時間の上限（予定の変更に追従するため）
 
 # ニュースソース（URLを最新のものに更新）
 NEWS_SOURCES = {
     "photoshop_release": {
         "name": "Photoshop Release Notes",
         "url": "https://helpx.adobe.com/photoshop/whats-new.html",
-        "type": "release_notes"
+        "type": "release_notes",
+        "interval": 24 * 3600
     },
     "illustrator_release": {
         "name": "Illustrator Release Notes",
         "url": "https://helpx.adobe.com/illustrator/whats-new.html",
-        "type": "release_notes"
+        "type": "release_notes",
+        "interval": 24 * 3600
     },
     "premiere_release": {
         "name": "Premiere Pro Release Notes",
         "url": "https://helpx.adobe.com/premiere-pro/whats-new.html",
-        "type": "release_notes"
+        "type": "release_notes",
+        "interval": 24 * 3600
     },
     "lightroom_release": {
         "name": "Lightroom Release Notes",
         "url": "https://helpx.adobe.com/lightroom/whats-new.html",
-        "type": "release_notes"
+        "type": "release_notes",
+        "interval": 24 * 3600
     },
     "aftereffects_release": {
         "name": "After Effects Release Notes",
         "url": "https://helpx.adobe.com/after-effects/whats-new.html",
-        "type": "release_notes"
+        "type": "release_notes",
+        "interval": 24 * 3600
     },
     "adobe_blog": {
         "name": "Adobe Blog",
         "url": "https://blog.adobe.com/",
-        "type": "blog"
+        "type": "blog",
+        "interval": 2 * 3600
     }
 }
 
@@ -58,11 +113,65 @@ def load_tracking_data():
             return json.load(f)
     return {}
 
+def merge_tracking_entry(ours, theirs):
+    """同じソースの2つの記録をまとめる（新しくチェックした方を使い、既読の指紋は両方残す）"""
+    newer, older = (ours, theirs) if ours.get('last_checked', '') >= theirs.get('last_checked', '') else (theirs, ours)
+    merged = dict(newer)
+    if newer.get('seen') is not None or older.get('seen') is not None:
+        seen = list(newer.get('seen') or [])
+        current = set(seen)
+        merged['seen'] = (seen + [fp for fp in older.get('seen') or [] if fp not in current])[:MAX_SEEN]
+    return merged
+
 def save_tracking_data(data):
-    """追跡データを保存"""
-    TRACKING_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(TRACKING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """追跡データをアトミックに保存
+
+    デーモンと単発の実行が重なっても互いの結果を失わないように、ロックを取って
+    保存済みのデータを読み直し、ソースごとにマージしてから置き換える。マージ後のデータを返す。
+    """
+    with locked(TRACKING_FILE):
+        merged = load_tracking_data()
+        for source_key, entry in data.items():
+            saved = merged.get(source_key)
+            merged[source_key] = entry if saved is None else merge_tracking_entry(entry, saved)
+        write_json(TRACKING_FILE, merged, indent=2)
+    return merged
+
+def append_history(records):
+    """ソースごとのチェック結果を履歴に1行ずつ追記"""
+    if not records:
+        return
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def load_history(source_key=None):
+    """履歴を読み込む（source_key を指定するとそのソースだけ）"""
+    if not HISTORY_FILE.exists():
+        return []
+    records = []
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if source_key is None or record['source'] == source_key:
+                records.append(record)
+    return records
+
+def history_record(source_key, page=None, changed=False, latest_year=None, error=None):
+    """履歴の1行分（状態ファイルには入れない、傾向を見るための記録）"""
+    return {
+        'checked_at': datetime.now().isoformat(timespec='seconds'),
+        'source': source_key,
+        'status': page['status'] if page else None,
+        'changed': changed,
+        'latest_year': latest_year,
+        'bytes': page.get('bytes', 0) if page else 0,
+        'seconds': round(page.get('seconds', 0), 3) if page else None,
+        'error': str(error) if error is not None else None
+    }
 
 def load_last_check():
     """最終チェック時刻を読み込む"""
@@ -81,101 +190,604 @@ def generate_content_hash(content):
     """コンテンツハッシュを生成"""
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
-def check_url_changes(source_key, url):
-    """URLの変更をチェック"""
+class PageParser(HTMLParser):
+    """HTMLを見出しとテキストブロックの並びにする（script/nav などは読み飛ばす）"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'svg', 'form'}
+    BLOCK_TAGS = {'p', 'li', 'div', 'section', 'br', 'tr', 'dd', 'dt', 'ul', 'ol', 'table'}
+    HEADINGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4}
+
+    def __init__(self):
+        super().__init__()
+        self.tokens = []
+        self.skip = []
+        self.heading = None
+        self.text = []
+
+    def _flush(self):
+        text = ' '.join(''.join(self.text).split())
+        self.text = []
+        if text:
+            self.tokens.append({'kind': 'text', 'text': text})
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip.append(tag)
+            return
+        if self.skip:
+            return
+        if tag in self.HEADINGS:
+            self._flush()
+            self.heading = {'kind': 'heading', 'level': self.HEADINGS[tag], 'text': [], 'href': None}
+        elif tag == 'a' and self.heading is not None and self.heading['href'] is None:
+            self.heading['href'] = dict(attrs).get('href')
+        elif tag == 'article':
+            self._flush()
+            self.tokens.append({'kind': 'article'})
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self.skip:
+            if tag == self.skip[-1]:
+                self.skip.pop()
+            return
+        if tag in self.HEADINGS and self.heading is not None:
+            self.heading['text'] = ' '.join(''.join(self.heading['text']).split())
+            if self.heading['text']:
+                self.tokens.append(self.heading)
+            self.heading = None
+        elif tag == 'article':
+            self._flush()
+            self.tokens.append({'kind': 'article_end'})
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        if self.heading is not None:
+            self.heading['text'].append(data)
+        else:
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+def parse_page(content):
+    """ページを見出しとテキストのトークン列にする"""
+    parser = PageParser()
+    parser.feed(content)
+    parser.close()
+    return parser.tokens
+
+def make_entry(title, body, url, key):
+    """エントリ（指紋は key を正規化したもののハッシュ）"""
+    body = ' '.join(body)
+    return {
+        'title': title,
+        'url': url,
+        'summary': body[:SUMMARY_LENGTH],
+        'fingerprint': generate_content_hash(' '.join(key.lower().split()))
+    }
+
+def extract_release_notes(content, base_url):
+    """リリースノートを h2/h3 の見出しごとのエントリに分ける
+
+    指紋は見出しと本文から作るので、項目の中身が書き換わった場合も新着になる。
+    """
+    entries = []
+    title, body, url = None, [], base_url
+    for token in parse_page(content):
+        if token['kind'] == 'heading' and token['level'] in (2, 3):
+            if title:
+                entries.append(make_entry(title, body, url, title + ' ' + ' '.join(body)))
+            title, body = token['text'], []
+            url = urljoin(base_url, token['href']) if token['href'] else base_url
+        elif token['kind'] == 'text' and title:
+            body.append(token['text'])
+    if title:
+        entries.append(make_entry(title, body, url, title + ' ' + ' '.join(body)))
+    return entries
+
+def extract_blog_posts(content, base_url):
+    """ブログを記事ごとのエントリに分ける
+
+    <article> があればその中の最初の見出し、無ければリンク付きの見出しを記事とみなす。
+    指紋は記事のURL（無ければタイトル）なので、一覧の並びや抜粋が変わっても新着にならない。
+    """
+    tokens = parse_page(content)
+    entries = []
+    if any(token['kind'] == 'article' for token in tokens):
+        post = None
+        for token in tokens:
+            if token['kind'] == 'article':
+                post = {'title': None, 'href': None, 'body': []}
+            elif token['kind'] == 'article_end':
+                if post and post['title']:
+                    url = urljoin(base_url, post['href']) if post['href'] else base_url
+                    entries.append(make_entry(post['title'], post['body'], url, post['href'] or post['title']))
+                post = None
+            elif post is not None:
+                if token['kind'] == 'heading' and not post['title']:
+                    post['title'], post['href'] = token['text'], token['href']
+                elif token['kind'] == 'text':
+                    post['body'].append(token['text'])
+        return entries
+
+    post = None
+    for token in tokens:
+        if token['kind'] == 'heading':
+            if post:
+                entries.append(post)
+            post = None
+            if token['level'] >= 2 and token['href']:
+                post = make_entry(token['text'], [], urljoin(base_url, token['href']), token['href'])
+        elif token['kind'] == 'text' and post and not post['summary']:
+            post['summary'] = token['text'][:SUMMARY_LENGTH]
+    if post:
+        entries.append(post)
+    return entries
+
+# ソースの種類ごとの抽出器
+EXTRACTORS = {
+    'release_notes': extract_release_notes,
+    'blog': extract_blog_posts,
+}
+
+def extract_entries(source_type, content, base_url):
+    """ソースの種類に合った抽出器でエントリに分ける
+
+    エントリが1つも取れないページは、ページ全体を1エントリとして扱う。
+    """
+    extractor = EXTRACTORS.get(source_type, extract_release_notes)
+    entries = extractor(content, base_url)
+    if not entries:
+        entries = [make_entry(base_url, [], base_url, content)]
+
+    # 同じ指紋のエントリ（ページ内の重複）は最初の1つだけ
+    unique, seen = [], set()
+    for entry in entries:
+        if entry['fingerprint'] not in seen:
+            seen.add(entry['fingerprint'])
+            unique.append(entry)
+    return unique
+
+def fetch_page(url, timeout=REQUEST_TIMEOUT, validators=None):
+    """URLを条件付きで取得（リダイレクトは追従）
+
+    validators に前回の etag / last_modified を渡すと If-None-Match /
+    If-Modified-Since を送る。戻り値は status（200 または 304）、content、
+    etag、last_modified、bytes（受信した本文のバイト数）、seconds の辞書。
+    """
+    headers = {'User-Agent': USER_AGENT}
+    validators = validators or {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    started = time.perf_counter()
+    request = urllib.request.Request(url, headers=headers)
     try:
-        result = subprocess.run(
-            ['curl', '-s', '-L', url],
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
-
-        if result.returncode == 0:
-            # ページの内容から日付情報を抽出
-            content = result.stdout
-            content_hash = generate_content_hash(content[:10000])  # 最初の10KBをハッシュ化
-
-            tracking_data = load_tracking_data()
-            last_hash = tracking_data.get(source_key, {}).get('last_hash')
-
-            # 最新の情報を抽出（現在の年または近い将来のみ）
-            current_year = datetime.now().year
-            dates = re.findall(r'(20[2-9][0-9])', content)
-            # 不自然な年（2095など）を除外
-            valid_dates = [int(d) for d in dates if current_year - 1 <= int(d) <= current_year + 2]
-            latest_year = str(max(valid_dates)) if valid_dates else 'N/A'
-
-            is_changed = last_hash != content_hash
-
-            tracking_data[source_key] = {
-                'name': NEWS_SOURCES[source_key]['name'],
-                'url': url,
-                'type': NEWS_SOURCES[source_key]['type'],
-                'last_hash': content_hash,
-                'latest_year': latest_year,
-                'last_checked': datetime.now().isoformat(),
-                'changed': is_changed
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return {
+                'status': response.status,
+                'content': body.decode(charset, errors='replace'),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'bytes': len(body),
+                'seconds': time.perf_counter() - started
             }
-            save_tracking_data(tracking_data)
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        return {
+            'status': 304,
+            'content': None,
+            'etag': e.headers.get('ETag') or validators.get('etag'),
+            'last_modified': e.headers.get('Last-Modified') or validators.get('last_modified'),
+            'bytes': 0,
+            'seconds': time.perf_counter() - started
+        }
 
-            return is_changed, latest_year
-        return False, 'Error'
+class HostLimiter:
+    """ホストごとの同時接続数を制限するセマフォの集まり"""
+
+    def __init__(self, limit=PER_HOST_LIMIT):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def __call__(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self.semaphores[host]
+
+def poll_sources(sources, fetcher=fetch_page, validators=None, max_workers=MAX_WORKERS,
+                 per_host=PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT, total_timeout=TOTAL_TIMEOUT):
+    """全ソースを並行に取得し、終わった順に (source_key, page, error) を返す
+
+    validators はソースごとの前回の etag / last_modified（条件付きリクエスト用）。
+    total_timeout までに終わらなかったソースは TimeoutError として返す。
+    fetcher(url, timeout, validators) を差し替えればローカルのテスト用サーバーでも動かせる。
+    """
+    limiter = HostLimiter(per_host)
+    validators = validators or {}
+
+    def fetch(key, url):
+        with limiter(url):
+            return fetcher(url, timeout, validators.get(key))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {pool.submit(fetch, key, info['url']): key for key, info in sources.items()}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=total_timeout):
+            pending.discard(future)
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    except FuturesTimeoutError:
+        for future in pending:
+            future.cancel()
+            yield futures[future], None, TimeoutError(f"not finished within {total_timeout}s")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def process_content(source_key, source_info, page, tracking_data):
+    """取得したページから新着エントリを探して (新着あり, 最新年) を返す
+
+    tracking_data（メモリ上の追跡データ）を更新するだけで、保存は呼び出し側で行う。
+    初回（まだ指紋が無いソース）は全エントリを既読として記録し、新着にはしない。
+    """
+    previous = tracking_data.get(source_key, {})
+
+    # 304 Not Modified: 解析もしない
+    if page['status'] == 304:
+        tracking_data[source_key] = {
+            **previous,
+            'name': source_info['name'],
+            'url': source_info['url'],
+            'type': source_info['type'],
+            'last_checked': datetime.now().isoformat(),
+            'changed': False,
+            'new_entries': []
+        }
+        return False, previous.get('latest_year', 'N/A')
+
+    content = page['content']
+    entries = extract_entries(source_info['type'], content, source_info['url'])
+
+    seen = previous.get('seen')
+    if seen is None:
+        new_entries = []
+    else:
+        seen_set = set(seen)
+        new_entries = [entry for entry in entries if entry['fingerprint'] not in seen_set]
+    # 新しく見た指紋を先頭に、古いものから捨てる
+    fingerprints = [entry['fingerprint'] for entry in entries]
+    current = set(fingerprints)
+    seen = (fingerprints + [fp for fp in (seen or []) if fp not in current])[:MAX_SEEN]
+
+    # 最新の情報を抽出（現在の年または近い将来のみ）
+    current_year = datetime.now().year
+    dates = re.findall(r'(20[2-9][0-9])', content)
+    # 不自然な年（2095など）を除外
+    valid_dates = [int(d) for d in dates if current_year - 1 <= int(d) <= current_year + 2]
+    latest_year = str(max(valid_dates)) if valid_dates else 'N/A'
+
+    is_changed = bool(new_entries)
+
+    tracking_data[source_key] = {
+        'name': source_info['name'],
+        'url': source_info['url'],
+        'type': source_info['type'],
+        'latest_year': latest_year,
+        'last_checked': datetime.now().isoformat(),
+        'changed': is_changed,
+        'entry_count': len(entries),
+        'new_entries': [
+            {'title': entry['title'], 'url': entry['url'], 'summary': entry['summary']}
+            for entry in new_entries
+        ],
+        'seen': seen,
+        # 条件付きリクエスト用の検証子と、304で節約できる量の目安
+        'etag': page.get('etag'),
+        'last_modified': page.get('last_modified'),
+        'content_bytes': page.get('bytes', len(content)),
+        'fetch_seconds': round(page.get('seconds', 0), 3)
+    }
+
+    return is_changed, latest_year
+
+def get_validators(tracking_data):
+    """ソースごとの前回の etag / last_modified"""
+    return {
+        key: {'etag': item.get('etag'), 'last_modified': item.get('last_modified')}
+        for key, item in tracking_data.items()
+        if item.get('etag') or item.get('last_modified')
+    }
+
+def estimate_savings(previous, page):
+    """304で節約できたバイト数と秒数（前回のフル取得との差）"""
+    return (previous.get('content_bytes', 0),
+            max(previous.get('fetch_seconds', 0) - page.get('seconds', 0), 0))
+
+def check_url_changes(source_key, url):
+    """URLの変更をチェック（1ソースだけ取得する場合）"""
+    tracking_data = load_tracking_data()
+    try:
+        page = fetch_page(url, validators=get_validators(tracking_data).get(source_key))
+        is_changed, latest_year = process_content(source_key, {**NEWS_SOURCES[source_key], 'url': url}, page, tracking_data)
     except Exception as e:
         print(f"Error checking {url}: {e}")
+        append_history([history_record(source_key, error=e)])
         return False, 'Error'
 
-def generate_report(all_items):
-    """レポートを生成"""
+    save_tracking_data(tracking_data)
+    append_history([history_record(source_key, page, is_changed, latest_year)])
+    return is_changed, latest_year
+
+def generate_report(all_items, savings=None):
+    """レポートを生成（savings は条件付きリクエストで節約できた量）
+
+    新着エントリだけを列挙し、新着の無いソースは1行にまとめる。
+    """
     if not all_items:
         return ""
 
     report = ["📰 **Adobe製品最新情報**\n"]
     report.append(f"チェック時刻: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    if savings and savings['not_modified']:
+        report.append(f"未更新（304）: {savings['not_modified']}ソース、"
+                      f"{savings['bytes'] / 1024:.1f} KB / {savings['seconds']:.1f} 秒 節約\n")
 
-    release_notes = [item for item in all_items if item['type'] == 'release_notes']
-    blogs = [item for item in all_items if item['type'] == 'blog']
-
-    if release_notes:
-        report.append("\n📋 **リリースノート:**")
-        for item in release_notes:
-            year = item.get('latest_year', 'N/A')
-            report.append(f"- [{item['name']}]({item['url']}) (最新: {year})")
+    labels = {'release_notes': "📋 **リリースノート:**", 'blog': "📝 **ブログ/ニュース:**"}
+    updated = [item for item in all_items if item.get('new_entries')]
+    for source_type, label in labels.items():
+        items = [item for item in updated if item['type'] == source_type]
+        if not items:
+            continue
+        report.append(f"\n{label}")
+        for item in items:
+            report.append(f"- [{item['name']}]({item['url']}) 新着{len(item['new_entries'])}件")
+            for entry in item['new_entries']:
+                line = f"  - [{entry['title']}]({entry['url']})"
+                if entry['summary']:
+                    line += f": {entry['summary']}"
+                report.append(line)
 
-    if blogs:
-        report.append("\n📝 **ブログ/ニュース:**")
-        for item in blogs:
-            year = item.get('latest_year', 'N/A')
-            report.append(f"- [{item['name']}]({item['url']}) (最新: {year})")
+    quiet = [item['name'] for item in all_items if not item.get('new_entries')]
+    if quiet:
+        report.append(f"\n新着なし: {', '.join(quiet)}")
 
     return "\n".join(report)
 
-def main():
-    """メイン処理"""
-    print("🔍 Adobe製品ニュースチェック中...")
+def check_sources(sources, tracking_data, fetcher=fetch_page):
+    """sources を並行に取得して tracking_data を更新し、(履歴, 節約量) を返す"""
+    history = []
+    savings = {'not_modified': 0, 'bytes': 0, 'seconds': 0.0}
+
+    # 取得は並行、結果の処理は終わった順にこのスレッドで行う
+    for source_key, page, error in poll_sources(sources, fetcher=fetcher, validators=get_validators(tracking_data)):
+        source_info = sources[source_key]
+        print(f"Checked {source_info['name']}")
+
+        if error is not None:
+            print(f"Error checking {source_info['url']}: {error}")
+            print("  → 変更なし (最新年: Error)")
+            history.append(history_record(source_key, error=error))
+            continue
 
-    for source_key, source_info in NEWS_SOURCES.items():
-        print(f"Checking {source_info['name']}...")
-        is_changed, latest_year = check_url_changes(source_key, source_info['url'])
+        if page['status'] == 304:
+            saved_bytes, saved_seconds = estimate_savings(tracking_data.get(source_key, {}), page)
+            savings['not_modified'] += 1
+            savings['bytes'] += saved_bytes
+            savings['seconds'] += saved_seconds
 
-        if is_changed:
-            print(f"  → 変更検出！最新年: {latest_year}")
+        try:
+            is_changed, latest_year = process_content(source_key, source_info, page, tracking_data)
+            history.append(history_record(source_key, page, is_changed, latest_year))
+        except Exception as e:
+            print(f"Error checking {source_info['url']}: {e}")
+            is_changed, latest_year = False, 'Error'
+            history.append(history_record(source_key, page, error=e))
+
+        if page['status'] == 304:
+            print(f"  → 未更新 304 (最新年: {latest_year})")
+        elif is_changed:
+            new_count = len(tracking_data[source_key]['new_entries'])
+            print(f"  → 新着{new_count}件！最新年: {latest_year}")
         else:
             print(f"  → 変更なし (最新年: {latest_year})")
 
+    if savings['not_modified']:
+        print(f"💾 304 Not Modified: {savings['not_modified']} source(s), "
+              f"saved {savings['bytes'] / 1024:.1f} KB / {savings['seconds']:.1f}s")
+
+    return history, savings
+
+def main(sources=None, fetcher=fetch_page):
+    """メイン処理"""
+    sources = sources if sources is not None else NEWS_SOURCES
+    print(f"🔍 Adobe製品ニュースチェック中...（{len(sources)}ソースを並行取得）")
+
+    # 追跡データは1回だけ読み込み、前回の検証子で条件付きリクエストを送る
+    tracking_data = load_tracking_data()
+    history, savings = check_sources(sources, tracking_data, fetcher)
+
+    # 全ソースの結果をまとめて1回だけ保存し、履歴を追記
+    save_tracking_data(tracking_data)
+    append_history(history)
+
     # 最新のチェック時刻を保存
     save_last_check(datetime.now())
 
     # レポートを生成
-    tracking_data = load_tracking_data()
     all_items = list(tracking_data.values())
 
-    report = generate_report(all_items)
+    report = generate_report(all_items, savings)
     return report
 
+def load_status():
+    """デーモンの予定（ソースごとの次回時刻・連続エラー数）を読み込む"""
+    if STATUS_FILE.exists():
+        with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('sources', {})
+    return {}
+
+def save_status(schedule):
+    """デーモンの予定をアトミックに保存
+
+    ロックを取って保存済みの予定を読み直し、ソースごとに最後にチェックした方を残す
+    （ほかの実行が記録した連続エラー数や再試行の予定を失わない）。
+    """
+    with locked(STATUS_FILE):
+        merged = load_status()
+        for source_key, entry in schedule.items():
+            saved = merged.get(source_key)
+            if saved is None or entry.get('last_checked', '') >= saved.get('last_checked', ''):
+                merged[source_key] = entry
+        write_json(STATUS_FILE, {'updated': datetime.now().isoformat(timespec='seconds'), 'sources': merged},
+                   indent=2)
+
+def backoff_delay(failures, interval):
+    """連続エラー回数に応じた再試行までの時間（通常の間隔から2倍ずつ、正常なときより短くはしない）"""
+    return min(interval * 2 ** (failures - 1), max(interval, MAX_BACKOFF))
+
+class Scheduler:
+    """ソースごとの間隔でチェックを繰り返すデーモン
+
+    clock / sleep / rng を差し替えると、実時間を待たずに動かせる。
+    """
+
+    def __init__(self, sources=None, fetcher=fetch_page, clock=time.time, sleep=time.sleep, rng=None):
+        self.sources = sources if sources is not None else NEWS_SOURCES
+        self.fetcher = fetcher
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.schedule = self._initial_schedule(load_status())
+
+    def _interval(self, source_key):
+        return self.sources[source_key].get('interval', DEFAULT_INTERVAL)
+
+    def _jitter(self, delay):
+        return delay * (1 + self.rng.uniform(-JITTER_RATIO, JITTER_RATIO))
+
+    def _initial_schedule(self, saved):
+        """保存済みの予定を引き継ぎ、新しいソースは開始時刻をばらつかせる"""
+        now = self.clock()
+        schedule = {}
+        for source_key in self.sources:
+            entry = dict(saved.get(source_key, {}))
+            entry['interval'] = self._interval(source_key)
+            entry.setdefault('failures', 0)
+            if 'next_due' not in entry:
+                entry['next_due'] = now + self.rng.uniform(0, min(START_JITTER, entry['interval']))
+            schedule[source_key] = entry
+        return schedule
+
+    def due(self, now=None):
+        """予定時刻を過ぎたソース"""
+        now = self.clock() if now is None else now
+        return [key for key, entry in self.schedule.items() if entry['next_due'] <= now]
+
+    def _reschedule(self, record):
+        entry = self.schedule[record['source']]
+        now = self.clock()
+        entry['last_checked'] = record['checked_at']
+        entry['last_status'] = record['status']
+        if record['error'] is None:
+            entry['failures'] = 0
+            entry['last_error'] = None
+            delay = entry['interval']
+        else:
+            entry['failures'] += 1
+            entry['last_error'] = record['error']
+            delay = backoff_delay(entry['failures'], entry['interval'])
+        entry['next_due'] = now + self._jitter(delay)
+        entry['next_due_at'] = datetime.fromtimestamp(entry['next_due']).isoformat(timespec='seconds')
+
+    def run_once(self):
+        """予定を過ぎたソースだけをチェックし、新着があればレポートを返す"""
+        due = self.due()
+        if not due:
+            return ""
+        sources = {key: self.sources[key] for key in due}
+        print(f"🔍 {datetime.now().strftime('%H:%M:%S')} {len(due)}ソースをチェック: {', '.join(due)}")
+
+        tracking_data = load_tracking_data()
+        history, savings = check_sources(sources, tracking_data, self.fetcher)
+
+        # 全体のタイムアウトなどで結果が返らなかったソースもエラー扱いで予定し直す
+        checked = {record['source'] for record in history}
+        history += [history_record(key, error='no result') for key in due if key not in checked]
+        save_tracking_data(tracking_data)
+        append_history(history)
+        for record in history:
+            self._reschedule(record)
+        save_status(self.schedule)
+        save_last_check(datetime.now())
+
+        updated = [tracking_data[key] for key in due if tracking_data.get(key, {}).get('new_entries')]
+        return generate_report(updated, savings) if updated else ""
+
+    def seconds_until_next(self):
+        return max(min(entry['next_due'] for entry in self.schedule.values()) - self.clock(), 0)
+
+    def run(self, max_ticks=None):
+        """予定どおりにチェックし続ける（Ctrl+Cで終了）"""
+        save_status(self.schedule)
+        ticks = 0
+        try:
+            while max_ticks is None or ticks < max_ticks:
+                report = self.run_once()
+                if report:
+                    print("\n" + "="*60)
+                    print(report)
+                    print("="*60)
+                ticks += 1
+                self.sleep(min(self.seconds_until_next(), MAX_SLEEP))
+        except KeyboardInterrupt:
+            print("\n👋 停止しました")
+        finally:
+            save_status(self.schedule)
+
+def print_status():
+    """保存されている予定を表示"""
+    schedule = load_status()
+    if not schedule:
+        print("予定はまだありません（--daemon で開始）")
+        return
+    now = time.time()
+    for source_key, entry in sorted(schedule.items(), key=lambda item: item[1]['next_due']):
+        remaining = max(entry['next_due'] - now, 0)
+        line = f"{source_key:24} 次回 {entry.get('next_due_at', '-'):19} (あと{remaining / 60:.0f}分)"
+        if entry.get('failures'):
+            line += f"  連続エラー{entry['failures']}回: {entry.get('last_error')}"
+        print(line)
+
 if __name__ == "__main__":
-    report = main()
-    if report:
-        print("\n" + "="*60)
-        print(report)
-        print("="*60)
+    parser = argparse.ArgumentParser(description="Adobe製品ニュース・リリース追跡")
+    parser.add_argument("--daemon", action="store_true", help="ソースごとの間隔でチェックし続ける")
+    parser.add_argument("--status", action="store_true", help="各ソースの次回チェック予定を表示")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+    elif args.daemon:
+        Scheduler().run()
+    else:
+        report = main()
+        if report:
+            print("\n" + "="*60)
+            print(report)
+            print("="*60)
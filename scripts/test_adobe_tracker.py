@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+adobe_tracker のテスト（python3 -m pytest scripts/test_adobe_tracker.py）
+
+ローカルの http.server でフィクスチャのページを配信し、初回のチェック・
+ETag が変わらないときの 304・新しいエントリの検出を確かめる。
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import adobe_tracker
+
+RELEASE_NOTES = """<html><body>
+<h2>Photoshop 26.1</h2><p>Generative fill improvements.</p>
+<h2>Photoshop 26.0</h2><p>New removal tool.</p>
+</body></html>"""
+
+BLOG = """<html><body>
+<article><h2><a href="/2026/01/firefly">Firefly update</a></h2><p>Faster models.</p></article>
+<article><h2><a href="/2026/01/express">Express tips</a></h2><p>Templates.</p></article>
+</body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """server.pages のページを ETag 付きで返す（If-None-Match が一致すれば 304）"""
+
+    def do_GET(self):
+        content = self.server.pages.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        body = content.encode('utf-8')
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    httpd.pages = {'/release-notes': RELEASE_NOTES, '/blog': BLOG}
+    httpd.not_modified = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def sources(server):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return {
+        'notes': {'name': 'Notes', 'url': f"{base}/release-notes", 'type': 'release_notes', 'interval': 24 * 3600},
+        'blog': {'name': 'Blog', 'url': f"{base}/blog", 'type': 'blog', 'interval': 2 * 3600},
+    }
+
+
+@pytest.fixture(autouse=True)
+def state_files(tmp_path, monkeypatch):
+    """状態ファイルを一時ディレクトリに置き、ローカルのサーバーにはプロキシを通さない"""
+    for name in ('TRACKING_FILE', 'LAST_CHECK_FILE', 'HISTORY_FILE', 'STATUS_FILE'):
+        monkeypatch.setattr(adobe_tracker, name, tmp_path / getattr(adobe_tracker, name).name)
+    monkeypatch.setenv('no_proxy', '*')
+    monkeypatch.setenv('NO_PROXY', '*')
+
+
+def test_first_poll_records_entries_without_reporting_them(sources):
+    adobe_tracker.main(sources)
+
+    data = adobe_tracker.load_tracking_data()
+    assert data['notes']['entry_count'] == 2
+    assert data['blog']['entry_count'] == 2
+    assert all(len(data[key]['seen']) == 2 for key in sources)
+    assert all(data[key]['new_entries'] == [] for key in sources)
+    assert all(data[key]['etag'] for key in sources)
+    assert [record['status'] for record in adobe_tracker.load_history()] == [200, 200]
+
+
+def test_unchanged_etag_is_not_modified(server, sources):
+    adobe_tracker.main(sources)
+    adobe_tracker.main(sources)
+
+    assert server.not_modified == 2
+    assert [record['status'] for record in adobe_tracker.load_history()][2:] == [304, 304]
+    data = adobe_tracker.load_tracking_data()
+    assert all(len(data[key]['seen']) == 2 for key in sources)
+
+
+def test_new_entry_is_detected(server, sources):
+    adobe_tracker.main(sources)
+    server.pages['/release-notes'] = RELEASE_NOTES.replace(
+        '<body>', '<body>\n<h2>Photoshop 26.2</h2><p>Sky replacement.</p>')
+
+    report = adobe_tracker.main(sources)
+
+    data = adobe_tracker.load_tracking_data()
+    assert [entry['title'] for entry in data['notes']['new_entries']] == ['Photoshop 26.2']
+    assert data['blog']['new_entries'] == []
+    assert 'Photoshop 26.2' in report
+
+
+@pytest.mark.parametrize('interval', [60, 2 * 3600, 24 * 3600, 48 * 3600])
+def test_backoff_never_drops_below_interval(interval):
+    delays = [adobe_tracker.backoff_delay(failures, interval) for failures in range(1, 20)]
+    assert all(delay >= interval for delay in delays)
+    assert delays == sorted(delays)
+    assert delays[-1] == max(interval, adobe_tracker.MAX_BACKOFF)
+
+
+def test_scheduler_waits_at_least_the_interval_after_errors(sources):
+    now = 1_000_000.0
+
+    def failing_fetcher(url, timeout, validators):
+        raise OSError("connection refused")
+
+    scheduler = adobe_tracker.Scheduler(sources, fetcher=failing_fetcher, clock=lambda: now,
+                                        sleep=lambda seconds: None)
+    for entry in scheduler.schedule.values():
+        entry['next_due'] = now
+
+    for _ in range(4):
+        scheduler.run_once()
+        for key, entry in scheduler.schedule.items():
+            interval = sources[key]['interval']
+            assert entry['next_due'] - now >= interval * (1 - adobe_tracker.JITTER_RATIO)
+            entry['next_due'] = now
+
+    assert all(entry['failures'] == 4 for entry in scheduler.schedule.values())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+youtube_chapters のテスト（python3 -m pytest scripts/test_youtube_chapters.py）
+"""
+
+import numpy as np
+import pytest
+
+from youtube_chapters import _block_similarity, detect_chapters
+
+
+def _dense_block_similarity(vectors, block):
+    """ギャップごとに前後のブロックを素直に足して比べる参照実装"""
+    n = len(vectors)
+    scores = []
+    for gap in range(1, n):
+        left = vectors[max(gap - block, 0):gap].sum(axis=0)
+        right = vectors[gap:min(gap + block, n)].sum(axis=0)
+        denom = np.linalg.norm(left) * np.linalg.norm(right)
+        scores.append(left @ right / denom if denom > 0 else 0.0)
+    return np.array(scores)
+
+
+@pytest.mark.parametrize('n_units, n_terms, block', [(2, 5, 3), (10, 30, 1), (60, 400, 3), (40, 200, 8)])
+def test_sparse_block_similarity_matches_dense(n_units, n_terms, block):
+    rng = np.random.default_rng(n_units)
+    vectors = rng.random((n_units, n_terms)) * (rng.random((n_units, n_terms)) < 0.05)
+    vectors[n_units // 2] = 0  # 語が1つも無いウィンドウ
+    rows, cols = np.nonzero(vectors)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_units))])
+
+    scores = _block_similarity(indptr, cols, vectors[rows, cols], n_terms, block)
+    np.testing.assert_allclose(scores, _dense_block_similarity(vectors, block), atol=1e-12)
+
+
+def test_topic_shift_becomes_chapter_boundary():
+    colors = "color palette contrast hue saturation"
+    motion = "animation timing easing curve motion"
+    transcript = [{'start': i * 10.0, 'end': i * 10.0 + 10.0, 'text': colors if i < 30 else motion}
+                  for i in range(60)]
+
+    chapters = detect_chapters(transcript)
+
+    assert [chapter['start'] for chapter in chapters] == [0.0, 300.0]
+    assert chapters[0]['title'].split(' / ')[0] in colors.split()
+    assert chapters[1]['title'].split(' / ')[0] in motion.split()
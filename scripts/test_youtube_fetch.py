@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+youtube_fetch のテスト（python3 -m pytest scripts/test_youtube_fetch.py）
+
+yt-dlp の代わりに、指定した言語の字幕ファイルを書き出すだけのシェルスクリプトを使う。
+"""
+
+import subprocess
+
+import pytest
+
+import youtube_fetch
+from youtube_fetch import MISSING_TTL, TrackCache, fetch_tracks
+
+VTT = "WEBVTT\\n\\n00:00:01.000 --> 00:00:02.000\\nhello\\n"
+
+
+@pytest.fixture
+def fake_ytdlp(tmp_path, monkeypatch):
+    """fake_ytdlp(langs, exit_code) で、langs の字幕を書き出して exit_code で終わる yt-dlp にする"""
+    script = tmp_path / 'yt-dlp'
+    calls = tmp_path / 'calls'
+
+    def install(langs, exit_code=0):
+        writes = ''.join(f'printf "{VTT}" > "$out.{lang}.vtt"\n' for lang in langs)
+        script.write_text(
+            "#!/bin/sh\n"
+            f"echo run >> '{calls}'\n"
+            'while [ "$1" != "--output" ]; do shift; done\n'
+            'out="$2"\n'
+            f"{writes}"
+            f"exit {exit_code}\n"
+        )
+        script.chmod(0o755)
+
+    install.calls = lambda: len(calls.read_text().splitlines()) if calls.exists() else 0
+    monkeypatch.setattr(youtube_fetch, 'YTDLP_PATH', str(script))
+    return install
+
+
+def test_failed_run_is_not_cached(tmp_path, fake_ytdlp):
+    cache = TrackCache(tmp_path / 'cache')
+    fake_ytdlp([], exit_code=1)
+    with pytest.raises(subprocess.CalledProcessError):
+        fetch_tracks('vid', ('en',), cache=cache)
+    assert cache.missing('vid', ('en',)) == ['en']
+
+    fake_ytdlp(['en'])
+    tracks = fetch_tracks('vid', ('en',), cache=cache)
+    assert tracks['en'][0]['text'] == 'hello'
+
+
+def test_missing_language_is_retried_after_ttl(tmp_path, fake_ytdlp):
+    now = [1000.0]
+    cache = TrackCache(tmp_path / 'cache', clock=lambda: now[0])
+
+    # 公開直後で自動字幕がまだ無い
+    fake_ytdlp([])
+    assert fetch_tracks('vid', ('en', 'ja'), cache=cache) == {}
+    assert fake_ytdlp.calls() == 1
+
+    # 期限内は問い合わせ直さない
+    now[0] += MISSING_TTL - 1
+    fake_ytdlp(['en'])
+    assert fetch_tracks('vid', ('en', 'ja'), cache=cache) == {}
+    assert fake_ytdlp.calls() == 1
+
+    # 期限を過ぎたら取得し直す（あったトラックはその後ずっとキャッシュから）
+    now[0] += 1
+    assert set(fetch_tracks('vid', ('en', 'ja'), cache=cache)) == {'en'}
+    assert fake_ytdlp.calls() == 2
+    assert cache.missing('vid', ('en', 'ja')) == []
+    now[0] += MISSING_TTL
+    assert cache.missing('vid', ('en', 'ja')) == ['ja']
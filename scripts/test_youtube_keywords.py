@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+youtube_keywords のテスト（python3 -m pytest scripts/test_youtube_keywords.py）
+"""
+
+from collections import Counter
+
+from youtube_keywords import KeywordCorpus, extract_keywords_from_text
+
+
+def test_rescoring_a_document_with_new_text(tmp_path):
+    """登録済みの動画を別のテキストで採点し直しても、その動画が加えていない語で落ちない"""
+    corpus = KeywordCorpus(tmp_path / 'corpus.json')
+    extract_keywords_from_text("design systems help designers ship faster", doc_id='vid', corpus=corpus)
+    keywords = extract_keywords_from_text("animation timing curves feel natural", doc_id='vid', corpus=corpus)
+
+    assert {keyword['word'] for keyword in keywords} >= {'animation', 'timing'}
+    # 登録し直した動画の語に入れ替わる（動画数は1のまま）
+    assert corpus.documents == 1
+    assert corpus.df['animation'] == 1
+    assert 'design' not in corpus.df
+
+    saved = KeywordCorpus.load(tmp_path / 'corpus.json')
+    assert saved.documents == 1
+    assert saved.df == corpus.df
+    assert saved.doc_terms == corpus.doc_terms
+
+
+def test_own_terms_are_excluded_from_df(tmp_path):
+    corpus = KeywordCorpus(tmp_path / 'corpus.json')
+    corpus.add_document('a', Counter({'design': 1, 'color': 1}))
+    corpus.add_document('b', Counter({'design': 1}))
+    scores = {term: weight for term, _, weight in corpus.score(Counter({'design': 1, 'color': 1}), 'a')}
+    # 'a' を除くと design は1本（b）、color は0本
+    assert scores['color'] > scores['design']
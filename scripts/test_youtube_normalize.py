@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+youtube_normalize のテスト（python3 -m pytest scripts/test_youtube_normalize.py）
+"""
+
+from youtube_normalize import merge_rolling, normalize_transcript
+
+
+def _cue(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+
+def test_rolling_captions_are_merged():
+    """自動字幕のローリング行と切り替え用の短いキューは1回だけ残る"""
+    transcript = [
+        _cue(0.16, 2.55, 'hello world'),
+        _cue(2.55, 2.56, 'hello world'),
+        _cue(2.56, 5.0, 'hello world how are you'),
+        _cue(5.0, 5.01, 'how are you'),
+        _cue(5.01, 7.0, 'how are you fine thanks.'),
+    ]
+    words = [word for word, _, _ in merge_rolling(transcript)]
+    assert words == ['hello', 'world', 'how', 'are', 'you', 'fine', 'thanks.']
+
+
+def test_repeated_manual_lines_are_kept():
+    """時間の重ならない同じ台詞の繰り返しは重複とみなさない"""
+    transcript = [
+        _cue(0.0, 1.0, 'no no.'),
+        _cue(1.0, 2.0, 'no no.'),
+        _cue(2.0, 3.0, 'stop it.'),
+    ]
+    segments, report = normalize_transcript(transcript)
+    assert [seg['text'] for seg in segments] == ['no no.', 'no no.', 'stop it.']
+    assert report['reduction_ratio'] == 0.0
+
+
+def test_overlapping_repeat_is_merged():
+    """前のキューと時間が重なる繰り返しは重複として除く"""
+    transcript = [_cue(0.0, 2.0, 'no no.'), _cue(1.5, 3.0, 'no no.')]
+    assert [word for word, _, _ in merge_rolling(transcript)] == ['no', 'no.']
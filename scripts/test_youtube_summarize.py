@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+youtube_summarize のテスト（python3 -m pytest scripts/test_youtube_summarize.py）
+"""
+
+from youtube_summarize import summarize_transcript
+
+
+def test_topic_without_any_terms():
+    """語が1つも無い transcript でも with_topic なら 'topic' が付く"""
+    transcript = [{'text': '...', 'start': 0.0, 'end': 1.0}, {'text': '!?', 'start': 1.0, 'end': 2.0}]
+    points = summarize_transcript(transcript, with_topic=True)
+    assert points
+    assert all(point['topic'] == '' for point in points)
+    assert all('topic' not in point for point in summarize_transcript(transcript))
+
+
+def test_topic_is_a_term_of_the_point():
+    transcript = [
+        {'text': f'{word} {word} appears here.', 'start': i * 20.0, 'end': i * 20.0 + 5}
+        for i, word in enumerate(['design', 'animation', 'typography'])
+    ]
+    points = summarize_transcript(transcript, max_points=3, window=None, with_topic=True)
+    assert [point['topic'] for point in points] == ['design', 'animation', 'typography']
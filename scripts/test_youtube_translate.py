@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+youtube_translate のテスト（python3 -m pytest scripts/test_youtube_translate.py）
+"""
+
+from youtube_translate import PhraseTrie
+
+GLOSSARY = {
+    "design": "デザイン",
+    "design system": "デザインシステム",
+    "user": "ユーザー",
+}
+
+
+def test_longest_phrase():
+    trie = PhraseTrie(GLOSSARY)
+    assert trie.translate("The Design System") == "the デザインシステム"
+    assert trie.translate("design, system") == "デザイン, system"
+
+
+def test_punctuation_only_tokens():
+    """記号だけの単語（空文字列になる）は訳語の番兵と混ざらない"""
+    trie = PhraseTrie(GLOSSARY)
+    assert trie.translate("design ... system") == "デザイン ... system"
+    assert trie.translate("the design ! is") == "the デザイン ! is"
+    assert trie.translate("... ! user") == "... ! ユーザー"
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+youtube_vtt のテスト（python3 -m pytest scripts/test_youtube_vtt.py）
+"""
+
+import io
+
+from youtube_vtt import iter_vtt_cues, parse_vtt
+
+VTT = """WEBVTT
+
+00:00:01.000 --> 00:00:02.000
+x < y and z > w
+
+00:00:02.000 --> 00:00:03.000
+<c.colorE5E5E5>hi</c><00:00:02.500><c> there</c> <v Bob>ok</v>
+"""
+
+
+def test_angle_brackets_in_text_are_kept():
+    """タグではない < > は、単語タイムスタンプの有無にかかわらず残る"""
+    assert [cue['text'] for cue in parse_vtt(VTT)] == ['x < y and z > w', 'hi there ok']
+    cues = list(iter_vtt_cues(io.StringIO(VTT), with_words=True))
+    assert [cue.text for cue in cues] == ['x < y and z > w', 'hi there ok']
+    assert cues[1].words == ((2.0, 'hi'), (2.5, 'there'), (2.5, 'ok'))
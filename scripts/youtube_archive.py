@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+YouTube Summary Archive
+生成した要約をSQLite（FTS5）に登録して、キーワードや日付で検索できるようにする
+
+各動画のID・タイトル・キーワード・チャプタータイトル・出力ファイルを
+outputs/youtube-archive.sqlite3 に1行ずつ追加・更新し、全文検索用の
+FTS5テーブルも同時に更新する。一覧ページ outputs/youtube-archive.html も再生成する。
+
+使い方:
+    python3 youtube_archive.py search <キーワード>... [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+    python3 youtube_archive.py rebuild   # 既存の出力ファイルから登録し直す
+    python3 youtube_archive.py page      # 一覧ページだけ再生成
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from youtube_metadata import get_cache
+from youtube_templates import Markup, escape, render_file
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+OUTPUTS_DIR = PROJECT_ROOT / "outputs"
+ARCHIVE_DB = OUTPUTS_DIR / "youtube-archive.sqlite3"
+INDEX_PAGE = OUTPUTS_DIR / "youtube-archive.html"
+TEMPLATE_PATH = PROJECT_ROOT / "templates" / "youtube_archive_template.html"
+
+# 既存の出力を探すディレクトリ
+SUMMARY_DIRS = (OUTPUTS_DIR / "youtube-summaries", OUTPUTS_DIR / "design-patterns")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    processed_at TEXT NOT NULL,
+    processed_date TEXT NOT NULL,
+    keywords TEXT NOT NULL DEFAULT '[]',
+    chapters TEXT NOT NULL DEFAULT '[]',
+    outputs TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS videos_processed_date ON videos (processed_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5 (
+    video_id UNINDEXED, title, keywords, chapters, tokenize = 'unicode61'
+);
+"""
+
+
+def _fts_query(query):
+    """入力を単語ごとのフレーズ検索にする（すべて含むもの、末尾の*で前方一致）"""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def _row_to_dict(row):
+    return {
+        'video_id': row['video_id'],
+        'title': row['title'],
+        'url': row['url'],
+        'processed_at': row['processed_at'],
+        'keywords': json.loads(row['keywords']),
+        'chapters': json.loads(row['chapters']),
+        'outputs': json.loads(row['outputs']),
+    }
+
+
+class Archive:
+    """要約アーカイブ（SQLite＋FTS5）"""
+
+    def __init__(self, path=ARCHIVE_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        # 1件ずつコミットしても遅くならないように
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, video_id):
+        """1本分の登録内容（無ければNone）"""
+        row = self.conn.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def add(self, video_id, title='', url='', keywords=(), chapters=(), outputs=(), processed_at=None):
+        """動画を登録・更新（出力ファイルは以前の分と合わせる）"""
+        processed_at = processed_at or datetime.now().isoformat(timespec='seconds')
+        previous = self.get(video_id)
+        if previous:
+            title = title or previous['title']
+            url = url or previous['url']
+            keywords = keywords or previous['keywords']
+            chapters = chapters or previous['chapters']
+            outputs = sorted(set(previous['outputs']) | set(outputs))
+        else:
+            outputs = sorted(set(outputs))
+        keywords, chapters = list(keywords), list(chapters)
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_id, title, url, processed_at, processed_at[:10],
+                 json.dumps(keywords, ensure_ascii=False),
+                 json.dumps(chapters, ensure_ascii=False),
+                 json.dumps(outputs, ensure_ascii=False))
+            )
+            self.conn.execute("DELETE FROM videos_fts WHERE video_id = ?", (video_id,))
+            self.conn.execute(
+                "INSERT INTO videos_fts VALUES (?, ?, ?, ?)",
+                (video_id, title, ' '.join(keywords), ' '.join(chapters))
+            )
+
+    def search(self, query=None, since=None, until=None, limit=50):
+        """キーワード（全文検索）と処理日（YYYY-MM-DD、両端を含む）で検索
+
+        キーワードを指定した場合は関連度順、しない場合は新しい順。
+        """
+        conditions, params = [], []
+        if since:
+            conditions.append("v.processed_date >= ?")
+            params.append(since)
+        if until:
+            conditions.append("v.processed_date <= ?")
+            params.append(until)
+
+        if query and _fts_query(query):
+            sql = ("SELECT v.* FROM videos_fts f JOIN videos v ON v.video_id = f.video_id "
+                   "WHERE videos_fts MATCH ?")
+            params.insert(0, _fts_query(query))
+            if conditions:
+                sql += " AND " + " AND ".join(conditions)
+            sql += " ORDER BY bm25(videos_fts) LIMIT ?"
+        else:
+            sql = "SELECT v.* FROM videos v"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY v.processed_at DESC LIMIT ?"
+        params.append(limit)
+
+        return [_row_to_dict(row) for row in self.conn.execute(sql, params)]
+
+    def all(self):
+        """すべての動画（新しい順）"""
+        rows = self.conn.execute("SELECT * FROM videos ORDER BY processed_at DESC")
+        return [_row_to_dict(row) for row in rows]
+
+
+def build_index_page(archive, path=INDEX_PAGE):
+    """アーカイブの一覧ページを生成（ページ内でキーワード絞り込みできる）"""
+    path = Path(path)
+    rows = []
+    for video in archive.all():
+        links = ' '.join(
+            f'<a href="{escape(os.path.relpath(output, path.parent))}">{escape(Path(output).stem)}</a>'
+            for output in video['outputs']
+        )
+        keywords = ' '.join(f'<span class="keyword">{escape(k)}</span>' for k in video['keywords'][:10])
+        search_text = ' '.join([video['video_id'], video['title']] + video['keywords'] + video['chapters']).lower()
+        rows.append(f"""
+            <tr data-search="{escape(search_text)}">
+                <td class="date">{escape(video['processed_at'][:10])}</td>
+                <td><a href="{escape(video['url'] or 'https://www.youtube.com/watch?v=' + video['video_id'])}" target="_blank">{escape(video['title'] or video['video_id'])}</a></td>
+                <td>{keywords}</td>
+                <td class="links">{links}</td>
+            </tr>""")
+
+    html = render_file(TEMPLATE_PATH, {
+        'VIDEO_COUNT': len(rows),
+        'ROWS': Markup(''.join(rows)),
+        'UPDATED': datetime.now().strftime('%Y-%m-%d %H:%M'),
+    })
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return str(path)
+
+
+def _cached_title(video_id):
+    """メタデータキャッシュにあるタイトル（yt-dlpは起動しない）"""
+    entry = get_cache().entries.get(video_id)
+    return entry['data'].get('title', '') if entry else ''
+
+
+def record_summary(video_id, url='', keywords=(), chapters=(), outputs=(), title=None):
+    """要約を生成したらアーカイブに登録して一覧ページを更新する"""
+    with Archive() as archive:
+        archive.add(
+            video_id,
+            title=title if title is not None else _cached_title(video_id),
+            url=url,
+            keywords=[k['word'] if isinstance(k, dict) else k for k in keywords],
+            chapters=[c['title'] if isinstance(c, dict) else c for c in chapters],
+            outputs=[str(output) for output in outputs],
+        )
+        return build_index_page(archive)
+
+
+def scan_outputs(dirs=SUMMARY_DIRS):
+    """既存の出力HTMLを {video_id: [パス]} にまとめる（ファイル名から動画IDを推定）"""
+    from youtube_design_patterns import DESIGNS
+
+    found = {}
+    for directory in dirs:
+        if not directory.exists():
+            continue
+        for path in sorted(directory.glob('*.html')):
+            video_id = path.stem
+            for design in DESIGNS:
+                if video_id.endswith(f'-{design}'):
+                    video_id = video_id[:-len(design) - 1]
+                    break
+            found.setdefault(video_id, []).append(path)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTube要約アーカイブの検索・再構築")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="キーワード・日付で検索")
+    search.add_argument("query", nargs="*", help="キーワード（すべて含むもの、word* で前方一致）")
+    search.add_argument("--since", help="この日以降（YYYY-MM-DD）")
+    search.add_argument("--until", help="この日以前（YYYY-MM-DD）")
+    search.add_argument("-n", "--limit", type=int, default=50, help="最大件数（デフォルト: 50）")
+
+    sub.add_parser("rebuild", help="既存の出力ファイルから登録し直す")
+    sub.add_parser("page", help="一覧ページを再生成")
+    args = parser.parse_args()
+
+    with Archive() as archive:
+        if args.command == "search":
+            results = archive.search(' '.join(args.query), args.since, args.until, args.limit)
+            for video in results:
+                print(f"{video['processed_at'][:10]}  {video['video_id']}  {video['title']}")
+                for output in video['outputs']:
+                    print(f"    {output}")
+            print(f"🔎 {len(results)} result(s)")
+            return
+
+        if args.command == "rebuild":
+            for video_id, paths in scan_outputs().items():
+                processed_at = datetime.fromtimestamp(max(p.stat().st_mtime for p in paths))
+                archive.add(video_id, title=_cached_title(video_id),
+                            outputs=[str(p) for p in paths],
+                            processed_at=processed_at.isoformat(timespec='seconds'))
+            print(f"✅ Indexed {len(archive.all())} video(s)")
+
+        print(f"✅ Index page: {build_index_page(archive)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+YouTube Pipeline Benchmark
+オフラインのフィクスチャでYouTube要約パイプラインの速度とメモリを計測
+
+- pipeline: 各ステージ（パース / 正規化 / キーワード / 要約 / チャプター / HTML）と
+  エンドツーエンドの時間・メモリピークを計測し、結果をJSONに保存
+- parse: ストリーミング導入前のパーサーとの比較
+- translate: 1時間のフィクスチャと1万語の合成用語集で翻訳を比較
+
+フィクスチャは決定的に生成する合成VTT（10分 / 1時間 / 5時間 / 多言語）と、
+そのjson3版。scripts/data/benchmark-fixtures/ に置いた実際の字幕
+（*.vtt / *.json3）も自動で対象になる。
+
+使い方: python3 youtube_benchmark.py [--repeat N] [--bench pipeline parse translate]
+                                     [--output result.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from youtube_chapters import detect_chapters
+from youtube_fetch import parse_json3_file
+from youtube_keywords import KeywordCorpus, extract_keywords
+from youtube_normalize import normalize_transcript
+from youtube_summarize import summarize_transcript
+from youtube_summarizer_graphic import create_visualization
+from youtube_translate import PhraseTrie
+from youtube_vtt import parse_vtt_file
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+FIXTURE_DIR = SCRIPT_DIR / "data" / "benchmark-fixtures"
+RESULTS_DIR = PROJECT_ROOT / "outputs" / "benchmarks"
+
+# 合成字幕に使う単語
+WORDS = ("design code figma prototype layout color grid motion type system "
+         "component token variable team build ship review feedback user "
+         "research interface pattern model data render pipeline test").split()
+
+# 多言語フィクスチャ用（1分ごとに英語と日本語が切り替わる）
+JA_WORDS = ("デザイン コード 開発 チーム 技術 ツール 作成 プロセス 改善 検証 "
+            "ユーザー 体験 プロトタイプ レイアウト 色 動き 仕組み 共有").split()
+
+FIXTURE_DURATIONS = {
+    '10min': 10 * 60,
+    '1h': 60 * 60,
+    '5h': 5 * 60 * 60,
+}
+
+# パイプラインで計測するフィクスチャ（名前, 長さ, 語彙）
+PIPELINE_FIXTURES = (
+    ('short', 10 * 60, (WORDS,)),
+    ('1h', 60 * 60, (WORDS,)),
+    ('5h', 5 * 60 * 60, (WORDS,)),
+    ('multilingual', 30 * 60, (WORDS, JA_WORDS)),
+)
+
+# パイプラインのステージ（実行順）
+PIPELINE_STAGES = ('parse', 'normalize', 'keywords', 'summarize', 'chapters', 'render')
+
+# 回帰とみなす遅くなり方（割合）と、ノイズとして無視する差（ミリ秒）
+REGRESSION_THRESHOLD = 0.2
+NOISE_FLOOR_MS = 2.0
+
+
+def format_vtt_time(seconds):
+    """秒をVTTタイムスタンプに変換"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+
+
+def make_auto_caption_vtt(duration, seed=0, vocab=(WORDS,)):
+    """YouTube自動字幕風のVTTを生成（単語タイムスタンプ＋ローリング重複あり）
+
+    vocab に複数の語彙を渡すと1分ごとに切り替える（多言語フィクスチャ用）。
+    """
+    rng = random.Random(seed)
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    previous = ""
+    t = 0.0
+
+    while t < duration:
+        words_for = vocab[int(t // 60) % len(vocab)]
+        words = [rng.choice(words_for) for _ in range(rng.randint(5, 9))]
+        step = rng.uniform(2.0, 4.0)
+        end = min(t + step, duration)
+
+        # 単語タイムスタンプ付きの新しい行
+        per_word = (end - t) / len(words)
+        timed = words[0] + ''.join(
+            f"<{format_vtt_time(t + i * per_word)}><c> {w}</c>" for i, w in enumerate(words[1:], 1)
+        )
+        out.append(f"{format_vtt_time(t)} --> {format_vtt_time(end)} align:start position:0%")
+        out.append(previous if previous else " ")
+        out.append(timed)
+        out.append("")
+
+        # 10msの確定キュー（前の行の繰り返し）
+        line = ' '.join(words)
+        out.append(f"{format_vtt_time(end)} --> {format_vtt_time(end + 0.01)} align:start position:0%")
+        out.append(line)
+        out.append(" ")
+        out.append("")
+
+        previous = line
+        t = end + 0.01
+
+    return '\n'.join(out) + '\n'
+
+
+def legacy_parse_vtt(vtt_content):
+    """ストリーミングパーサー導入前の実装（比較用）"""
+    lines = vtt_content.split('\n')
+
+    transcript = []
+    current_start = None
+    current_end = None
+    current_text = []
+
+    def timestamp_to_seconds(timestamp):
+        parts = timestamp.split(':')
+        return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
+
+    for line in lines:
+        line = line.strip()
+
+        timestamp_match = re.match(r'(\d{2}:\d{2}:\d{2}\.\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}\.\d{3})', line)
+
+        if timestamp_match:
+            if current_start is not None and current_text:
+                text = ' '.join(current_text)
+                text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
+                text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
+                if text.strip():
+                    transcript.append({
+                        'start': current_start,
+                        'end': current_end,
+                        'text': text.strip()
+                    })
+
+            current_start = timestamp_to_seconds(timestamp_match.group(1))
+            current_end = timestamp_to_seconds(timestamp_match.group(2))
+            current_text = []
+
+        elif line and not line.startswith('WEBVTT') and not line.startswith('Kind:') and not line.startswith('Language:'):
+            current_text.append(line)
+
+    if current_start is not None and current_text:
+        text = ' '.join(current_text)
+        text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
+        text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
+        if text.strip():
+            transcript.append({
+                'start': current_start,
+                'end': current_end,
+                'text': text.strip()
+            })
+
+    return transcript
+
+
+def best_of(func, arg, repeat):
+    """repeat回実行して最速の時間と結果を返す"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def peak_memory(func, arg):
+    """1回実行したときのメモリピーク（バイト）"""
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def legacy_parse_vtt_file(path):
+    """従来の使い方: ファイル全体を読み込んでからパース"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return legacy_parse_vtt(f.read())
+
+
+def bench_parse_vtt(repeat=3):
+    """従来実装とストリーミングパーサーを比較"""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='youtube_bench_') as work_dir:
+        for name, duration in FIXTURE_DURATIONS.items():
+            path = os.path.join(work_dir, f'{name}.vtt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(make_auto_caption_vtt(duration))
+
+            legacy_time, legacy = best_of(legacy_parse_vtt_file, path, repeat)
+            stream_time, streamed = best_of(parse_vtt_file, path, repeat)
+            rows.append({
+                'fixture': name,
+                'cues': len(streamed),
+                'legacy_cues': len(legacy),
+                'legacy_ms': legacy_time * 1000,
+                'streaming_ms': stream_time * 1000,
+                'speedup': legacy_time / stream_time if stream_time else 0,
+                'legacy_peak_kb': peak_memory(legacy_parse_vtt_file, path) / 1024,
+                'streaming_peak_kb': peak_memory(parse_vtt_file, path) / 1024,
+            })
+    return rows
+
+
+def make_glossary(size, seed=0):
+    """合成の用語集（1〜3語のフレーズ、WORDSの半分だけ単語として登録）
+
+    残りの半分は字幕に出てくるのに単語としては訳せない語になる。
+    """
+    rng = random.Random(seed)
+    glossary = {word: f"訳{i}" for i, word in enumerate(WORDS[::2])}
+    while len(glossary) < size:
+        n_words = rng.choice((1, 1, 2, 3))
+        if n_words == 1:
+            phrase = f"term{rng.randrange(size * 10)}"
+        else:
+            phrase = ' '.join(rng.choice(WORDS) for _ in range(n_words))
+        glossary.setdefault(phrase, f"訳{len(glossary)}")
+    return glossary
+
+
+def legacy_translate(text, translations):
+    """トライ導入前の実装（完全一致しなければ辞書全体を部分一致で走査）"""
+    translated_words = []
+    for word in text.lower().split():
+        translated = translations.get(word, word)
+        if translated == word:
+            for key, value in translations.items():
+                if key in word:
+                    translated = value
+                    break
+        translated_words.append(translated)
+    return ' '.join(translated_words)
+
+
+def bench_translate(repeat=3, size=10000):
+    """1時間の字幕を従来の辞書走査とトライで翻訳して比較"""
+    with tempfile.TemporaryDirectory(prefix='youtube_bench_') as work_dir:
+        path = os.path.join(work_dir, '1h.vtt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_auto_caption_vtt(FIXTURE_DURATIONS['1h']))
+        segments, _ = normalize_transcript(parse_vtt_file(path))
+
+    texts = [seg['text'] for seg in segments]
+    glossary = make_glossary(size)
+
+    build_time, trie = best_of(PhraseTrie, glossary, repeat)
+    legacy_time, _ = best_of(lambda items: [legacy_translate(t, glossary) for t in items], texts, repeat)
+    trie_time, _ = best_of(lambda items: [trie.translate(t) for t in items], texts, repeat)
+    return {
+        'glossary': len(trie),
+        'segments': len(texts),
+        'words': sum(len(t.split()) for t in texts),
+        'build_ms': build_time * 1000,
+        'legacy_ms': legacy_time * 1000,
+        'trie_ms': trie_time * 1000,
+        'speedup': legacy_time / trie_time if trie_time else 0,
+    }
+
+
+def make_json3(transcript):
+    """transcriptからyt-dlpのjson3形式の字幕を作る"""
+    return {'events': [{
+        'tStartMs': int(seg['start'] * 1000),
+        'dDurationMs': int((seg['end'] - seg['start']) * 1000),
+        'segs': [{'utf8': seg['text']}]
+    } for seg in transcript]}
+
+
+def write_fixtures(work_dir):
+    """パイプライン用のフィクスチャを書き出して {名前: パス} を返す
+
+    合成VTT＋そのjson3版に加えて、FIXTURE_DIR にある実際の字幕も含める。
+    """
+    fixtures = {}
+    for name, duration, vocab in PIPELINE_FIXTURES:
+        path = os.path.join(work_dir, f'{name}.vtt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_auto_caption_vtt(duration, vocab=vocab))
+        fixtures[name] = path
+
+    json3_path = os.path.join(work_dir, 'short.json3')
+    with open(json3_path, 'w', encoding='utf-8') as f:
+        json.dump(make_json3(parse_vtt_file(fixtures['short'])), f, ensure_ascii=False)
+    fixtures['short-json3'] = json3_path
+
+    if FIXTURE_DIR.exists():
+        for path in sorted(FIXTURE_DIR.iterdir()):
+            if path.suffix in ('.vtt', '.json3'):
+                fixtures[f'recorded-{path.stem}'] = str(path)
+
+    return fixtures
+
+
+def load_fixture(path):
+    """VTT / json3 のフィクスチャをパース"""
+    if str(path).endswith('.json3'):
+        return parse_json3_file(path)
+    return parse_vtt_file(path)
+
+
+def pipeline_stages(work_dir):
+    """ステージ名 → 関数（前のステージまでの結果 state を受け取る）"""
+    # 本番のコーパスを汚さないように空のコーパスを使う
+    corpus = KeywordCorpus(os.path.join(work_dir, 'corpus.json'))
+    render_dir = os.path.join(work_dir, 'html')
+    return {
+        'parse': lambda state: load_fixture(state['path']),
+        'normalize': lambda state: normalize_transcript(state['parse'])[0],
+        'keywords': lambda state: extract_keywords(state['normalize'], top_n=30, corpus=corpus),
+        'summarize': lambda state: summarize_transcript(state['normalize'], max_points=15),
+        'chapters': lambda state: detect_chapters(state['normalize']),
+        'render': lambda state: create_visualization(
+            'bench', state['normalize'], state['summarize'], state['keywords'],
+            'https://www.youtube.com/watch?v=bench', render_dir
+        ),
+    }
+
+
+def run_pipeline(stages, path):
+    """全ステージを順に実行（エンドツーエンド計測用）"""
+    state = {'path': path}
+    for name in PIPELINE_STAGES:
+        state[name] = stages[name](state)
+    return state
+
+
+def bench_pipeline(repeat=3):
+    """フィクスチャごとに各ステージとエンドツーエンドの時間・メモリピークを計測"""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='youtube_bench_') as work_dir:
+        stages = pipeline_stages(work_dir)
+        for name, path in write_fixtures(work_dir).items():
+            state = {'path': path}
+            stage_results = {}
+            for stage in PIPELINE_STAGES:
+                func = stages[stage]
+                elapsed, state[stage] = best_of(func, state, repeat)
+                stage_results[stage] = {
+                    'ms': round(elapsed * 1000, 3),
+                    'peak_kb': round(peak_memory(func, state) / 1024, 1),
+                }
+
+            total, _ = best_of(lambda p: run_pipeline(stages, p), path, repeat)
+            results[name] = {
+                'segments': len(state['parse']),
+                'sentences': len(state['normalize']),
+                'stages': stage_results,
+                'end_to_end': {
+                    'ms': round(total * 1000, 3),
+                    'peak_kb': round(peak_memory(lambda p: run_pipeline(stages, p), path) / 1024, 1),
+                },
+            }
+    return results
+
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """前回の結果と比べて遅くなったステージを [(fixture, stage, 前回ms, 今回ms)] で返す"""
+    regressions = []
+    for fixture, result in current.get('pipeline', {}).items():
+        previous = baseline.get('pipeline', {}).get(fixture)
+        if not previous:
+            continue
+        pairs = [(stage, previous['stages'].get(stage), data) for stage, data in result['stages'].items()]
+        pairs.append(('end_to_end', previous.get('end_to_end'), result['end_to_end']))
+        for stage, before, after in pairs:
+            if not before:
+                continue
+            if (after['ms'] > before['ms'] * (1 + threshold)
+                    and after['ms'] - before['ms'] > NOISE_FLOOR_MS):
+                regressions.append((fixture, stage, before['ms'], after['ms']))
+    return regressions
+
+
+def print_pipeline(results):
+    """パイプラインの計測結果を表にして表示"""
+    print("⏱️ pipeline: per-stage time (ms) / peak memory (KB)")
+    header = f"{'fixture':<22} {'segs':>7}" + ''.join(f" {stage:>14}" for stage in PIPELINE_STAGES)
+    print(header + f" {'end-to-end':>16}")
+    for name, result in results.items():
+        row = f"{name:<22} {result['segments']:>7}"
+        for stage in PIPELINE_STAGES:
+            data = result['stages'][stage]
+            row += f" {data['ms']:>7.1f}/{data['peak_kb']:>6.0f}"
+        total = result['end_to_end']
+        row += f" {total['ms']:>8.1f}/{total['peak_kb']:>7.0f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTubeパイプラインのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=3, help="各計測の繰り返し回数（デフォルト: 3）")
+    parser.add_argument("--bench", nargs="+", choices=["pipeline", "parse", "translate"],
+                        default=["pipeline", "parse", "translate"],
+                        help="実行するベンチマーク（デフォルト: すべて）")
+    parser.add_argument("--output", help="結果JSONの保存先（デフォルト: outputs/benchmarks/youtube-<日時>.json）")
+    parser.add_argument("--compare", help="比較する前回の結果JSON（遅くなったステージがあれば終了コード1）")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"回帰とみなす遅くなり方の割合（デフォルト: {REGRESSION_THRESHOLD}）")
+    args = parser.parse_args()
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+    }
+
+    if "pipeline" in args.bench:
+        results['pipeline'] = bench_pipeline(args.repeat)
+        print_pipeline(results['pipeline'])
+
+    if "parse" in args.bench:
+        print("⏱️ parse_vtt: legacy vs streaming")
+        print(f"{'fixture':<8} {'cues':>8} {'legacy ms':>12} {'stream ms':>12} {'speedup':>8}"
+              f" {'legacy peak KB':>15} {'stream peak KB':>15}")
+        results['parse'] = bench_parse_vtt(args.repeat)
+        for row in results['parse']:
+            print(f"{row['fixture']:<8} {row['cues']:>8} {row['legacy_ms']:>12.1f} "
+                  f"{row['streaming_ms']:>12.1f} {row['speedup']:>7.2f}x"
+                  f" {row['legacy_peak_kb']:>15.0f} {row['streaming_peak_kb']:>15.0f}")
+
+    if "translate" in args.bench:
+        row = results['translate'] = bench_translate(args.repeat)
+        print(f"⏱️ translate_to_japanese: {row['glossary']} entries, "
+              f"{row['segments']} segments / {row['words']} words (1h)")
+        print(f"   trie build {row['build_ms']:.1f} ms, legacy {row['legacy_ms']:.1f} ms, "
+              f"trie {row['trie_ms']:.1f} ms ({row['speedup']:.0f}x)")
+
+    # 結果を保存
+    output = Path(args.output) if args.output else RESULTS_DIR / f"youtube-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"💾 Results saved: {output}")
+
+    # 前回の結果と比較
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"⚠️ {len(regressions)} regression(s) vs {args.compare}:")
+            for fixture, stage, before, after in regressions:
+                print(f"   {fixture} / {stage}: {before:.1f} ms → {after:.1f} ms (+{after / before - 1:.0%})")
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
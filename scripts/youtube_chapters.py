@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+YouTube Transcript Index & Chapter Detector
+時刻→セグメントの二分探索インデックスと、TextTilingによるチャプター分割
+
+TranscriptIndex はキューの開始時刻をソート済み配列で持ち、任意の時刻が
+どのセグメントに当たるかを O(log n) で返す。
+detect_chapters は文ウィンドウのTF-IDFベクトルから隣接ブロック間の
+語彙的なつながり（コサイン類似度）を計算し、谷が深い位置で区切る。
+TF-IDFは build_tfidf の疎行列（CSR）のまま扱い、全ギャップ分のブロックの和と
+類似度を非ゼロ要素だけでまとめて求めるので、語彙が大きい長い動画でも
+ウィンドウ数×語彙数の密行列を作らない。
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from youtube_normalize import window_sentences
+from youtube_summarize import build_tfidf
+
+
+class TranscriptIndex:
+    """開始時刻のソート済み配列によるtranscriptのインデックス
+
+    transcript は開始時刻順に並んでいること（YouTubeの字幕は常にそう）。
+    """
+
+    def __init__(self, transcript):
+        self.transcript = transcript
+        self.starts = [seg['start'] for seg in transcript]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def segment_at(self, seconds):
+        """指定した時刻に表示されているセグメントの番号（開始前なら0、空ならNone）"""
+        if not self.starts:
+            return None
+        return max(bisect_right(self.starts, seconds) - 1, 0)
+
+    def segments_at(self, times):
+        """複数の時刻をまとめて検索してセグメント番号の配列を返す"""
+        positions = np.searchsorted(np.asarray(self.starts), np.asarray(times), side='right') - 1
+        return np.maximum(positions, 0)
+
+    def between(self, start, end):
+        """start <= 開始時刻 < end のセグメントを返す"""
+        lo = bisect_left(self.starts, start)
+        hi = bisect_left(self.starts, end, lo)
+        return self.transcript[lo:hi]
+
+
+def _row_entries(indptr, rows):
+    """rows の各行の非ゼロ要素の位置（CSRの data / indices の添字）と、それぞれが何番目の行か"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(owner.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return starts[owner] + offsets, owner
+
+
+def _block_similarity(indptr, indices, data, n_terms, block):
+    """各ギャップの前後 block 個のウィンドウの和どうしのコサイン類似度
+
+    ギャップごとに前後のブロックに含まれる行の非ゼロ要素を集め、
+    (ギャップ, 語) ごとに合計してから内積とノルムを求める（CSRのまま計算）。
+    """
+    n = len(indptr) - 1
+    gaps = np.arange(1, n)
+
+    def block_sums(offsets):
+        # (ギャップ, 行) の組を作り、その行の要素を (ギャップ, 語) のキーで並べる
+        gap_ids = np.repeat(gaps, len(offsets))
+        rows = (gaps[:, None] + offsets[None, :]).ravel()
+        keep = (rows >= 0) & (rows < n)
+        positions, owner = _row_entries(indptr, rows[keep])
+        return gap_ids[keep][owner] * n_terms + indices[positions], data[positions]
+
+    left_keys, left_values = block_sums(np.arange(-block, 0))
+    right_keys, right_values = block_sums(np.arange(0, block))
+
+    keys, inverse = np.unique(np.concatenate([left_keys, right_keys]), return_inverse=True)
+    left = np.bincount(inverse[:left_keys.size], weights=left_values, minlength=keys.size)
+    right = np.bincount(inverse[left_keys.size:], weights=right_values, minlength=keys.size)
+    key_gap = keys // n_terms - 1
+
+    cross = np.bincount(key_gap, weights=left * right, minlength=n - 1)
+    left_norm = np.sqrt(np.bincount(key_gap, weights=left * left, minlength=n - 1))
+    right_norm = np.sqrt(np.bincount(key_gap, weights=right * right, minlength=n - 1))
+    denom = left_norm * right_norm
+    return np.divide(cross, denom, out=np.zeros(n - 1), where=denom > 0)
+
+
+def _depth_scores(scores, radius):
+    """各ギャップの谷の深さ（左右 radius 以内の最大値との差の和）"""
+    padded = np.pad(scores, radius, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, radius + 1)
+    left_peak = windows[:len(scores)].max(axis=1)
+    right_peak = windows[radius:radius + len(scores)].max(axis=1)
+    return (left_peak - scores) + (right_peak - scores)
+
+
+def _chapter_title(indptr, indices, data, terms, lo, hi, n_terms=2):
+    """チャプター内で重みの大きい語をタイトルにする"""
+    span = slice(indptr[lo], indptr[hi])
+    weights = np.bincount(indices[span], weights=data[span], minlength=len(terms))
+    top = np.argsort(-weights, kind='stable')[:n_terms]
+    return ' / '.join(terms[i] for i in top if weights[i] > 0)
+
+
+def detect_chapters(transcript, window=20.0, block=3, min_chapter=60.0, max_chapters=None):
+    """transcriptをトピックごとのチャプターに分割
+
+    window: 文をまとめるウィンドウ長（秒）
+    block: 類似度を比べる前後のウィンドウ数
+    min_chapter: チャプターの最短の長さ（秒）
+    戻り値は [{'start', 'end', 'title', 'segments'}]（時間順）。
+    """
+    if not transcript:
+        return []
+
+    units = window_sentences(transcript, window)
+    indptr, indices, data, vocab = build_tfidf([u['text'] for u in units])
+    total = {'start': units[0]['start'], 'end': units[-1]['end']}
+    if len(units) < 2 * block or not vocab:
+        bounds = [0, len(units)]
+        terms = []
+    else:
+        terms = [None] * len(vocab)
+        for term, idx in vocab.items():
+            terms[idx] = term
+
+        scores = _block_similarity(indptr, indices, data, len(vocab), block)
+        depth = _depth_scores(scores, block)
+
+        # 平均より深い谷を境界候補にし、深い順に最短長を満たすものだけ採用
+        cutoff = depth.mean() + depth.std() / 2
+        candidates = np.flatnonzero(depth > cutoff)
+        candidates = candidates[np.argsort(-depth[candidates], kind='stable')]
+
+        chosen = []
+        for gap in candidates:
+            boundary = gap + 1
+            time = units[boundary]['start']
+            if time - total['start'] < min_chapter or total['end'] - time < min_chapter:
+                continue
+            if any(abs(time - units[b]['start']) < min_chapter for b in chosen):
+                continue
+            chosen.append(boundary)
+            if max_chapters and len(chosen) >= max_chapters - 1:
+                break
+        bounds = [0] + sorted(chosen) + [len(units)]
+
+    index = TranscriptIndex(transcript)
+    chapters = []
+    for lo, hi in zip(bounds, bounds[1:]):
+        start, end = units[lo]['start'], units[hi - 1]['end']
+        chapters.append({
+            'start': start,
+            'end': end,
+            'title': _chapter_title(indptr, indices, data, terms, lo, hi) if terms else '',
+            'segments': len(index.between(start, end + 1e-9))
+        })
+    return chapters
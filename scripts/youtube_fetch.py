@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+YouTube Subtitle Fetcher
+yt-dlpの実行をジョブごとの一時ディレクトリに閉じ込めて字幕を取得
+
+各ジョブは専用の作業ディレクトリ（tempfile）で yt-dlp を実行し、
+出力先は sub.{lang}.{format} に固定される。/tmp やカレントディレクトリを
+走査しないので、同じ動画でも複数のジョブを同時に実行できる。
+作業ディレクトリは成功・失敗にかかわらず必ず削除される。
+
+fetch_tracks は優先言語リストを1回の yt-dlp 呼び出しで取得し、
+トラックごとにパースしたものを outputs/subtitle-cache/ にキャッシュする。
+yt-dlp が失敗した場合は例外にして、その言語を取得済みとして記録しない。
+トラックが無かった言語は問い合わせた時刻を記録し、MISSING_TTL を過ぎたらまた問い合わせる
+（自動字幕は動画の公開からしばらくして付くことがある）。
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from youtube_store import locked, read_json, write_json
+from youtube_vtt import parse_vtt_file
+
+YTDLP_PATH = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TRACK_CACHE_DIR = PROJECT_ROOT / "outputs" / "subtitle-cache"
+
+# 字幕の言語の優先順（先頭から順に使えるものを選ぶ）
+DEFAULT_LANGS = ('en', 'en-US', 'en-GB', 'ja')
+
+# トラックが無かった言語を問い合わせ直すまでの時間（秒）
+MISSING_TTL = 6 * 60 * 60
+
+# yt-dlpの出力テンプレート（拡張子の前に言語コードが付く）
+OUTPUT_NAME = 'sub'
+
+
+@contextmanager
+def job_dir(video_id):
+    """ジョブ専用の一時作業ディレクトリ（抜けるときに中身ごと削除）"""
+    with tempfile.TemporaryDirectory(prefix=f'youtube_{video_id}_') as path:
+        yield Path(path)
+
+
+def subtitle_path(work_dir, lang, sub_format='vtt'):
+    """作業ディレクトリ内の字幕ファイルのパス（yt-dlpの命名規則どおり）"""
+    return Path(work_dir) / f'{OUTPUT_NAME}.{lang}.{sub_format}'
+
+
+def run_ytdlp_subs(video_id, work_dir, langs='en', sub_format='vtt', manual=False, timeout=60, check=True):
+    """作業ディレクトリに字幕をダウンロードし、できたファイルを言語順に返す
+
+    manual=True なら手動字幕も取得する（自動字幕は常に取得）。
+    check=True なら yt-dlp が失敗したとき subprocess.CalledProcessError を送出する。
+    """
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    command = [YTDLP_PATH]
+    if manual:
+        command.append('--write-subs')
+    command += [
+        '--write-auto-subs',
+        '--sub-langs', langs,
+        '--skip-download',
+        '--sub-format', sub_format,
+        '--output', str(Path(work_dir) / OUTPUT_NAME),
+        url
+    ]
+    subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=check)
+
+    # このジョブの作業ディレクトリだけを見る
+    return sorted(Path(work_dir).glob(f'{OUTPUT_NAME}.*.{sub_format}'))
+
+
+def parse_json3(data):
+    """yt-dlpのjson3字幕を [{'start', 'end', 'text'}] に変換"""
+    transcript = []
+    for event in data.get('events', []):
+        if 'segs' in event:
+            text = ''.join([seg.get('utf8', '') for seg in event['segs']])
+            if text.strip():
+                start = event.get('tStartMs', 0) / 1000
+                transcript.append({
+                    'start': start,
+                    'end': start + event.get('dDurationMs', 0) / 1000,
+                    'text': text.strip()
+                })
+    return transcript
+
+
+def parse_json3_file(path):
+    """json3字幕ファイルをパース"""
+    return parse_json3(read_json(path))
+
+
+def _parse_tracks(paths, workers=None):
+    """字幕ファイルを並列にパースして {lang: transcript} を返す"""
+    langs = [path.name.split('.')[-2] for path in paths]
+    if not paths:
+        return {}
+    if len(paths) == 1:
+        return {langs[0]: parse_vtt_file(paths[0])}
+    with ProcessPoolExecutor(max_workers=workers or min(len(paths), os.cpu_count() or 1)) as pool:
+        return dict(zip(langs, pool.map(parse_vtt_file, paths)))
+
+
+class TrackCache:
+    """動画ごと・言語ごとのパース済み字幕キャッシュ
+
+    {video_id}.json に言語ごとの問い合わせ時刻とトラックがあった言語、
+    {video_id}.{lang}.json に各トラックを保存する。
+    """
+
+    def __init__(self, cache_dir=TRACK_CACHE_DIR, missing_ttl=MISSING_TTL, clock=time.time):
+        self.cache_dir = Path(cache_dir)
+        self.missing_ttl = missing_ttl
+        self.clock = clock
+
+    def _manifest_path(self, video_id):
+        return self.cache_dir / f'{video_id}.json'
+
+    def _track_path(self, video_id, lang):
+        return self.cache_dir / f'{video_id}.{lang}.json'
+
+    def manifest(self, video_id):
+        """言語ごとの問い合わせ時刻 {lang: 時刻} と実際にあった言語（未取得なら空）"""
+        manifest = read_json(self._manifest_path(video_id), {'requested': {}, 'available': []})
+        if isinstance(manifest['requested'], list):
+            # 時刻の無い古い形式は期限切れとして扱う
+            manifest['requested'] = dict.fromkeys(manifest['requested'], 0)
+        return manifest
+
+    def missing(self, video_id, langs):
+        """取得が必要な言語（未問い合わせか、トラックが無くて MISSING_TTL を過ぎたもの）"""
+        manifest = self.manifest(video_id)
+        available, requested = set(manifest['available']), manifest['requested']
+        now = self.clock()
+        return [
+            lang for lang in langs
+            if lang not in available and (lang not in requested or now - requested[lang] >= self.missing_ttl)
+        ]
+
+    def load(self, video_id, langs):
+        """キャッシュ済みのトラックを {lang: transcript} で返す"""
+        available = set(self.manifest(video_id)['available'])
+        return {
+            lang: read_json(self._track_path(video_id, lang))
+            for lang in langs if lang in available
+        }
+
+    def store(self, video_id, requested, tracks):
+        """取得結果を保存（トラックが無かった言語も問い合わせた時刻を記録）"""
+        for lang, transcript in tracks.items():
+            write_json(self._track_path(video_id, lang), transcript)
+        path = self._manifest_path(video_id)
+        with locked(path):
+            manifest = self.manifest(video_id)
+            manifest['requested'].update(dict.fromkeys(requested, self.clock()))
+            manifest['available'] = sorted(set(manifest['available']) | set(tracks))
+            write_json(path, manifest)
+
+
+def fetch_tracks(video_id, langs=DEFAULT_LANGS, cache=None, refresh=False, workers=None):
+    """優先言語リストの字幕をまとめて取得して {lang: transcript} を返す
+
+    キャッシュに無い言語だけを1回の yt-dlp 呼び出しで取得し、
+    返ってきたトラックは並列にパースして言語ごとにキャッシュする。
+    yt-dlp が失敗したときは何もキャッシュせずに例外を送出する（次回また取得する）。
+    """
+    cache = cache if cache is not None else TrackCache()
+    missing = list(langs) if refresh else cache.missing(video_id, langs)
+
+    if missing:
+        with job_dir(video_id) as work_dir:
+            paths = run_ytdlp_subs(video_id, work_dir, langs=','.join(missing))
+            tracks = _parse_tracks([path for path in paths if path.name.split('.')[-2] in missing], workers)
+        cache.store(video_id, missing, tracks)
+
+    return cache.load(video_id, langs)
+
+
+def pick_track(tracks, langs=DEFAULT_LANGS):
+    """優先順で最初の空でないトラックを (lang, transcript) で返す（無ければ (None, None)）"""
+    for lang in langs:
+        if tracks.get(lang):
+            return lang, tracks[lang]
+    return None, None
+
+
+def fetch_transcript(video_id, langs=DEFAULT_LANGS):
+    """利用できる中で最も優先度の高い言語のtranscriptを (lang, transcript) で返す"""
+    try:
+        return pick_track(fetch_tracks(video_id, langs), langs)
+
+    except Exception as e:
+        print(f"Error downloading subs: {e}")
+        return None, None
@@ -11,8 +11,8 @@ import re
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
-# yt-dlpで動画情報を取得
-import subprocess
+from youtube_keywords import extract_keywords_from_text
+from youtube_metadata import get_cache
 
 def get_video_id(url):
     """YouTube URLから動画IDを抽出"""
@@ -22,68 +22,17 @@ def get_video_id(url):
         return url.split("watch?v=")[1].split("&")[0]
     return None
 
-def get_video_info(video_id):
-    """yt-dlpを使って動画情報を取得"""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ytdlp_path = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
+def get_video_info(video_id, refresh=False, cache=None):
+    """動画情報を取得（キャッシュがTTL内ならyt-dlpを起動しない）"""
+    cache = cache if cache is not None else get_cache()
 
     try:
-        result = subprocess.run(
-            [
-                ytdlp_path,
-                '--dump-json',
-                '--no-playlist',
-                url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode == 0:
-            video_data = json.loads(result.stdout)
-            return video_data
-        else:
-            print(f"Error: {result.stderr}")
-            return None
+        return cache.get(video_id, refresh=refresh)
 
     except Exception as e:
         print(f"Error getting video info: {e}")
         return None
 
-def extract_keywords(text, top_n=20):
-    """テキストからキーワードを抽出"""
-    from collections import Counter
-    import re
-
-    # 単語を抽出
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-
-    # ストップワード除去
-    stopwords = set(['the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-                     'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-                     'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'dare',
-                     'ought', 'used', 'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by',
-                     'from', 'as', 'into', 'through', 'during', 'before', 'after', 'above',
-                     'below', 'between', 'under', 'again', 'further', 'then', 'once',
-                     'here', 'there', 'when', 'where', 'why', 'how', 'all', 'each', 'few',
-                     'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
-                     'own', 'same', 'so', 'than', 'too', 'very', 'just', 'but', 'and',
-                     'or', 'if', 'it', 'its', 'this', 'that', 'these', 'those', 'he', 'she',
-                     'they', 'we', 'you', 'i', 'me', 'him', 'her', 'us', 'them', 'my',
-                     'your', 'his', 'their', 'our', 'its', 'what', 'which', 'who', 'whom',
-                     'this', 'that', 'these', 'those'])
-
-    filtered_words = [w for w in words if len(w) > 3 and w not in stopwords]
-
-    # 頻度カウント
-    word_counts = Counter(filtered_words)
-
-    # 上位N個を取得
-    top_keywords = word_counts.most_common(top_n)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
-
 def format_duration(seconds):
     """秒をHH:MM:SS形式に変換"""
     hours = int(seconds // 3600)
@@ -130,7 +79,7 @@ def create_visualization(video_data, output_dir):
 
     # キーワード抽出
     combined_text = f"{title} {description} {' '.join(tags)}"
-    keywords = extract_keywords(combined_text, top_n=20)
+    keywords = extract_keywords_from_text(combined_text, top_n=20)
 
     # カテゴリ
     category = video_data.get('categories', ['Unknown'])[0] if video_data.get('categories') else 'Unknown'
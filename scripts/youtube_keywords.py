@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+YouTube Keyword Engine
+全YouTubeスクリプト共通のキーワード抽出（TF-IDF＋2語フレーズ、日本語はn-gram）
+
+処理した動画ごとの文書頻度（DF）テーブルを outputs/keyword-corpus.json に
+インクリメンタルに保存する。新しい動画のスコアリングに必要なのは、
+その動画自身のトークン数とキャッシュ済みのコーパステーブルだけ。
+保存時はロックを取ってファイルを読み直し、読み込み後に加えた動画だけをマージするので、
+同時に実行したジョブの更新も失われない。
+"""
+
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from youtube_store import locked, read_json, write_json
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+CORPUS_FILE = PROJECT_ROOT / "outputs" / "keyword-corpus.json"
+
+STOPWORDS = frozenset([
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'dare',
+    'ought', 'used', 'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by',
+    'from', 'as', 'into', 'through', 'during', 'before', 'after', 'above',
+    'below', 'between', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all', 'each', 'few',
+    'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
+    'own', 'same', 'so', 'than', 'too', 'very', 'just', 'but', 'and',
+    'or', 'if', 'it', 'its', 'this', 'that', 'these', 'those', 'he', 'she',
+    'they', 'we', 'you', 'i', 'me', 'him', 'her', 'us', 'them', 'my',
+    'your', 'his', 'their', 'our', 'what', 'which', 'who', 'whom',
+    'about', 'over', 'make', 'like', 'time', 'were', 'said', 'done',
+    'come', 'also', 'well', 'much', 'even', 'because', 'any', 'many',
+    'yeah', 'okay', 'really', 'going', 'know', 'think', 'thing', 'things',
+    'want', 'right', 'actually', 'gonna', 'kind', 'little', 'something',
+])
+
+# 英単語 / 漢字の連続 / カタカナの連続（ひらがなは助詞が多いので除外）
+TOKEN_RE = re.compile(r"[a-z][a-z']+|[\u4e00-\u9fff\u3005]+|[\u30a0-\u30ff]+")
+
+# 英単語の最小文字数（従来の len(w) > 3 と同じ）
+MIN_WORD_LENGTH = 4
+
+
+def _japanese_ngrams(run):
+    """漢字の連続は2-gramに分割（1〜2文字ならそのまま）"""
+    if len(run) <= 2:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def tokenize(text, min_length=3):
+    """テキストをトークン列に分割（ストップワード除去済み、日本語はn-gram）"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        first = token[0]
+        if 'a' <= first <= 'z':
+            if len(token) >= min_length and token not in STOPWORDS:
+                tokens.append(token)
+        elif '\u30a0' <= first <= '\u30ff':
+            if len(token) >= 2:
+                tokens.append(token)
+        else:
+            tokens.extend(_japanese_ngrams(token))
+    return tokens
+
+
+def term_counts(texts):
+    """テキスト群から単語と2語フレーズの出現回数を数える
+
+    フレーズはストップワードや文の区切りをまたがない連続2語のみ。
+    """
+    counts = Counter()
+    for text in texts:
+        previous = None
+        for token in TOKEN_RE.findall(text.lower()):
+            if 'a' <= token[0] <= 'z':
+                if token in STOPWORDS or len(token) < MIN_WORD_LENGTH:
+                    previous = None
+                    continue
+                counts[token] += 1
+                if previous:
+                    counts[f"{previous} {token}"] += 1
+                previous = token
+            else:
+                previous = None
+                if '\u30a0' <= token[0] <= '\u30ff':
+                    if len(token) >= 2:
+                        counts[token] += 1
+                else:
+                    counts.update(_japanese_ngrams(token))
+    return counts
+
+
+class KeywordCorpus:
+    """処理済み動画の文書頻度テーブル（JSONに永続化）
+
+    動画ごとにDFに加えた語の一覧も持つので、同じ動画を採点し直すときは
+    その動画が加えた語だけを除き、別のテキストで登録し直すとDFも入れ替える。
+    """
+
+    def __init__(self, path=CORPUS_FILE):
+        self.path = Path(path)
+        self.documents = 0
+        self.df = Counter()
+        self.seen = set()
+        self.doc_terms = {}  # {doc_id: DFに加えた語のリスト}（語の一覧が無い古い形式の動画は含まない）
+        self.pending = {}    # 読み込み後に加えた・入れ替えた動画 {doc_id: 語のリスト}
+
+    @property
+    def dirty(self):
+        return bool(self.pending)
+
+    @classmethod
+    def load(cls, path=CORPUS_FILE):
+        """保存済みのテーブルを読み込む（無ければ空）"""
+        corpus = cls(path)
+        corpus._read()
+        return corpus
+
+    def _read(self):
+        data = read_json(self.path, {})
+        self.documents = data.get('documents', 0)
+        self.df = Counter(data.get('df', {}))
+        self.seen = set(data.get('seen', []))
+        self.doc_terms = data.get('terms', {})
+
+    def save(self):
+        """テーブルをアトミックに保存（ほかのジョブが保存した分とマージ）"""
+        if not self.dirty:
+            return
+        with locked(self.path):
+            self._read()
+            for doc_id, terms in self.pending.items():
+                self._set(doc_id, terms)
+            write_json(self.path, {
+                'documents': self.documents,
+                'df': self.df,
+                'seen': sorted(self.seen),
+                'terms': self.doc_terms
+            })
+        self.pending = {}
+
+    def _set(self, doc_id, terms):
+        """動画の語をDFに反映（登録済みなら前の語と入れ替える）。変わらなければ False"""
+        if doc_id in self.seen:
+            old = self.doc_terms.get(doc_id)
+            # 語の一覧が無い古い形式の動画は、二重に数えないようにそのままにする
+            if old is None or set(old) == set(terms):
+                return False
+            for term in old:
+                self.df[term] -= 1
+                if self.df[term] <= 0:
+                    del self.df[term]
+        else:
+            self.seen.add(doc_id)
+            self.documents += 1
+        self.df.update(terms)
+        self.doc_terms[doc_id] = terms
+        return True
+
+    def add_document(self, doc_id, counts):
+        """動画1本分の語をDFに加える（同じIDは二重に数えず、語が変わっていれば入れ替える）"""
+        terms = sorted(counts.keys())
+        if self._set(doc_id, terms):
+            self.pending[doc_id] = terms
+
+    def score(self, counts, doc_id=None):
+        """TF-IDFスコアを計算して (term, count, score) を高い順に返す
+
+        doc_id がすでにコーパスに含まれている場合は、その動画自身（動画数と、
+        その動画が加えた語のDF）を除いて計算する。
+        """
+        documents = self.documents
+        own = doc_id is not None and doc_id in self.seen
+        own_terms = set(self.doc_terms.get(doc_id, ())) if own else set()
+        documents -= 1 if own else 0
+
+        scored = []
+        for term, count in counts.items():
+            # フレーズは2回以上出現したものだけ
+            if ' ' in term and count < 2:
+                continue
+            df = self.df.get(term, 0) - (1 if term in own_terms else 0)
+            idf = math.log((1 + documents) / (1 + df)) + 1.0
+            weight = (1.0 + math.log(count)) * idf
+            if ' ' in term:
+                weight *= 1.5
+            scored.append((term, count, weight))
+
+        scored.sort(key=lambda x: (-x[2], -x[1], x[0]))
+        return scored
+
+
+_default_corpus = None
+
+
+def get_corpus():
+    """既定のコーパステーブル（プロセス内で1回だけ読み込む）"""
+    global _default_corpus
+    if _default_corpus is None:
+        _default_corpus = KeywordCorpus.load()
+    return _default_corpus
+
+
+def _top_keywords(counts, top_n, corpus, doc_id):
+    """スコア上位N件を従来の形式で返す（部分語として含まれる単語は除く）"""
+    corpus = corpus if corpus is not None else get_corpus()
+    scored = corpus.score(counts, doc_id)
+
+    keywords = []
+    in_phrases = set()
+    for term, count, weight in scored:
+        if len(keywords) >= top_n:
+            break
+        if term in in_phrases:
+            continue
+        if ' ' in term:
+            in_phrases.update(term.split())
+        keywords.append({"word": term, "count": count, "score": round(weight, 4)})
+
+    if doc_id is not None:
+        corpus.add_document(doc_id, counts)
+        corpus.save()
+
+    return keywords
+
+
+def extract_keywords(transcript, top_n=20, doc_id=None, corpus=None):
+    """transcriptからキーワードを抽出（doc_id を渡すとコーパスに登録）"""
+    counts = term_counts(item['text'] for item in transcript)
+    return _top_keywords(counts, top_n, corpus, doc_id)
+
+
+def extract_keywords_from_text(text, top_n=20, doc_id=None, corpus=None):
+    """テキストからキーワードを抽出"""
+    return _top_keywords(term_counts([text]), top_n, corpus, doc_id)
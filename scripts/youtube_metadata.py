@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+YouTube Video Metadata Cache
+yt-dlpの動画情報のうち必要な項目だけをローカルにキャッシュ（TTL付き）
+
+yt-dlp --dump-json は1本あたり数百KBのJSONを返し、起動にも数秒かかる。
+ここではビジュアライズに使う項目だけを outputs/video-metadata.json に保存し、
+期限切れ・未取得の動画はまとめて1回の yt-dlp 呼び出しで更新する。
+取得関数（fetcher）は差し替え可能なので、オフラインでもフィクスチャで動かせる。
+保存時はロックを取ってファイルを読み直し、動画ごとに取得時刻の新しい方を残す。
+
+使い方: python3 youtube_metadata.py <youtube_url|video_id>... [--refresh]
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from youtube_fetch import YTDLP_PATH
+from youtube_store import locked, read_json, write_json
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+CACHE_FILE = PROJECT_ROOT / "outputs" / "video-metadata.json"
+
+# キャッシュの有効期限（秒）
+DEFAULT_TTL = 24 * 60 * 60
+
+# キャッシュに残す項目（create_visualization が使うもの）
+METADATA_FIELDS = (
+    'id', 'title', 'uploader', 'channel', 'channel_id', 'duration',
+    'view_count', 'like_count', 'comment_count', 'upload_date',
+    'description', 'categories', 'tags', 'chapters',
+)
+
+# チャプターは時間とタイトルだけ
+CHAPTER_FIELDS = ('start_time', 'end_time', 'title')
+
+
+def project(video_data):
+    """yt-dlpの動画情報から必要な項目だけを取り出す"""
+    projected = {field: video_data.get(field) for field in METADATA_FIELDS if field in video_data}
+    if projected.get('chapters'):
+        projected['chapters'] = [
+            {field: chapter.get(field) for field in CHAPTER_FIELDS}
+            for chapter in projected['chapters']
+        ]
+    return projected
+
+
+def ytdlp_fetch(video_ids, timeout=120):
+    """yt-dlpを1回だけ起動して複数動画の情報を取得（1行1動画のJSON）"""
+    urls = [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids]
+    result = subprocess.run(
+        [
+            YTDLP_PATH,
+            '--dump-json',
+            '--no-playlist',
+            '--skip-download',
+            '--ignore-errors',
+            *urls
+        ],
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+    if result.returncode != 0 and result.stderr:
+        print(f"Error: {result.stderr}")
+
+    # 取得できた動画だけを返す（1本ずつ射影して大きなJSONを保持しない）
+    for line in result.stdout.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class MetadataCache:
+    """動画IDごとの射影済みメタデータ（JSONに永続化）"""
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, fetcher=ytdlp_fetch, clock=time.time):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.fetcher = fetcher
+        self.clock = clock
+        self.entries = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=CACHE_FILE, **kwargs):
+        """保存済みのキャッシュを読み込む（無ければ空）"""
+        cache = cls(path, **kwargs)
+        cache.entries = read_json(cache.path, {})
+        return cache
+
+    def save(self):
+        """キャッシュをアトミックに保存（ほかのジョブが保存した分とマージ）"""
+        if not self.dirty:
+            return
+        with locked(self.path):
+            entries = read_json(self.path, {})
+            for video_id, entry in self.entries.items():
+                saved = entries.get(video_id)
+                if saved is None or entry['fetched_at'] >= saved['fetched_at']:
+                    entries[video_id] = entry
+            write_json(self.path, entries)
+        self.entries = entries
+        self.dirty = False
+
+    def is_fresh(self, video_id):
+        """キャッシュがTTL内かどうか"""
+        entry = self.entries.get(video_id)
+        return entry is not None and self.clock() - entry['fetched_at'] < self.ttl
+
+    def refresh(self, video_ids):
+        """指定した動画をまとめて取得し直す（1回の fetcher 呼び出し）"""
+        video_ids = list(dict.fromkeys(video_ids))
+        if not video_ids:
+            return
+        fetched_at = self.clock()
+        for video_data in self.fetcher(video_ids):
+            metadata = project(video_data)
+            self.entries[metadata['id']] = {'fetched_at': fetched_at, 'data': metadata}
+            self.dirty = True
+        self.save()
+
+    def get_many(self, video_ids, refresh=False):
+        """複数動画のメタデータを返す（期限切れ・未取得の分だけまとめて更新）
+
+        取得できなかった動画は結果に含まれない。
+        """
+        stale = [video_id for video_id in video_ids if refresh or not self.is_fresh(video_id)]
+        self.refresh(stale)
+        return {
+            video_id: self.entries[video_id]['data']
+            for video_id in video_ids if video_id in self.entries
+        }
+
+    def get(self, video_id, refresh=False):
+        """1本分のメタデータを返す（無ければNone）"""
+        return self.get_many([video_id], refresh).get(video_id)
+
+
+_default_cache = None
+
+
+def get_cache():
+    """既定のメタデータキャッシュ（プロセス内で1回だけ読み込む）"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = MetadataCache.load()
+    return _default_cache
+
+
+def main():
+    from youtube_info import get_video_id
+
+    parser = argparse.ArgumentParser(description="動画メタデータのキャッシュを更新")
+    parser.add_argument("videos", nargs="+", help="YouTube URLまたは動画ID")
+    parser.add_argument("--refresh", action="store_true", help="TTL内でも取得し直す")
+    args = parser.parse_args()
+
+    video_ids = [get_video_id(video) or video for video in args.videos]
+    results = get_cache().get_many(video_ids, refresh=args.refresh)
+
+    for video_id in video_ids:
+        data = results.get(video_id)
+        if data:
+            print(f"✅ {video_id}: {data.get('title', 'Unknown')}")
+        else:
+            print(f"❌ {video_id}: not available")
+
+
+if __name__ == "__main__":
+    main()
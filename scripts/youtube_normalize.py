@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+YouTube Transcript Normalizer
+自動字幕のローリング重複を除去し、文単位（＋任意で固定長ウィンドウ）に再構成
+
+YouTubeの自動字幕は同じ行が2〜3個のキューにまたがって繰り返されるので、
+そのまま要約・キーワード抽出すると同じ単語を何度も処理してしまう。
+"""
+
+# 文末とみなす記号
+SENTENCE_END = ('.', '?', '!', '。', '？', '！')
+
+# 直前の出力のうち重複チェックに使う単語数
+OVERLAP_LOOKBACK = 32
+
+# 自動字幕がキューの切り替えに挟む、前の行を繰り返すだけの短いキューの長さ（秒）
+ROLLING_TRANSITION = 0.05
+
+
+def _overlap(tail, words):
+    """tail の末尾と words の先頭が一致する最長の単語数"""
+    longest = min(len(tail), len(words))
+    first = words[0]
+    for k in range(longest, 0, -1):
+        if tail[-k] == first and tail[-k:] == words[:k]:
+            return k
+    return 0
+
+
+def merge_rolling(transcript, min_overlap=2):
+    """ローリング重複を除去して (word, start, end) の単語列を返す
+
+    直前までの出力の末尾とキュー先頭の重なりを取り除き、新しい単語だけを
+    そのキューの時間幅に均等に割り当てる。取り除くのは、先頭の2単語以上が
+    前の出力の続きになっている（ローリングしている）場合と、キュー全体の
+    繰り返しが前のキューと時間が重なるか切り替え用の短いキューの場合だけ。
+    手動字幕で同じ台詞が続くキュー（"no no." など）はそのまま残す。
+    """
+    merged = []
+    tail = []
+    previous_end = None
+
+    for seg in transcript:
+        words = seg['text'].split()
+        if not words:
+            continue
+
+        overlapping = previous_end is not None and seg['start'] < previous_end
+        previous_end = seg['end']
+
+        k = _overlap(tail, words)
+        if k < min_overlap and k != len(words):
+            # 1単語だけの偶然の一致
+            k = 0
+        elif k == len(words) and not overlapping and seg['end'] - seg['start'] > ROLLING_TRANSITION:
+            # 時間の重ならない同じ台詞の繰り返し
+            k = 0
+
+        new_words = words[k:]
+        if not new_words:
+            continue
+
+        step = max(seg['end'] - seg['start'], 0) / len(new_words)
+        for i, word in enumerate(new_words):
+            merged.append((word, seg['start'] + i * step, seg['start'] + (i + 1) * step))
+
+        tail.extend(new_words)
+        if len(tail) > OVERLAP_LOOKBACK * 2:
+            del tail[:-OVERLAP_LOOKBACK]
+
+    return merged
+
+
+def build_sentences(words, max_gap=1.5, max_words=40):
+    """単語列を文に再構成（句読点・無音区間・長さで区切る）"""
+    sentences = []
+    current = []
+
+    def flush():
+        if current:
+            sentences.append({
+                'text': ' '.join(w for w, _, _ in current),
+                'start': current[0][1],
+                'end': current[-1][2]
+            })
+            current.clear()
+
+    for word, start, end in words:
+        if current and start - current[-1][2] > max_gap:
+            flush()
+        current.append((word, start, end))
+        if word.endswith(SENTENCE_END) or len(current) >= max_words:
+            flush()
+
+    flush()
+    return sentences
+
+
+def window_sentences(sentences, window=30.0):
+    """文を固定長（秒）のウィンドウにまとめる"""
+    windows = []
+    current = []
+
+    for sentence in sentences:
+        current.append(sentence)
+        if sentence['end'] - current[0]['start'] >= window:
+            windows.append({
+                'text': ' '.join(s['text'] for s in current),
+                'start': current[0]['start'],
+                'end': current[-1]['end']
+            })
+            current = []
+
+    if current:
+        windows.append({
+            'text': ' '.join(s['text'] for s in current),
+            'start': current[0]['start'],
+            'end': current[-1]['end']
+        })
+
+    return windows
+
+
+def normalize_transcript(transcript, window=None):
+    """transcriptを正規化して (segments, report) を返す
+
+    window を指定すると文をその秒数ごとのウィンドウにまとめる。
+    report には入力・出力のセグメント数と単語数、削減率が入る。
+    """
+    words = merge_rolling(transcript)
+    segments = build_sentences(words)
+    if window:
+        segments = window_sentences(segments, window)
+
+    input_words = sum(len(seg['text'].split()) for seg in transcript)
+    report = {
+        'input_segments': len(transcript),
+        'output_segments': len(segments),
+        'input_words': input_words,
+        'output_words': len(words),
+        'reduction_ratio': round(1 - len(words) / input_words, 4) if input_words else 0.0
+    }
+
+    return segments, report
+
+
+def format_report(report):
+    """削減率レポートを1行にまとめる"""
+    return (f"{report['input_segments']} → {report['output_segments']} segments, "
+            f"{report['input_words']} → {report['output_words']} words "
+            f"(-{report['reduction_ratio']:.0%})")
@@ -7,10 +7,15 @@ CSS修正と高品質な要約アルゴリズム
 import sys
 import json
 import os
-import subprocess
-import re
 from datetime import datetime
-from collections import Counter
+
+from youtube_archive import record_summary
+from youtube_chapters import detect_chapters
+from youtube_fetch import fetch_transcript
+from youtube_keywords import extract_keywords
+from youtube_normalize import normalize_transcript, format_report
+from youtube_summarize import summarize_transcript
+from youtube_timing import StageTimer, timing_path
 
 def get_video_id(url):
     """YouTube URLから動画IDを抽出"""
@@ -20,101 +25,6 @@ def get_video_id(url):
         return url.split("watch?v=")[1].split("&")[0]
     return url
 
-def download_subs(video_id, lang='en'):
-    """yt-dlpを使って字幕をダウンロード"""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ytdlp_path = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
-    temp_file = f"/tmp/youtube_subs_{video_id}_{lang}.vtt"
-
-    try:
-        result = subprocess.run(
-            [
-                ytdlp_path,
-                '--write-auto-subs',
-                '--sub-langs', lang,
-                '--skip-download',
-                '--sub-format', 'vtt',
-                '--output', temp_file.replace('.vtt', ''),
-                url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        if not os.path.exists(temp_file):
-            for file in os.listdir('/tmp'):
-                if file.startswith(f'youtube_subs_{video_id}') and file.endswith('.vtt'):
-                    temp_file = f'/tmp/{file}'
-                    break
-
-        if os.path.exists(temp_file):
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-
-            os.remove(temp_file)
-            return vtt_content
-        else:
-            return None
-
-    except Exception as e:
-        print(f"Error downloading subs: {e}")
-        return None
-
-def parse_vtt(vtt_content):
-    """VTTファイルをパースしてtranscriptを作成"""
-    lines = vtt_content.split('\n')
-
-    transcript = []
-    current_start = None
-    current_end = None
-    current_text = []
-
-    for line in lines:
-        line = line.strip()
-
-        timestamp_match = re.match(r'(\d{2}:\d{2}:\d{2}\.\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}\.\d{3})', line)
-
-        if timestamp_match:
-            if current_start is not None and current_text:
-                text = ' '.join(current_text)
-                text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-                text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-                if text.strip():
-                    transcript.append({
-                        'start': current_start,
-                        'end': current_end,
-                        'text': text.strip()
-                    })
-
-            current_start = timestamp_to_seconds(timestamp_match.group(1))
-            current_end = timestamp_to_seconds(timestamp_match.group(2))
-            current_text = []
-
-        elif line and not line.startswith('WEBVTT') and not line.startswith('Kind:') and not line.startswith('Language:'):
-            current_text.append(line)
-
-    if current_start is not None and current_text:
-        text = ' '.join(current_text)
-        text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-        text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-        if text.strip():
-            transcript.append({
-                'start': current_start,
-                'end': current_end,
-                'text': text.strip()
-            })
-
-    return transcript
-
-def timestamp_to_seconds(timestamp):
-    """タイムスタンプを秒に変換"""
-    parts = timestamp.split(':')
-    hours = int(parts[0])
-    minutes = int(parts[1])
-    seconds = float(parts[2])
-    return hours * 3600 + minutes * 60 + seconds
-
 def format_time(seconds):
     """秒をHH:MM:SS形式に変換"""
     hours = int(seconds // 3600)
@@ -124,74 +34,9 @@ def format_time(seconds):
 
 # 改善された要約アルゴリズム
 def smart_summarize(transcript, max_points=8):
-    """transcriptをスマートに要約 - トピックごとにグループ化して要約"""
-    if not transcript:
-        return []
-
-    # 1. トピックを抽出（名詞・動詞・重要な単語）
-    topics = extract_topics(transcript)
-
-    # 2. 各トピックについてのセグメントをグループ化
-    topic_segments = {}
-    for seg in transcript:
-        words = seg['text'].lower().split()
-        for topic in topics:
-            if any(topic in word for word in words):
-                if topic not in topic_segments:
-                    topic_segments[topic] = []
-                topic_segments[topic].append(seg)
-                break
-
-    # 3. 各トピックから代表セグメントを選択
-    summary = []
-    for topic, segments in topic_segments.items():
-        if len(segments) > 0:
-            # 最も長いセグメントを選択（重要度が高い）
-            best = max(segments, key=lambda s: len(s['text'].split()))
-            summary.append({
-                'text': best['text'],
-                'start': best['start'],
-                'end': best['end'],
-                'topic': topic
-            })
-
-    # 4. 時間順にソート
-    summary.sort(key=lambda x: x['start'])
-
-    # 5. 上位N個に制限
-    return summary[:max_points]
-
-def extract_topics(transcript):
-    """transcriptからトピックを抽出"""
-    # 全テキストを結合
-    full_text = ' '.join([seg['text'] for seg in transcript]).lower()
-
-    # ストップワード除去
-    stopwords = set(['the', 'and', 'that', 'have', 'for', 'not', 'you', 'with', 'this', 'but', 'his', 'from', 'they', 'she', 'her', 'been', 'than', 'its', 'who', 'was', 'are', 'will', 'would', 'could', 'should', 'about', 'after', 'into', 'over', 'their', 'your', 'what', 'when', 'make', 'like', 'just', 'time', 'them', 'more', 'some', 'only', 'were', 'said', 'each', 'does', 'done', 'come', 'also', 'well', 'much', 'even', 'such', 'because', 'any', 'most', 'many', 'then', 'than', 'too', 'very'])
-
-    # 単語を抽出
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', full_text)
-    filtered_words = [w for w in words if w not in stopwords]
-
-    # 頻度分析
-    word_counts = Counter(filtered_words)
-    top_words = word_counts.most_common(10)
-
-    # トピックとして返却
-    return [word for word, count in top_words if count >= 2]
-
-def extract_keywords(transcript, top_n=20):
-    """キーワード抽出"""
-    full_text = ' '.join([item['text'] for item in transcript]).lower()
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', full_text)
-
-    stopwords = set(['the', 'and', 'that', 'have', 'for', 'not', 'you', 'with', 'this', 'but', 'his', 'from', 'they', 'she', 'her', 'been', 'than', 'its', 'who', 'was', 'are', 'will', 'would', 'could', 'should', 'about', 'after', 'into', 'over', 'their', 'your', 'what', 'when', 'make', 'like', 'just', 'time', 'them', 'more', 'some', 'only', 'were', 'said', 'each', 'does', 'done', 'come', 'also', 'well', 'much', 'even', 'such', 'because', 'any', 'most', 'many', 'then', 'than', 'too', 'very'])
-
-    filtered_words = [w for w in words if w not in stopwords and len(w) > 3]
-    word_counts = Counter(filtered_words)
-    top_keywords = word_counts.most_common(top_n)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
+    """transcriptをスマートに要約 - 重要な文ウィンドウをトピック付きで抽出"""
+    # TF-IDF重心スコア＋MMRで選び、各ウィンドウで最も重みの大きい語をトピックにする
+    return summarize_transcript(transcript, max_points=max_points, with_topic=True)
 
 # CSS修正済みのHTML生成
 def create_smart_summary(video_id, summary, keywords, video_url, output_path):
@@ -685,29 +530,40 @@ def main():
     print(f"🎬 Processing YouTube URL: {youtube_url}")
     print(f"📹 Video ID: {video_id}")
 
+    # ステージごとの時間を記録
+    timer = StageTimer()
+
     # transcriptを取得
     print("📥 Fetching transcript...")
-    vtt_content = download_subs(video_id, lang='en')
+    # 優先言語の字幕を1回で取得し、使えるトラックを選ぶ
+    with timer.stage("fetch"):
+        lang, transcript = fetch_transcript(video_id)
 
-    if not vtt_content:
+    if not transcript:
         print("❌ No transcript available")
         sys.exit(1)
 
-    transcript = parse_vtt(vtt_content)
-    print(f"✅ Got {len(transcript)} transcript segments")
+    print(f"✅ Got {len(transcript)} transcript segments ({lang})")
+
+    # ローリング重複を除去して文単位に再構成
+    with timer.stage("normalize"):
+        transcript, normalization = normalize_transcript(transcript)
+    print(f"🧹 Normalized: {format_report(normalization)}")
 
     # 改善された要約アルゴリズム
     print("🧠 Smart summarizing with topic extraction...")
-    summary = smart_summarize(transcript)
+    with timer.stage("summarize"):
+        summary = smart_summarize(transcript)
     print(f"✅ Generated {len(summary)} key points with topics")
 
     # トピックを表示
-    topics = extract_topics(transcript)
+    topics = [point['topic'] for point in summary]
     print(f"📋 Extracted topics: {', '.join(topics[:5])}")
 
     # キーワード抽出
     print("🏷️ Extracting keywords...")
-    keywords = extract_keywords(transcript)
+    with timer.stage("keywords"):
+        keywords = extract_keywords(transcript, top_n=20, doc_id=video_id)
     print(f"✅ Extracted {len(keywords)} keywords")
 
     # HTML生成
@@ -716,10 +572,20 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, f"{video_id}.html")
 
-    html_path = create_smart_summary(video_id, summary, keywords, youtube_url, output_path)
+    with timer.stage("render"):
+        html_path = create_smart_summary(video_id, summary, keywords, youtube_url, output_path)
 
     print(f"✅ Visualization created: {html_path}")
 
+    # アーカイブに登録して一覧ページを更新
+    with timer.stage("archive"):
+        archive_page = record_summary(video_id, youtube_url, keywords, detect_chapters(transcript), [html_path])
+    print(f"🗂️ Archive updated: {archive_page}")
+
+    # タイミングレポートを出力の隣に保存
+    report_path = timer.save(timing_path(html_path))
+    print(f"⏱️ {timer.summary()} → {report_path}")
+
     # 結果を出力
     result = {
         "video_id": video_id,
@@ -728,7 +594,9 @@ def main():
         "topics": topics[:5],
         "keywords": len(keywords),
         "segments": len(transcript),
+        "normalization": normalization,
         "html_path": html_path,
+        "timing_path": report_path,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+YouTube JSON Store
+複数のジョブが同時に更新するJSONファイルの保存ヘルパー
+
+write_json は同じディレクトリに一意な一時ファイルを作ってから os.replace するので、
+同時に保存しても一時ファイルがぶつからない。読み込み→マージ→保存を
+ほかのプロセスと重ねたくないときは locked でロックファイルを取る。
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows ではロックしない
+    fcntl = None
+
+
+def read_json(path, default=None):
+    """JSONを読み込む（無ければ default）"""
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data, indent=None):
+    """JSONをアトミックに保存（一時ファイルは保存ごとに一意）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent,
+                                           prefix=f'.{path.name}.', suffix='.tmp', delete=False)
+    try:
+        with tmp_file:
+            json.dump(data, tmp_file, ensure_ascii=False, indent=indent)
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        os.unlink(tmp_file.name)
+        raise
+
+
+@contextmanager
+def locked(path):
+    """path の横のロックファイル（{name}.lock）を排他ロックする"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
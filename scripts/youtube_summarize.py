@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+YouTube Extractive Summarizer
+文ウィンドウのTF-IDF行列を作り、重心スコア＋MMRで重要な箇所を抽出
+
+行列は疎行列（CSR形式のNumPy配列）で持つので、3時間の動画でも1秒かからない。
+出力は従来どおり {'text', 'start', 'end'} のリスト。
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+
+from youtube_keywords import tokenize
+from youtube_normalize import window_sentences
+
+
+def build_tfidf(texts):
+    """テキスト群から正規化済みTF-IDFの疎行列 (indptr, indices, data, vocab) を作成"""
+    vocab = {}
+    indptr = [0]
+    indices = []
+    counts = []
+
+    for text in texts:
+        tf = Counter(tokenize(text))
+        for term, count in tf.items():
+            indices.append(vocab.setdefault(term, len(vocab)))
+            counts.append(count)
+        indptr.append(len(indices))
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.float64)
+
+    n_docs = len(texts)
+    df = np.bincount(indices, minlength=len(vocab))
+    idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+
+    # サブリニアTF × IDF
+    data = (1.0 + np.log(counts)) * idf[indices]
+
+    # 行ごとにL2正規化
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_docs))
+    norms[norms == 0] = 1.0
+    data /= norms[row_ids]
+
+    return indptr, indices, data, vocab
+
+
+def _dense_rows(rows, indptr, indices, data, n_terms):
+    """指定した行だけを密行列にする（MMR用の少数の候補のみ）"""
+    dense = np.zeros((len(rows), n_terms))
+    for i, row in enumerate(rows):
+        lo, hi = indptr[row], indptr[row + 1]
+        dense[i, indices[lo:hi]] = data[lo:hi]
+    return dense
+
+
+def summarize_transcript(transcript, max_points=10, window=15.0, diversity=0.3, with_topic=False):
+    """transcriptを要約（TF-IDF重心スコア＋MMRで重要な文ウィンドウを抽出）
+
+    window: 文をまとめるウィンドウ長（秒）。None なら文をそのまま使う。
+    diversity: MMRで冗長さに与える重み（0で純粋なスコア順）。
+    with_topic: True なら各ポイントに最も重みの大きい語を 'topic' として付ける。
+    """
+    if not transcript:
+        return []
+
+    units = window_sentences(transcript, window) if window else transcript
+    indptr, indices, data, vocab = build_tfidf([u['text'] for u in units])
+    n_docs, n_terms = len(units), len(vocab)
+    if n_terms == 0:
+        # 語が1つも無い（記号だけなど）ときは先頭から返す（トピックは空）
+        key_points = [{'text': u['text'], 'start': u['start'], 'end': u['end']} for u in units[:max_points]]
+        if with_topic:
+            for point in key_points:
+                point['topic'] = ''
+        return key_points
+
+    # 重心との類似度をスコアにする
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    centroid = np.bincount(indices, weights=data, minlength=n_terms) / n_docs
+    scores = np.bincount(row_ids, weights=data * centroid[indices], minlength=n_docs)
+
+    # 上位候補だけでMMR（冗長な箇所を除く）
+    n_candidates = min(n_docs, max_points * 5)
+    candidates = np.argsort(-scores, kind='stable')[:n_candidates]
+    dense = _dense_rows(candidates, indptr, indices, data, n_terms)
+    similarity = dense @ dense.T
+    relevance = scores[candidates] / (scores[candidates].max() or 1.0)
+
+    selected = []
+    redundancy = np.zeros(n_candidates)
+    available = np.ones(n_candidates, dtype=bool)
+    for _ in range(min(max_points, n_candidates)):
+        mmr = (1 - diversity) * relevance - diversity * redundancy
+        mmr[~available] = -math.inf
+        best = int(np.argmax(mmr))
+        if not available[best]:
+            break
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    terms = None
+    if with_topic:
+        terms = np.empty(n_terms, dtype=object)
+        for term, idx in vocab.items():
+            terms[idx] = term
+
+    key_points = []
+    for pos in selected:
+        unit = units[candidates[pos]]
+        point = {'text': unit['text'], 'start': unit['start'], 'end': unit['end']}
+        if terms is not None:
+            point['topic'] = terms[int(np.argmax(dense[pos] * centroid))]
+        key_points.append(point)
+
+    # 時間順にソート
+    key_points.sort(key=lambda x: x['start'])
+    return key_points
@@ -7,11 +7,17 @@ DiscordでYouTube URLが投げられたら、要約とビジュアライズを
 import os
 import sys
 import json
-import re
-import subprocess
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
+from youtube_archive import record_summary
+from youtube_chapters import detect_chapters
+from youtube_fetch import job_dir, parse_json3, run_ytdlp_subs
+from youtube_keywords import extract_keywords
+from youtube_normalize import normalize_transcript, format_report
+from youtube_summarize import summarize_transcript as rank_key_points
+from youtube_timing import StageTimer, timing_path
+
 def get_video_id(url):
     """YouTube URLから動画IDを抽出"""
     if "youtu.be/" in url:
@@ -22,50 +28,24 @@ def get_video_id(url):
 
 def get_transcript_with_ytdlp(video_id):
     """yt-dlpを使ってtranscriptを取得"""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ytdlp_path = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
-
     try:
-        # 字幕をJSON形式で取得
-        result = subprocess.run(
-            [
-                ytdlp_path,
-                '--write-subs',
-                '--write-auto-subs',
-                '--skip-download',
-                '--sub-format', 'json3',
-                '--sub-langs', 'all',
-                '--output', 'subtitles',
-                url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        # 字幕ファイルを探す
-        for file in os.listdir('.'):
-            if file.startswith('subtitles') and file.endswith('.json3'):
-                with open(file, 'r', encoding='utf-8') as f:
+        # ジョブ専用の作業ディレクトリに字幕をJSON形式で取得（一部の言語が失敗しても取れたファイルを使う）
+        with job_dir(video_id) as work_dir:
+            files = run_ytdlp_subs(video_id, work_dir, langs='all', sub_format='json3', manual=True,
+                                   check=False)
+
+            # 字幕ファイルを言語順に確認
+            for path in files:
+                with open(path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
 
                 # 字幕データを解析
                 if 'events' in data:
-                    transcript = []
-                    for event in data['events']:
-                        if 'segs' in event:
-                            text = ''.join([seg.get('utf8', '') for seg in event['segs']])
-                            if text.strip():
-                                transcript.append({
-                                    'text': text.strip(),
-                                    'start': event.get('tStartMs', 0) / 1000,
-                                    'duration': event.get('dDurationMs', 0) / 1000
-                                })
-
-                    # 一時ファイルを削除
-                    os.remove(file)
-
-                    return transcript
+                    return [{
+                        'text': seg['text'],
+                        'start': seg['start'],
+                        'duration': seg['end'] - seg['start']
+                    } for seg in parse_json3(data)]
 
     except Exception as e:
         print(f"Error with yt-dlp: {e}")
@@ -105,67 +85,33 @@ def extract_video_info(url):
         return None
     return {"video_id": video_id, "url": url}
 
+def to_segments(transcript):
+    """start/duration 形式のtranscriptを start/end 形式に変換"""
+    return [{
+        "text": seg["text"],
+        "start": seg["start"],
+        "end": seg["start"] + seg.get("duration", 0)
+    } for seg in transcript]
+
+def from_segments(segments):
+    """start/end 形式のセグメントを start/duration 形式のtranscriptに戻す"""
+    return [{
+        "text": seg["text"],
+        "start": seg["start"],
+        "duration": seg["end"] - seg["start"]
+    } for seg in segments]
+
 def summarize_transcript(transcript, max_points=10):
-    """transcriptを要約（重要なポイントを抽出）"""
+    """transcriptを要約（TF-IDF重心スコア＋MMRで重要なポイントを抽出）"""
     if not transcript:
         return []
 
-    # シンプルな要約：時間の長いセグメントを重要とみなす
-    sorted_segments = sorted(transcript, key=lambda x: x["duration"], reverse=True)
-
-    # 上位のセグメントを抽出
-    key_points = []
-    for seg in sorted_segments[:max_points * 2]:
-        if len(key_points) >= max_points:
-            break
-        if seg["text"] not in [p["text"] for p in key_points]:
-            key_points.append({
-                "text": seg["text"],
-                "start": seg["start"],
-                "duration": seg["duration"]
-            })
-
-    # 時間順にソート
-    key_points.sort(key=lambda x: x["start"])
+    key_points = rank_key_points(to_segments(transcript), max_points=max_points)
+    for point in key_points:
+        point["duration"] = point["end"] - point["start"]
 
     return key_points
 
-def extract_keywords(transcript, top_n=20):
-    """キーワード抽出（シンプルな頻度ベース）"""
-    from collections import Counter
-    import re
-
-    # テキストを結合
-    full_text = " ".join([item["text"] for item in transcript]).lower()
-
-    # 単語を抽出
-    words = re.findall(r'\b[a-zA-Z]+\b', full_text)
-
-    # ストップワード除去
-    stopwords = set(['the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-                     'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-                     'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'dare',
-                     'ought', 'used', 'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by',
-                     'from', 'as', 'into', 'through', 'during', 'before', 'after', 'above',
-                     'below', 'between', 'under', 'again', 'further', 'then', 'once',
-                     'here', 'there', 'when', 'where', 'why', 'how', 'all', 'each', 'few',
-                     'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
-                     'own', 'same', 'so', 'than', 'too', 'very', 'just', 'but', 'and',
-                     'or', 'if', 'it', 'its', 'this', 'that', 'these', 'those', 'he', 'she',
-                     'they', 'we', 'you', 'i', 'me', 'him', 'her', 'us', 'them', 'my',
-                     'your', 'his', 'their', 'our', 'its', 'what', 'which', 'who', 'whom',
-                     'this', 'that', 'these', 'those'])
-
-    filtered_words = [w for w in words if len(w) > 3 and w not in stopwords]
-
-    # 頻度カウント
-    word_counts = Counter(filtered_words)
-
-    # 上位N個を取得
-    top_keywords = word_counts.most_common(top_n)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
-
 def format_time(seconds):
     """秒をHH:MM:SS形式に変換"""
     hours = int(seconds // 3600)
@@ -173,8 +119,8 @@ def format_time(seconds):
     secs = int(seconds % 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-def create_visualization(video_id, transcript, summary, keywords, output_dir):
-    """ビジュアライズHTMLを生成"""
+def create_visualization(video_id, transcript, summary, keywords, output_dir, chapters=None):
+    """ビジュアライズHTMLを生成（chapters を省略すると transcript から検出）"""
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, f"{video_id}.html")
 
@@ -187,16 +133,10 @@ def create_visualization(video_id, transcript, summary, keywords, output_dir):
             "seconds": point["start"]
         })
 
-    # セクション分割（5分ごと）
+    # トピックごとのチャプターに分割
     total_duration = transcript[-1]["start"] + transcript[-1]["duration"] if transcript else 0
-    sections = []
-    section_duration = 300  # 5分
-    for i in range(0, int(total_duration), section_duration):
-        sections.append({
-            "start": format_time(i),
-            "end": format_time(min(i + section_duration, total_duration)),
-            "duration": section_duration / 60
-        })
+    if chapters is None:
+        chapters = detect_chapters(to_segments(transcript))
 
     # HTML生成
     html = f"""<!DOCTYPE html>
@@ -465,11 +405,29 @@ def create_visualization(video_id, transcript, summary, keywords, output_dir):
             </div>
         </div>
 
+        <div class="card">
+            <h2>📑 チャプター</h2>
+            <div class="timeline">
+    """
+
+    # チャプター追加
+    for chapter in chapters:
+        html += f"""
+                <div class="timeline-item" onclick="jumpToTime({chapter['start']})">
+                    <div class="timeline-time">⏰ {format_time(chapter['start'])} - {format_time(chapter['end'])}</div>
+                    <div class="timeline-text">{chapter['title']}</div>
+                </div>
+        """
+
+    html += f"""
+            </div>
+        </div>
+
         <div class="card">
             <h2>📊 動画情報</h2>
             <p><strong>動画ID:</strong> {video_id}</p>
             <p><strong>総再生時間:</strong> {format_time(total_duration)}</p>
-            <p><strong>セクション数:</strong> {len(sections)}</p>
+            <p><strong>チャプター数:</strong> {len(chapters)}</p>
             <p><strong>要約ポイント数:</strong> {len(summary)}</p>
         </div>
     </div>
@@ -484,7 +442,7 @@ def create_visualization(video_id, transcript, summary, keywords, output_dir):
         }}
 
         function jumpToTime(seconds) {{
-            window.open(`https://www.youtube.com/watch?v={video_id}&t=${Math.floor(seconds)}s`, '_blank');
+            window.open(`https://www.youtube.com/watch?v={video_id}&t=${{Math.floor(seconds)}}s`, '_blank');
         }}
     </script>
 </body>
@@ -516,32 +474,58 @@ def main():
     video_id = video_info["video_id"]
     print(f"📹 Video ID: {video_id}")
 
+    # ステージごとの時間を記録
+    timer = StageTimer()
+
     # transcript取得
     print("📥 Fetching transcript...")
-    transcript = get_transcript(video_id)
+    with timer.stage("fetch"):
+        transcript = get_transcript(video_id)
     if not transcript:
         print("❌ Failed to get transcript")
         sys.exit(1)
 
     print(f"✅ Got {len(transcript)} transcript segments")
 
+    # ローリング重複を除去して文単位に再構成
+    with timer.stage("normalize"):
+        segments, normalization = normalize_transcript(to_segments(transcript))
+        transcript = from_segments(segments)
+    print(f"🧹 Normalized: {format_report(normalization)}")
+
     # 要約
     print("📝 Summarizing...")
-    summary = summarize_transcript(transcript)
+    with timer.stage("summarize"):
+        summary = summarize_transcript(transcript)
     print(f"✅ Generated {len(summary)} key points")
 
     # キーワード抽出
     print("🏷️ Extracting keywords...")
-    keywords = extract_keywords(transcript)
+    with timer.stage("keywords"):
+        keywords = extract_keywords(transcript, top_n=20, doc_id=video_id)
     print(f"✅ Extracted {len(keywords)} keywords")
 
+    # チャプター検出（ビジュアライズとアーカイブで共有）
+    with timer.stage("chapters"):
+        chapters = detect_chapters(to_segments(transcript))
+
     # ビジュアライズ作成
     print("🎨 Creating visualization...")
     output_dir = "/Users/naokitomono/Documents/generative-art-by-mira/outputs/youtube-summaries"
-    html_path = create_visualization(video_id, transcript, summary, keywords, output_dir)
+    with timer.stage("render"):
+        html_path = create_visualization(video_id, transcript, summary, keywords, output_dir, chapters)
 
     print(f"✅ Visualization created: {html_path}")
 
+    # アーカイブに登録して一覧ページを更新
+    with timer.stage("archive"):
+        archive_page = record_summary(video_id, youtube_url, keywords, chapters, [html_path])
+    print(f"🗂️ Archive updated: {archive_page}")
+
+    # タイミングレポートを出力の隣に保存
+    report_path = timer.save(timing_path(html_path))
+    print(f"⏱️ {timer.summary()} → {report_path}")
+
     # 結果を出力
     result = {
         "video_id": video_id,
@@ -549,6 +533,7 @@ def main():
         "summary_points": len(summary),
         "keywords": len(keywords),
         "html_path": html_path,
+        "timing_path": report_path,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -7,10 +7,16 @@ yt-dlpを使ってtranscriptを取得し、要約＆ビジュアライゼーシ
 import sys
 import json
 import os
-import subprocess
-import re
 from datetime import datetime
 
+from youtube_archive import record_summary
+from youtube_chapters import detect_chapters
+from youtube_fetch import fetch_transcript
+from youtube_keywords import extract_keywords
+from youtube_normalize import normalize_transcript, format_report
+from youtube_summarize import summarize_transcript
+from youtube_timing import StageTimer, timing_path
+
 def get_video_id(url):
     """YouTube URLから動画IDを抽出"""
     if "youtu.be/" in url:
@@ -19,112 +25,6 @@ def get_video_id(url):
         return url.split("watch?v=")[1].split("&")[0]
     return url
 
-def download_subs(video_id, lang='en'):
-    """yt-dlpを使って字幕をダウンロード"""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ytdlp_path = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
-    temp_file = f"/tmp/youtube_subs_{video_id}_{lang}.vtt"
-
-    try:
-        # 字幕をダウンロード
-        result = subprocess.run(
-            [
-                ytdlp_path,
-                '--write-auto-subs',
-                '--sub-langs', lang,
-                '--skip-download',
-                '--sub-format', 'vtt',
-                '--output', temp_file.replace('.vtt', ''),
-                url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        # VTTファイルが存在するか確認
-        if not os.path.exists(temp_file):
-            # ファイル名が異なる可能性があるので確認
-            for file in os.listdir('/tmp'):
-                if file.startswith(f'youtube_subs_{video_id}') and file.endswith('.vtt'):
-                    temp_file = f'/tmp/{file}'
-                    break
-
-        if os.path.exists(temp_file):
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-
-            # クリーンアップ
-            os.remove(temp_file)
-
-            return vtt_content
-        else:
-            return None
-
-    except Exception as e:
-        print(f"Error downloading subs: {e}")
-        return None
-
-def parse_vtt(vtt_content):
-    """VTTファイルをパースしてtranscriptを作成"""
-    lines = vtt_content.split('\n')
-
-    transcript = []
-    current_start = None
-    current_end = None
-    current_text = []
-
-    for line in lines:
-        line = line.strip()
-
-        # タイムスタンプ行（00:00:00.000 --> 00:00:05.000）
-        timestamp_match = re.match(r'(\d{2}:\d{2}:\d{2}\.\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}\.\d{3})', line)
-
-        if timestamp_match:
-            # 前のセグメントを保存
-            if current_start is not None and current_text:
-                text = ' '.join(current_text)
-                # VTTタグを削除
-                text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-                text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-                if text.strip():
-                    transcript.append({
-                        'start': current_start,
-                        'end': current_end,
-                        'text': text.strip()
-                    })
-
-            # 新しいセグメントを開始
-            current_start = timestamp_to_seconds(timestamp_match.group(1))
-            current_end = timestamp_to_seconds(timestamp_match.group(2))
-            current_text = []
-
-        elif line and not line.startswith('WEBVTT') and not line.startswith('Kind:') and not line.startswith('Language:'):
-            # テキスト行
-            current_text.append(line)
-
-    # 最後のセグメントを保存
-    if current_start is not None and current_text:
-        text = ' '.join(current_text)
-        text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-        text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-        if text.strip():
-            transcript.append({
-                'start': current_start,
-                'end': current_end,
-                'text': text.strip()
-            })
-
-    return transcript
-
-def timestamp_to_seconds(timestamp):
-    """タイムスタンプを秒に変換（00:00:00.000 -> float）"""
-    parts = timestamp.split(':')
-    hours = int(parts[0])
-    minutes = int(parts[1])
-    seconds = float(parts[2])
-    return hours * 3600 + minutes * 60 + seconds
-
 def format_time(seconds):
     """秒をHH:MM:SS形式に変換"""
     hours = int(seconds // 3600)
@@ -132,71 +32,6 @@ def format_time(seconds):
     secs = int(seconds % 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-def summarize_transcript(transcript, max_points=15):
-    """transcriptを要約（重要なポイントを抽出）"""
-    if not transcript:
-        return []
-
-    # テキストを結合
-    full_text = ' '.join([item['text'] for item in transcript])
-
-    # セグメントの長さに基づいて重要度を計算
-    scored_segments = []
-    for seg in transcript:
-        duration = seg['end'] - seg['start']
-        word_count = len(seg['text'].split())
-        score = duration * (1 + word_count / 10)  # 長さ＆単語数でスコアリング
-        scored_segments.append({
-            'text': seg['text'],
-            'start': seg['start'],
-            'end': seg['end'],
-            'score': score
-        })
-
-    # スコア順にソート
-    scored_segments.sort(key=lambda x: x['score'], reverse=True)
-
-    # 上位のセグメントを抽出
-    key_points = []
-    seen_texts = set()
-    for seg in scored_segments:
-        if len(key_points) >= max_points:
-            break
-        if seg['text'] not in seen_texts:
-            key_points.append({
-                'text': seg['text'],
-                'start': seg['start'],
-                'end': seg['end']
-            })
-            seen_texts.add(seg['text'])
-
-    # 時間順にソート
-    key_points.sort(key=lambda x: x['start'])
-
-    return key_points
-
-def extract_keywords(transcript, top_n=30):
-    """キーワード抽出"""
-    from collections import Counter
-
-    full_text = ' '.join([item['text'] for item in transcript]).lower()
-
-    # 単語を抽出
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', full_text)
-
-    # ストップワード除去
-    stopwords = set(['the', 'and', 'that', 'have', 'for', 'not', 'you', 'with', 'this', 'but', 'his', 'from', 'they', 'she', 'her', 'been', 'than', 'its', 'who', 'was', 'are', 'will', 'would', 'could', 'should', 'about', 'after', 'into', 'over', 'their', 'your', 'what', 'when', 'make', 'like', 'just', 'time', 'them', 'more', 'some', 'only', 'were', 'said', 'each', 'does', 'done', 'come', 'also', 'well', 'much', 'even', 'such', 'because', 'any', 'most', 'many', 'then', 'than', 'too', 'very'])
-
-    filtered_words = [w for w in words if w not in stopwords and len(w) > 3]
-
-    # 頻度カウント
-    word_counts = Counter(filtered_words)
-
-    # 上位N個を取得
-    top_keywords = word_counts.most_common(top_n)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
-
 def create_visualization(video_id, transcript, summary, keywords, video_url, output_dir):
     """ビジュアライズHTMLを生成"""
     os.makedirs(output_dir, exist_ok=True)
@@ -552,34 +387,55 @@ def main():
     print(f"🎬 Processing YouTube URL: {youtube_url}")
     print(f"📹 Video ID: {video_id}")
 
+    # ステージごとの時間を記録
+    timer = StageTimer()
+
     # transcriptを取得
     print("📥 Fetching transcript...")
-    vtt_content = download_subs(video_id, lang='en')
+    # 優先言語の字幕を1回で取得し、使えるトラックを選ぶ
+    with timer.stage("fetch"):
+        lang, transcript = fetch_transcript(video_id)
 
-    if not vtt_content:
+    if not transcript:
         print("❌ No transcript available")
         sys.exit(1)
 
-    transcript = parse_vtt(vtt_content)
-    print(f"✅ Got {len(transcript)} transcript segments")
+    print(f"✅ Got {len(transcript)} transcript segments ({lang})")
+
+    # ローリング重複を除去して文単位に再構成
+    with timer.stage("normalize"):
+        transcript, normalization = normalize_transcript(transcript)
+    print(f"🧹 Normalized: {format_report(normalization)}")
 
     # 要約
     print("📝 Summarizing...")
-    summary = summarize_transcript(transcript)
+    with timer.stage("summarize"):
+        summary = summarize_transcript(transcript, max_points=15)
     print(f"✅ Generated {len(summary)} key points")
 
     # キーワード抽出
     print("🏷️ Extracting keywords...")
-    keywords = extract_keywords(transcript)
+    with timer.stage("keywords"):
+        keywords = extract_keywords(transcript, top_n=30, doc_id=video_id)
     print(f"✅ Extracted {len(keywords)} keywords")
 
     # ビジュアライズ作成
     print("🎨 Creating visualization...")
     output_dir = "/Users/naokitomono/Documents/generative-art-by-mira/outputs/youtube-summaries"
-    html_path = create_visualization(video_id, transcript, summary, keywords, youtube_url, output_dir)
+    with timer.stage("render"):
+        html_path = create_visualization(video_id, transcript, summary, keywords, youtube_url, output_dir)
 
     print(f"✅ Visualization created: {html_path}")
 
+    # アーカイブに登録して一覧ページを更新
+    with timer.stage("archive"):
+        archive_page = record_summary(video_id, youtube_url, keywords, detect_chapters(transcript), [html_path])
+    print(f"🗂️ Archive updated: {archive_page}")
+
+    # タイミングレポートを出力の隣に保存
+    report_path = timer.save(timing_path(html_path))
+    print(f"⏱️ {timer.summary()} → {report_path}")
+
     # 結果を出力
     result = {
         "video_id": video_id,
@@ -587,7 +443,9 @@ def main():
         "summary_points": len(summary),
         "keywords": len(keywords),
         "segments": len(transcript),
+        "normalization": normalization,
         "html_path": html_path,
+        "timing_path": report_path,
         "timestamp": datetime.now().isoformat()
     }
 
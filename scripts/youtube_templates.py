@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+YouTube HTML Template Engine
+テンプレートを一度だけセグメント列にコンパイルしてキャッシュし、1パスで描画
+
+テンプレートの書式は str.format と同じ（{NAME} が差し込み、{{ }} はそのまま波括弧）。
+差し込む値はデフォルトでHTMLエスケープされるので、ユーザーのテキストに
+{NAME} のような文字列が含まれていても二重に置換されない。
+
+    {NAME}      HTMLエスケープして差し込む
+    {NAME:js}   JavaScriptの文字列リテラルとして差し込む（<script> 内用）
+    Markup(...) で包んだ値はエスケープせずにそのまま差し込む（組み立て済みのHTML断片用）
+"""
+
+import html
+import json
+import os
+import string
+from functools import lru_cache
+
+
+class Markup(str):
+    """エスケープ不要な組み立て済みHTML断片"""
+
+
+def escape(value):
+    """HTML本文・属性値用にエスケープ（Markup はそのまま）"""
+    if isinstance(value, Markup):
+        return value
+    return html.escape(str(value), quote=True)
+
+
+def _escape_js(value):
+    """<script> 内に安全に置けるJS文字列リテラルに変換"""
+    return (json.dumps(str(value), ensure_ascii=False)
+            .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+
+
+_FILTERS = {
+    '': escape,
+    'js': _escape_js,
+}
+
+
+class CompiledTemplate:
+    """リテラルと差し込み位置のセグメント列にコンパイル済みのテンプレート"""
+
+    def __init__(self, text):
+        self.segments = []
+        self.fields = set()
+        literal = []
+        for text_part, field, spec, _ in string.Formatter().parse(text):
+            literal.append(text_part)
+            if field is None:
+                continue
+            if spec not in _FILTERS:
+                raise ValueError(f"Unknown template filter: {field}:{spec}")
+            self.segments.append(''.join(literal))
+            self.segments.append((field, _FILTERS[spec]))
+            self.fields.add(field)
+            literal = []
+        self.segments.append(''.join(literal))
+
+    def render(self, values):
+        """値を1パスで差し込んで文字列を返す"""
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                field, escape_filter = segment
+                parts.append(escape_filter(values[field]))
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=None)
+def _compile_file(path, mtime):
+    with open(path, 'r', encoding='utf-8') as f:
+        return CompiledTemplate(f.read())
+
+
+def load_template(path):
+    """テンプレートファイルをコンパイルして返す（更新されない限りメモリ上のものを使う）"""
+    path = os.fspath(path)
+    return _compile_file(path, os.stat(path).st_mtime_ns)
+
+
+def render_file(path, values):
+    """テンプレートファイルを描画"""
+    return load_template(path).render(values)
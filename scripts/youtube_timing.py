@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+YouTube Stage Timing
+要約CLIの各ステージ（取得 / パース / 要約 / 描画など）の時間とメモリを記録
+
+    timer = StageTimer()
+    with timer.stage("fetch"):
+        ...
+    timer.save(timing_path(html_path))   # 出力の隣に <名前>.timing.json
+
+各ステージの実時間・CPU時間と、ステージ終了時のプロセスの最大RSSを記録する。
+環境変数 YOUTUBE_PROFILE=<stage>[:cprofile|tracemalloc] を指定すると、
+そのステージだけ cProfile（.prof に保存）か tracemalloc（上位の確保箇所を
+レポートに記録）を有効にする。
+"""
+
+import cProfile
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# プロファイルを有効にする環境変数
+PROFILE_ENV = 'YOUTUBE_PROFILE'
+
+# tracemalloc で記録する確保箇所の数
+TRACEMALLOC_TOP = 20
+
+
+def max_rss_kb():
+    """プロセスの最大RSS（KB）。macOSは単位がバイトなので換算する"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def profile_setting(env=None):
+    """環境変数から (ステージ名, モード) を読む（未指定なら (None, None)）"""
+    value = (env if env is not None else os.environ).get(PROFILE_ENV, '')
+    if not value:
+        return None, None
+    stage, _, mode = value.partition(':')
+    mode = mode or 'cprofile'
+    if mode not in ('cprofile', 'tracemalloc'):
+        raise ValueError(f"{PROFILE_ENV}: unknown mode '{mode}' (cprofile or tracemalloc)")
+    return stage, mode
+
+
+def timing_path(output_path):
+    """出力ファイルの隣に置くタイミングレポートのパス"""
+    return os.path.splitext(output_path)[0] + '.timing.json'
+
+
+class StageTimer:
+    """ステージごとの計測結果を順番に記録"""
+
+    def __init__(self, env=None):
+        self.stages = []
+        self.profiles = {}
+        self.started = datetime.now().isoformat()
+        self.profile_stage, self.profile_mode = profile_setting(env)
+
+    @contextmanager
+    def stage(self, name):
+        """with ブロックを1ステージとして計測"""
+        profiler = None
+        if name == self.profile_stage:
+            if self.profile_mode == 'cprofile':
+                profiler = cProfile.Profile()
+                profiler.enable()
+            elif not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+        rss_before = max_rss_kb()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'wall_s': round(time.perf_counter() - wall, 4),
+                'cpu_s': round(time.process_time() - cpu, 4),
+                'max_rss_kb': max_rss_kb(),
+            }
+            record['rss_growth_kb'] = record['max_rss_kb'] - rss_before
+
+            if profiler is not None:
+                profiler.disable()
+                self.profiles[name] = profiler
+            elif name == self.profile_stage:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                record['traced_peak_kb'] = round(peak / 1024, 1)
+                record['top_allocations'] = [
+                    {'line': str(stat.traceback[0]), 'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:TRACEMALLOC_TOP]
+                ]
+
+            self.stages.append(record)
+
+    def report(self):
+        """計測結果をまとめる"""
+        return {
+            'started': self.started,
+            'total_wall_s': round(sum(s['wall_s'] for s in self.stages), 4),
+            'total_cpu_s': round(sum(s['cpu_s'] for s in self.stages), 4),
+            'max_rss_kb': max_rss_kb(),
+            'profile': {'stage': self.profile_stage, 'mode': self.profile_mode} if self.profile_stage else None,
+            'stages': self.stages,
+        }
+
+    def save(self, path):
+        """レポートをJSONで保存（cProfileの結果は <レポート名>.<stage>.prof）"""
+        report = self.report()
+        base = path[:-len('.json')] if path.endswith('.json') else path
+        for name, profiler in self.profiles.items():
+            profile_path = f"{base}.{name}.prof"
+            profiler.dump_stats(profile_path)
+            report['profile']['path'] = profile_path
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+    def summary(self):
+        """ステージごとの時間を1行にまとめる"""
+        return ', '.join(f"{s['stage']} {s['wall_s']:.2f}s" for s in self.stages)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+YouTube Glossary Translator
+用語集（複数語のフレーズを含む）を単語トライに載せて、英語→日本語を1パスで置換
+
+用語集は scripts/data/glossary-ja.json（{"英語": "日本語"}）から初回の翻訳時に
+1回だけ読み込む。各位置でトライをたどって最長一致のフレーズを置き換えるので、
+処理時間は用語集の大きさではなくテキストの単語数（×最長フレーズ長）に比例する。
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+GLOSSARY_FILE = SCRIPT_DIR / "data" / "glossary-ja.json"
+
+# 単語の前後から外す記号（訳語の前後に付け直す）
+PUNCTUATION = '.,!?;:"()[]'
+
+# 完全一致しない単語で試す語尾（designs → design など）
+INFLECTIONS = ("'s", 'ies', 'es', 's', 'ed', 'ing', 'ly')
+
+# トライのノードで訳語を持つキー（記号だけの単語は空文字列になるので、文字列と重ならない番兵にする）
+_END = object()
+
+
+class PhraseTrie:
+    """単語単位のトライ（各ノードは {単語: 子ノード}、訳語は _END キー）"""
+
+    def __init__(self, glossary=None):
+        self.root = {}
+        self.size = 0
+        for phrase, translation in (glossary or {}).items():
+            self.add(phrase, translation)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, phrase, translation):
+        """フレーズを追加（大文字小文字は区別しない）"""
+        node = self.root
+        for word in phrase.lower().split():
+            node = node.setdefault(word, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = translation
+
+    def lookup_word(self, word):
+        """1単語の訳語（無ければ語尾を外して再検索、それでも無ければNone）"""
+        node = self.root.get(word)
+        if node is not None and _END in node:
+            return node[_END]
+        for suffix in INFLECTIONS:
+            if word.endswith(suffix) and len(word) > len(suffix) + 2:
+                stem = word[:-len(suffix)]
+                for candidate in (stem, stem + 'e', stem + 'y'):
+                    node = self.root.get(candidate)
+                    if node is not None and _END in node:
+                        return node[_END]
+        return None
+
+    def translate(self, text):
+        """テキストを最長一致で1パス翻訳（訳せない単語は小文字のまま残す）"""
+        raw_words = text.split()
+        words = [word.lower().strip(PUNCTUATION) for word in raw_words]
+        root = self.root
+        output = []
+        i = 0
+        n = len(words)
+
+        while i < n:
+            # この位置から始まる最長のフレーズを探す
+            node = root
+            match = None
+            match_end = i
+            j = i
+            while j < n and words[j]:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match = node[_END]
+                    match_end = j
+                # 記号の後ろにはフレーズを伸ばさない
+                if raw_words[j - 1][-1] in PUNCTUATION:
+                    break
+
+            if match is None:
+                match = self.lookup_word(words[i]) if words[i] else None
+                match_end = i + 1
+                if match is None:
+                    output.append(raw_words[i].lower())
+                    i += 1
+                    continue
+
+            # 前後の記号は残す
+            first, last = raw_words[i], raw_words[match_end - 1]
+            prefix = first[:len(first) - len(first.lstrip(PUNCTUATION))]
+            suffix = last[len(last.rstrip(PUNCTUATION)):]
+            output.append(f"{prefix}{match}{suffix}")
+            i = match_end
+
+        return ' '.join(output)
+
+
+def read_glossary(path=GLOSSARY_FILE):
+    """用語集JSONを読み込む"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def load_glossary(path=GLOSSARY_FILE):
+    """用語集をトライに読み込む（パスごとに1回だけ）"""
+    return PhraseTrie(read_glossary(path))
+
+
+def translate_to_japanese(text, glossary=None):
+    """用語集ベースの英語→日本語翻訳"""
+    glossary = glossary if glossary is not None else load_glossary()
+    return glossary.translate(text)
@@ -7,10 +7,16 @@ YouTube Ultimate Summarizer
 import sys
 import json
 import os
-import subprocess
-import re
 from datetime import datetime
-from collections import Counter
+
+from youtube_archive import record_summary
+from youtube_chapters import detect_chapters
+from youtube_fetch import fetch_transcript
+from youtube_keywords import extract_keywords
+from youtube_normalize import normalize_transcript, format_report
+from youtube_summarize import summarize_transcript
+from youtube_timing import StageTimer, timing_path
+from youtube_translate import translate_to_japanese
 
 def get_video_id(url):
     """YouTube URLから動画IDを抽出"""
@@ -20,101 +26,6 @@ def get_video_id(url):
         return url.split("watch?v=")[1].split("&")[0]
     return url
 
-def download_subs(video_id, lang='en'):
-    """yt-dlpを使って字幕をダウンロード"""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ytdlp_path = os.path.expanduser('~/Library/Python/3.11/bin/yt-dlp')
-    temp_file = f"/tmp/youtube_subs_{video_id}_{lang}.vtt"
-
-    try:
-        result = subprocess.run(
-            [
-                ytdlp_path,
-                '--write-auto-subs',
-                '--sub-langs', lang,
-                '--skip-download',
-                '--sub-format', 'vtt',
-                '--output', temp_file.replace('.vtt', ''),
-                url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        if not os.path.exists(temp_file):
-            for file in os.listdir('/tmp'):
-                if file.startswith(f'youtube_subs_{video_id}') and file.endswith('.vtt'):
-                    temp_file = f'/tmp/{file}'
-                    break
-
-        if os.path.exists(temp_file):
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-
-            os.remove(temp_file)
-            return vtt_content
-        else:
-            return None
-
-    except Exception as e:
-        print(f"Error downloading subs: {e}")
-        return None
-
-def parse_vtt(vtt_content):
-    """VTTファイルをパースしてtranscriptを作成"""
-    lines = vtt_content.split('\n')
-
-    transcript = []
-    current_start = None
-    current_end = None
-    current_text = []
-
-    for line in lines:
-        line = line.strip()
-
-        timestamp_match = re.match(r'(\d{2}:\d{2}:\d{2}\.\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}\.\d{3})', line)
-
-        if timestamp_match:
-            if current_start is not None and current_text:
-                text = ' '.join(current_text)
-                text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-                text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-                if text.strip():
-                    transcript.append({
-                        'start': current_start,
-                        'end': current_end,
-                        'text': text.strip()
-                    })
-
-            current_start = timestamp_to_seconds(timestamp_match.group(1))
-            current_end = timestamp_to_seconds(timestamp_match.group(2))
-            current_text = []
-
-        elif line and not line.startswith('WEBVTT') and not line.startswith('Kind:') and not line.startswith('Language:'):
-            current_text.append(line)
-
-    if current_start is not None and current_text:
-        text = ' '.join(current_text)
-        text = re.sub(r'<c>|</c>|<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-        text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>|</c>', '', text)
-        if text.strip():
-            transcript.append({
-                'start': current_start,
-                'end': current_end,
-                'text': text.strip()
-            })
-
-    return transcript
-
-def timestamp_to_seconds(timestamp):
-    """タイムスタンプを秒に変換"""
-    parts = timestamp.split(':')
-    hours = int(parts[0])
-    minutes = int(parts[1])
-    seconds = float(parts[2])
-    return hours * 3600 + minutes * 60 + seconds
-
 def format_time(seconds):
     """秒をHH:MM:SS形式に変換"""
     hours = int(seconds // 3600)
@@ -126,53 +37,14 @@ def format_time(seconds):
 def create_ultimate_summary(transcript, max_points=8):
     """transcriptから究極の要約を生成 - 文脈理解と構成"""
 
-    if not transcript:
-        return []
-
-    # 1. 全テキストを結合
-    full_text = ' '.join([seg['text'] for seg in transcript])
-
-    # 2. トピックを抽出
-    topics = extract_main_topics(transcript, top_n=5)
-
-    # 3. 各トピックについてのセグメントをグループ化
-    topic_groups = {}
-    for seg in transcript:
-        words = seg['text'].lower().split()
-        for topic in topics:
-            if any(topic in word for word in words):
-                if topic not in topic_groups:
-                    topic_groups[topic] = []
-                topic_groups[topic].append(seg)
-                break
-
-    # 4. 各トピックから要約を生成
-    summary = []
-    for topic, segments in topic_groups.items():
-        if len(segments) >= 2:
-            # 複数のセグメントを統合
-            combined_segments = segments[:min(4, len(segments))]
-            combined_text = ' '.join([s['text'] for s in combined_segments])
-
-            # 要約を作成（簡易的なLLM風要約）
-            summarized = create_intelligent_summary(combined_text, topic)
-
-            # 最初のセグメントの時間を使用
-            first_seg = segments[0]
-            last_seg = segments[-1]
-
-            summary.append({
-                'text': summarized,
-                'start': first_seg['start'],
-                'end': last_seg['end'],
-                'topic': topic
-            })
-
-    # 時間順にソート
-    summary.sort(key=lambda x: x['start'])
-
-    # 上位N個に制限
-    return summary[:max_points]
+    # 1. TF-IDF重心スコア＋MMRで重要かつ冗長でない文ウィンドウを選ぶ
+    summary = summarize_transcript(transcript, max_points=max_points, with_topic=True)
+
+    # 2. 各ウィンドウから要約を生成
+    for point in summary:
+        point['text'] = create_intelligent_summary(point['text'], point['topic'])
+
+    return summary
 
 def create_intelligent_summary(text, topic):
     """インテリジェントな要約を生成 - 文脈を理解して再構成"""
@@ -209,198 +81,6 @@ def create_intelligent_summary(text, topic):
 
     return summary_text
 
-def extract_main_topics(transcript, top_n=5):
-    """transcriptからメイントピックを抽出"""
-    full_text = ' '.join([seg['text'] for seg in transcript]).lower()
-
-    stopwords = set(['the', 'and', 'that', 'have', 'for', 'not', 'you', 'with', 'this', 'but', 'his', 'from', 'they', 'she', 'her', 'been', 'than', 'its', 'who', 'was', 'are', 'will', 'would', 'could', 'should', 'about', 'after', 'into', 'over', 'their', 'your', 'what', 'when', 'make', 'like', 'just', 'them', 'more', 'some', 'only', 'were', 'said', 'each', 'does', 'done', 'come', 'also', 'well', 'much', 'even', 'such', 'because', 'any', 'most', 'many', 'then', 'than', 'too', 'very'])
-
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', full_text)
-    filtered_words = [w for w in words if w not in stopwords]
-
-    word_counts = Counter(filtered_words)
-    top_words = word_counts.most_common(top_n)
-
-    return [word for word, count in top_words if count >= 2]
-
-def translate_to_japanese(text):
-    """簡易的な英語→日本語翻訳"""
-
-    # キーワードベースの翻訳辞書
-    translations = {
-        # 一般的な単語
-        'code': 'コード',
-        'coding': 'コーディング',
-        'programmer': 'プログラマー',
-        'programming': 'プログラミング',
-        'computer': 'コンピュータ',
-        'software': 'ソフトウェア',
-        'development': '開発',
-        'developer': '開発者',
-        'technology': '技術',
-        'figma': 'Figma',
-        'design': 'デザイン',
-        'tool': 'ツール',
-        'different': '異なる',
-        'copy': 'コピー',
-        'variation': 'バリエーション',
-        'variations': 'バリエーション',
-        'process': 'プロセス',
-        'create': '作成',
-        'creating': '作成中',
-        'first': '最初',
-        'never': '決して～ない',
-        'literally': '文字通り',
-        'google': 'Google',
-        'open': '開く',
-        'terminal': 'ターミナル',
-        'life': '人生',
-        'before': '前に',
-        'single': '単一の',
-        'line': '行',
-        'written': '書かれた',
-        'launch': 'ローンチ',
-        'claude': 'Claude',
-        'anthropic': 'Anthropic',
-        'marketing': 'マーケティング',
-        'team': 'チーム',
-        'reaction': '反応',
-        'zero': 'ゼロ',
-        'idea': 'アイデア',
-        'what': '何',
-        'this': 'これ',
-        'product': '製品',
-        'just': 'ただ',
-        "didn't": 'しなかった',
-        'really': '本当に',
-        'new': '新しい',
-        'experience': '経験',
-        'using': '使用',
-        'trying': '試す',
-        'learn': '学ぶ',
-        'basics': '基本',
-        'how': 'どうやって',
-        'mac': 'Mac',
-        'uses': '使用',
-        'find': '見つける',
-        'search': '検索',
-        'answer': '答え',
-        'question': '質問',
-        'people': '人々',
-        'someone': '誰か',
-        'work': '仕事',
-        'working': '働いている',
-        'project': 'プロジェクト',
-        'build': '構築',
-        'building': '構築中',
-        'make': '作る',
-        'start': '開始',
-        'starting': '開始中',
-        'stop': '停止',
-        'end': '終了',
-        'finish': '完了',
-        'try': '試す',
-        'trying': '試している',
-        'use': '使用',
-        'using': '使用中',
-        'help': '助け',
-        'need': '必要',
-        'want': '欲しい',
-        'think': '思う',
-        'know': '知っている',
-        'understand': '理解する',
-        'example': '例',
-        'way': '方法',
-        'many': '多くの',
-        'much': 'たくさん',
-        'lot': 'たくさん',
-        'more': 'もっと',
-        'most': '最も',
-        'better': 'より良い',
-        'best': '最高',
-        'good': '良い',
-        'bad': '悪い',
-        'important': '重要',
-        'easy': '簡単',
-        'hard': '難しい',
-        'simple': 'シンプル',
-        'complex': '複雑',
-        'big': '大きい',
-        'small': '小さい',
-        'long': '長い',
-        'short': '短い',
-        'right': '正しい',
-        'wrong': '間違っている',
-        'yes': 'はい',
-        'no': 'いいえ',
-        'maybe': '多分',
-        'actually': '実際',
-        'really': '本当に',
-        'probably': 'おそらく',
-        'possible': '可能',
-        'impossible': '不可能',
-        'sure': '確か',
-        'certain': '確実',
-        'clear': '明確',
-        'obvious': '明らかな',
-        'interesting': '面白い',
-        'amazing': '素晴らしい',
-        'awesome': '最高',
-        'cool': 'かっこいい',
-        'great': '素晴らしい',
-        'love': '愛',
-        'hate': '憎む',
-        'like': '好き',
-        'dislike': '嫌い',
-        'happy': '幸せ',
-        'sad': '悲しい',
-        'angry': '怒っている',
-        'afraid': '恐れている',
-        'scared': '怖がっている',
-        'worried': '心配している',
-        'excited': '興奮している',
-        'bored': '退屈している',
-        'tired': '疲れている',
-        'surprised': '驚いている',
-        'shocked': '衝撃を受けている',
-        'confused': '混乱している',
-        'puzzled': '困惑している',
-        'curious': '好奇心がある',
-        'skeptical': '疑わしい',
-        'doubtful': '疑っている'
-    }
-
-    # 翻訳を実行
-    words = text.lower().split()
-    translated_words = []
-    for word in words:
-        # 基本的な翻訳
-        translated = translations.get(word, word)
-
-        # 一部一致でも試す
-        if translated == word:
-            for key, value in translations.items():
-                if key in word:
-                    translated = value
-                    break
-
-        translated_words.append(translated)
-
-    return ' '.join(translated_words)
-
-def extract_keywords(transcript, top_n=20):
-    """キーワード抽出"""
-    full_text = ' '.join([item['text'] for item in transcript]).lower()
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', full_text)
-
-    stopwords = set(['the', 'and', 'that', 'have', 'for', 'not', 'you', 'with', 'this', 'but', 'his', 'from', 'they', 'she', 'her', 'been', 'than', 'its', 'who', 'was', 'are', 'will', 'would', 'could', 'should', 'about', 'after', 'into', 'over', 'their', 'your', 'what', 'when', 'make', 'like', 'just', 'time', 'them', 'more', 'some', 'only', 'were', 'said', 'each', 'does', 'done', 'come', 'also', 'well', 'much', 'even', 'such', 'because', 'any', 'most', 'many', 'then', 'than', 'too', 'very'])
-
-    filtered_words = [w for w in words if w not in stopwords and len(w) > 3]
-    word_counts = Counter(filtered_words)
-    top_keywords = word_counts.most_common(top_n)
-
-    return [{"word": word, "count": count} for word, count in top_keywords]
-
 def create_ultimate_summary_html(video_id, summary, keywords, video_url, output_path):
     """究極の要約HTMLを生成"""
 
@@ -906,25 +586,36 @@ def main():
     print(f"🎬 Processing YouTube URL: {youtube_url}")
     print(f"📹 Video ID: {video_id}")
 
+    # ステージごとの時間を記録
+    timer = StageTimer()
+
     # transcriptを取得
     print("📥 Fetching transcript...")
-    vtt_content = download_subs(video_id, lang='en')
+    # 優先言語の字幕を1回で取得し、使えるトラックを選ぶ
+    with timer.stage("fetch"):
+        lang, transcript = fetch_transcript(video_id)
 
-    if not vtt_content:
+    if not transcript:
         print("❌ No transcript available")
         sys.exit(1)
 
-    transcript = parse_vtt(vtt_content)
-    print(f"✅ Got {len(transcript)} transcript segments")
+    print(f"✅ Got {len(transcript)} transcript segments ({lang})")
+
+    # ローリング重複を除去して文単位に再構成
+    with timer.stage("normalize"):
+        transcript, normalization = normalize_transcript(transcript)
+    print(f"🧹 Normalized: {format_report(normalization)}")
 
     # 改善された要約アルゴリズム
     print("🧠 Creating ultimate summary with Japanese translation...")
-    summary = create_ultimate_summary(transcript)
+    with timer.stage("summarize"):
+        summary = create_ultimate_summary(transcript)
     print(f"✅ Generated {len(summary)} summarized points")
 
     # キーワード抽出
     print("🏷️ Extracting keywords...")
-    keywords = extract_keywords(transcript)
+    with timer.stage("keywords"):
+        keywords = extract_keywords(transcript, top_n=20, doc_id=video_id)
     print(f"✅ Extracted {len(keywords)} keywords")
 
     # HTML生成
@@ -933,10 +624,20 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, f"{video_id}.html")
 
-    html_path = create_ultimate_summary_html(video_id, summary, keywords, youtube_url, output_path)
+    with timer.stage("render"):
+        html_path = create_ultimate_summary_html(video_id, summary, keywords, youtube_url, output_path)
 
     print(f"✅ Visualization created: {html_path}")
 
+    # アーカイブに登録して一覧ページを更新
+    with timer.stage("archive"):
+        archive_page = record_summary(video_id, youtube_url, keywords, detect_chapters(transcript), [html_path])
+    print(f"🗂️ Archive updated: {archive_page}")
+
+    # タイミングレポートを出力の隣に保存
+    report_path = timer.save(timing_path(html_path))
+    print(f"⏱️ {timer.summary()} → {report_path}")
+
     # 結果を出力
     result = {
         "video_id": video_id,
@@ -945,7 +646,9 @@ def main():
         "topics": [s.get('topic', '') for s in summary],
         "keywords": len(keywords),
         "segments": len(transcript),
+        "normalization": normalization,
         "html_path": html_path,
+        "timing_path": report_path,
         "timestamp": datetime.now().isoformat()
     }
 
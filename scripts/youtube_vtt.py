@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+YouTube VTT Streaming Parser
+WebVTT字幕をストリーミングでパースして型付きのキューを返す
+
+ファイル全体をリストに展開せず1行ずつ処理するので、
+数時間分の自動生成字幕（数万キュー）でもメモリを食わない。
+"""
+
+import io
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# タイムスタンプ（時間は省略可: 00:01.000 / 00:00:01.000）
+_TIMESTAMP = r'(?:(\d+):)?(\d{2}):(\d{2}\.\d{3})'
+
+# キューのタイミング行（00:00:00.000 --> 00:00:05.000 align:start ...）
+_TIMING_RE = re.compile(_TIMESTAMP + r'\s*-->\s*' + _TIMESTAMP)
+
+# 単語タイムスタンプのタグ（<00:00:01.520>）だけ
+_TIMESTAMP_TAG_RE = re.compile(r'<' + _TIMESTAMP + r'>')
+
+# インラインタグ（<c>, <c.colorE5E5E5>, </c>, <00:00:01.520> などの単語タイムスタンプ）
+_INLINE_RE = re.compile(r'<(?:' + _TIMESTAMP + r'|/?[a-z]+(?:\.[\w.-]+)?(?: [^>]*)?)>')
+
+
+class Cue(NamedTuple):
+    """字幕キュー（words は単語タイムスタンプ (秒, 単語) のタプル）"""
+    start: float
+    end: float
+    text: str
+    words: Tuple[Tuple[float, str], ...] = ()
+
+    def to_dict(self):
+        """従来の transcript 形式（start / end / text）に変換"""
+        return {'start': self.start, 'end': self.end, 'text': self.text}
+
+
+def _to_seconds(hours, minutes, seconds):
+    """正規表現のグループを秒に変換"""
+    return (int(hours) * 3600 if hours else 0) + int(minutes) * 60 + float(seconds)
+
+
+def timestamp_to_seconds(timestamp):
+    """タイムスタンプを秒に変換（00:00:00.000 -> float）"""
+    match = re.fullmatch(_TIMESTAMP, timestamp.strip())
+    if not match:
+        raise ValueError(f"Invalid VTT timestamp: {timestamp!r}")
+    return _to_seconds(*match.groups())
+
+
+def _strip_inline(line, cue_start, words):
+    """インラインタグを1パスで除去し、単語タイムスタンプがあれば words に追加
+
+    除去するのはVTTのタグとタイムスタンプだけなので、本文の < や > は残る。
+    """
+    if words is None:
+        # YouTubeの自動字幕のタグはほとんどが <c> / </c> と単語タイムスタンプなので、
+        # 先に文字列の置換と単純な正規表現で消し、残ったタグがあるときだけ _INLINE_RE を使う
+        line = _TIMESTAMP_TAG_RE.sub('', line.replace('<c>', '').replace('</c>', ''))
+        return _INLINE_RE.sub('', line) if '<' in line else line
+
+    parts = []
+    timed = []
+    has_timestamp = False
+    word_start = cue_start
+    pos = 0
+    for match in _INLINE_RE.finditer(line):
+        chunk = line[pos:match.start()]
+        if chunk:
+            parts.append(chunk)
+            timed.extend((word_start, word) for word in chunk.split())
+        if match.group(3) is not None:
+            word_start = _to_seconds(*match.group(1, 2, 3))
+            has_timestamp = True
+        pos = match.end()
+
+    chunk = line[pos:]
+    if chunk:
+        parts.append(chunk)
+        timed.extend((word_start, word) for word in chunk.split())
+
+    if has_timestamp:
+        words.extend(timed)
+    return ''.join(parts)
+
+
+def _join_lines(lines):
+    """蓄積した行を空白を詰めた1つのテキストにする"""
+    return ' '.join(lines[0].split()) if len(lines) == 1 else ' '.join(' '.join(lines).split())
+
+
+def _iter_raw_cues(lines: Iterable[str], with_words: bool) -> Iterator[tuple]:
+    """VTTの行をストリーミングでパースして (start, end, text, words) を返す（空のキューは除く）"""
+    start = end = None
+    text_lines: List[str] = []
+    words: Optional[List[Tuple[float, str]]] = None
+    in_cue = False
+
+    for raw in lines:
+        line = raw.strip()
+
+        if not line:
+            # 本当の空行でキューが終わる（YouTubeの自動字幕はキュー内に空白だけの行を含む）
+            if raw[:1] in '\r\n':
+                in_cue = False
+            continue
+
+        if '-->' in line:
+            timing = _TIMING_RE.match(line)
+            if timing:
+                if start is not None:
+                    text = _join_lines(text_lines) if text_lines else ''
+                    if text:
+                        yield start, end, text, words
+                # _to_seconds を呼ばずにその場で秒に変換（キューごとに2回なので関数呼び出しを省く）
+                h1, m1, s1, h2, m2, s2 = timing.groups()
+                start = (int(h1) * 3600 if h1 else 0) + int(m1) * 60 + float(s1)
+                end = (int(h2) * 3600 if h2 else 0) + int(m2) * 60 + float(s2)
+                text_lines = []
+                words = [] if with_words else None
+                in_cue = True
+                continue
+
+        # キュー外の行（WEBVTTヘッダー、Kind:/Language:、NOTE、キュー識別子）は無視
+        if in_cue:
+            text_lines.append(_strip_inline(line, start, words) if '<' in line else line)
+
+    if start is not None:
+        text = _join_lines(text_lines) if text_lines else ''
+        if text:
+            yield start, end, text, words
+
+
+def iter_vtt_cues(lines: Iterable[str], with_words: bool = True) -> Iterator[Cue]:
+    """VTTの行をストリーミングでパースしてキューを1件ずつ返す
+
+    with_words=False なら単語タイムスタンプを集めずタグ除去だけを行う（高速）。
+    """
+    for start, end, text, words in _iter_raw_cues(lines, with_words):
+        yield Cue(start, end, text, tuple(words) if words else ())
+
+
+def iter_vtt_file(path, encoding='utf-8', with_words=True) -> Iterator[Cue]:
+    """VTTファイルを開いてストリーミングでパース"""
+    with open(path, 'r', encoding=encoding) as f:
+        yield from iter_vtt_cues(f, with_words)
+
+
+def parse_vtt(vtt_content) -> List[dict]:
+    """VTTファイルをパースしてtranscriptを作成（従来の dict 形式）"""
+    return [{'start': start, 'end': end, 'text': text}
+            for start, end, text, _ in _iter_raw_cues(io.StringIO(vtt_content), with_words=False)]
+
+
+def parse_vtt_file(path: str, encoding: Optional[str] = 'utf-8') -> List[dict]:
+    """VTTファイルをストリーミングでパースしてtranscriptを作成"""
+    with open(path, 'r', encoding=encoding) as f:
+        return [{'start': start, 'end': end, 'text': text}
+                for start, end, text, _ in _iter_raw_cues(f, with_words=False)]